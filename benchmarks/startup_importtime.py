@@ -0,0 +1,113 @@
+"""
+Startup import-time benchmark: what each CLI command imports, measured with `python -X importtime`.
+
+Each command's import set is loaded in a fresh interpreter (best of --runs)
+and the total import time is compared with the command's budget; commands
+must also not load the heavy packages they do not use (HEAVY_MODULES).
+Exits non-zero when any command is over budget or loads one of them.
+
+    uv run python benchmarks/startup_importtime.py [--runs N] [--top N] [command ...]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules a command imports before doing any work: main.py itself plus what
+# the command imports lazily (keep in sync with the imports inside main.py's run_* functions)
+COMMAND_IMPORTS = {
+    "promo": ["main", "integrations.onesignal_caller"],
+    "best-deals": ["main", "integrations.onesignal_caller"],
+    "search": ["main"],
+    "sync": ["main"],
+    "new-arrivals": ["main"],
+    "refresh": ["main"],
+    "game": ["main"],
+    "export-excluded": ["main"],
+    "interface": ["main", "ui.interface"],
+}
+
+# Budgets in milliseconds of total import time (generous for slow CI machines)
+BUDGETS_MS = {
+    "promo": 500,
+    "best-deals": 500,
+    "search": 400,
+    "sync": 400,
+    "new-arrivals": 400,
+    "refresh": 400,
+    "game": 400,
+    "export-excluded": 400,
+    "interface": 600,
+}
+
+# Slow-to-import packages and the only commands allowed to load them at startup
+HEAVY_MODULES = {
+    "customtkinter": {"interface"},
+    "onesignal": {"promo", "best-deals"},
+    "playwright": set(),  # imported when a browser caller is created, not at startup
+    "numpy": set(),  # the GUI's catalog is built on the DB worker after the window is up
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """(module, depth, self_us, cumulative_us) per line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        depth = (len(module) - len(module.lstrip())) // 2  # nesting is indented by two spaces
+        rows.append((module.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(modules: list[str]) -> list[tuple[str, int, int, int]]:
+    """Import modules in a fresh interpreter and return its importtime rows."""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("commands", nargs="*", help=f"Commands to measure (default: all of {', '.join(COMMAND_IMPORTS)})")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per command (best is kept)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to show per command")
+    args = parser.parse_args()
+    unknown = [command for command in args.commands if command not in COMMAND_IMPORTS]
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+
+    over_budget = []
+    for command in args.commands or COMMAND_IMPORTS:
+        runs = [measure(COMMAND_IMPORTS[command]) for _ in range(max(1, args.runs))]
+        best = min(runs, key=lambda rows: sum(row[2] for row in rows))
+        total_ms = sum(row[2] for row in best) / 1000
+        budget_ms = BUDGETS_MS[command]
+        loaded = {module for module, _, _, _ in best}
+        unexpected = sorted(m for m, allowed in HEAVY_MODULES.items() if m in loaded and command not in allowed)
+        status = "ok" if total_ms <= budget_ms else "OVER BUDGET"
+        if unexpected:
+            status += f", loads {', '.join(unexpected)}"
+        print(f"{command:<16} {total_ms:7.1f} ms  (budget {budget_ms} ms)  {status}")
+        # Top-level entries: modules imported directly by the -c statement
+        top_level = [(module, cumulative) for module, depth, _, cumulative in best if depth == 0]
+        for module, cumulative in sorted(top_level, key=lambda row: -row[1])[:args.top]:
+            print(f"    {cumulative / 1000:7.1f} ms  {module}")
+        if total_ms > budget_ms or unexpected:
+            over_budget.append(command)
+
+    if over_budget:
+        print(f"Failed: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
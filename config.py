@@ -2,6 +2,7 @@
 
 import logging
 import os
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +55,65 @@ def validate_onesignal_env() -> bool:
         return False
     return True
 
+# Delta crawl: re-fetch an unchanged listing card's detail page once its row is this old
+DELTA_MAX_AGE_DAYS = 7
+
+# Listing pages fetched concurrently once the page count is known
+DISCOVERY_WORKERS = 4
+
+# Crawl pipeline worker threads per stage (fetch is network-bound, the rest CPU/DB-bound)
+CRAWL_WORKERS = {"fetch": 4, "parse": 2, "rate": 1, "persist": 1}
+
+# Budgeted best-deals: assumed extra score for never-fetched games when ordering
+# fetches, so promising unknown games are tried before mediocre known ones
+BUDGET_UNKNOWN_PRIOR = RATING_NICE
+
+# Refresh scheduler (main.py refresh): detail pages fetched per run and score weights.
+# A game's score is staleness (0..1, full after REFRESH_STALE_DAYS without a fetch)
+# times the weighted sum of the terms below, each normalised to 0..1.
+REFRESH_BUDGET = 100
+REFRESH_STALE_DAYS = 14
+REFRESH_PROXIMITY_SCALE = 40      # rating points from MIN_RATING_FOR_NOTIFICATION for ~37% proximity
+REFRESH_VOLATILITY_CAP = 5        # price changes at which volatility saturates
+REFRESH_CHANGE_HALF_LIFE_DAYS = 30
+REFRESH_WEIGHTS = {
+    "rating": 1.0,         # higher-rated games matter more
+    "proximity": 1.5,      # near the notification threshold, a price move can tip them over
+    "volatility": 1.0,     # games whose price/discount changes often
+    "recent_change": 0.5,  # content changed recently, likely to change again
+}
+
+# New arrivals (main.py new-arrivals): listing sort for newest first (Shoptet "order"
+# parameter), and how many consecutive already-stored products end the walk
+NEW_ARRIVALS_SORT = "order=-date"
+NEW_ARRIVALS_STOP_RUN = 10
+NEW_ARRIVALS_MAX_PAGES = 20
+
+# Search cache (GUI session): parsed product and listing pages are reused for this long
+SEARCH_CACHE_TTL_SECONDS = 15 * 60
+
+# Resumable crawls: save the checkpoint after this many finished games
+CHECKPOINT_INTERVAL = 50
+
+# Cover art (GUI): downloaded and resized off the Tk thread; originals are kept
+# on disk and resized images in memory, each cache evicting least recently used
+IMAGE_CACHE_DIR = Path(".image_cache")
+IMAGE_DISK_CACHE_BYTES = 200 * 1024 * 1024
+IMAGE_MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+IMAGE_WORKERS = 4
+IMAGE_FETCH_TIMEOUT = 15
+IMAGE_COVER_SIZE = (280, 280)
+IMAGE_THUMBNAIL_SIZE = (32, 32)
+# Small cover thumbnails in the Database tab's first column
+DB_TAB_THUMBNAILS = False
+# Filter and sort the Database tab in memory (NumPy columns) instead of paging SQL queries; needs the catalog extra
+DB_TAB_CATALOG = True
+
+# Sitemap discovery: only child sitemaps whose URL contains the hint are read
+# when the index has any (falls back to all children otherwise)
+SITEMAP_URL = f"{BASE_URL}/sitemap.xml"
+SITEMAP_PRODUCT_HINT = "product"
+
 ENDPOINTS = {
     "shop": "/deskove-hry/",
     "promo": "/jarni-vyprodej/",
@@ -104,6 +164,45 @@ FILTERS = {
     "modular_board":"13875"
 }
 
+# Offline search (endpoint "offline"): FILTERS evaluated against games.db instead
+# of the shop. Each filter maps to database filter keys (see
+# database._build_filter_conditions); when several filters set the same key the
+# later one wins. Filters without an entry (stock) cannot be checked offline.
+OFFLINE_ENDPOINT = "offline"
+OFFLINE_FILTERS = {
+    "games_only": {"game_types": ["Základní hra"]},
+    "discounted": {"discounted": True},
+    "for_one_player": {"players": 1},
+    "simple": {"max_complexity": 2.0},
+    "medium": {"min_complexity": 2.0, "max_complexity": 3.0},
+    "complex": {"min_complexity": 3.0},
+    "good": {"min_bgg_rating": 7.0},
+    "amazing": {"min_bgg_rating": 8.0},
+    "very_cheap": {"max_price": 700},
+    "cheap": {"max_price": 1200},
+    "normal_price": {"min_price": 1200, "max_price": 2400},
+    "expensive": {"min_price": 2400, "max_price": 3600},
+    "very_expensive": {"min_price": 3600},
+    "no_language_required": {"game_language": "nezávisl"},
+    "game_in_polish": {"game_language": "Polština"},
+    "english_rulebook": {"rules_language": "Angličtina"},
+}
+# "cat:"/"mech:" filter keys -> tag names stored on game pages
+OFFLINE_TAG_NAMES = {
+    "card_game": "Karetní",
+    "adventure": "Dobrodružné",
+    "dice_game": "Kostkové",
+    "logic_game": "Logické",
+    "animals": "Zvířata",
+    "solo": "Solo / Solitaire Game",
+    "cooperative": "Cooperative Game",
+    "dice_rolling": "Dice Rolling",
+    "modular_board": "Modular Board",
+}
+# Matches fetched more than DELTA_MAX_AGE_DAYS ago are stale; at most this many
+# of them (best rated first) are re-fetched live per offline search
+OFFLINE_REFRESH_LIMIT = 25
+
 # Metadata to identify which filters are categories and which are mechanics
 # These lists contain the filter keys that should be prefixed with "cat:" or "mech:" in searches
 CATEGORY_FILTERS = ["card_game", "adventure", "dice_game", "logic_game", "animals"]
@@ -1,11 +1,17 @@
 """Database module for storing and retrieving board game data."""
 
+import hashlib
 import json
 import logging
+import queue
 import sqlite3
+import threading
+import time
 from contextlib import closing
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 
 from model.board_game import BoardGame
 
@@ -13,69 +19,360 @@ logger = logging.getLogger(__name__)
 
 DB_FILE: Path | str = Path("games.db")
 _db_initialized = False
+_name_fts_available = False  # set by _init_db when the trigram name index exists
+
+# Every plain ':memory:' connection is a separate empty DB, so in-memory mode uses one
+# named shared-cache DB kept alive by a keeper connection until the path changes.
+_MEMORY_DB_URI = "file:tlama_games?mode=memory&cache=shared"
+_memory_keeper: Optional[sqlite3.Connection] = None
 
 
 def set_db_path(path: str | Path) -> None:
     """Override database path (e.g. ':memory:' for tests). Resets init flag."""
-    global DB_FILE, _db_initialized
+    global DB_FILE, _db_initialized, _memory_keeper
+    if _memory_keeper is not None:
+        _memory_keeper.close()
+        _memory_keeper = None
     DB_FILE = path
     _db_initialized = False
+    if str(path) == ":memory:":
+        _memory_keeper = sqlite3.connect(_MEMORY_DB_URI, uri=True)
+
+
+# Called with the URLs of games whose rows changed, after each committed write
+# (saves, flag updates, re-ratings), e.g. to keep an in-memory catalog current
+_change_listeners: list[Callable[[list[str]], None]] = []
+
+
+def add_change_listener(listener: Callable[[list[str]], None]) -> None:
+    _change_listeners.append(listener)
+
+
+def remove_change_listener(listener: Callable[[list[str]], None]) -> None:
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+
+def _notify_changed(urls: list[str]) -> None:
+    """Tell listeners about committed changes; a failing listener does not fail the write."""
+    for listener in list(_change_listeners):
+        try:
+            listener(urls)
+        except Exception as e:
+            logger.exception("Change listener failed: %s", e)
 
 
 def _get_connection():
     """Get database connection with context manager support."""
-    conn = sqlite3.connect(str(DB_FILE))
+    if _memory_keeper is not None:
+        conn = sqlite3.connect(_MEMORY_DB_URI, uri=True)
+    else:
+        conn = sqlite3.connect(str(DB_FILE))
     conn.row_factory = sqlite3.Row
     return conn
 
 
+# Junction tables mirroring the JSON tag columns, keyed by the games column they index
+_TAG_TABLES = {
+    "game_categories": "game_category",
+    "game_mechanics": "game_mechanic",
+}
+
+
+def _as_tag_list(value) -> list[str]:
+    """Normalize a tag value (list, JSON string or plain string) to a list of names."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [v for v in value if v]
+    if isinstance(value, str) and value.startswith("["):
+        try:
+            return [v for v in json.loads(value) if v]
+        except json.JSONDecodeError:
+            pass
+    return [value]
+
+
+def _save_tags(cursor: sqlite3.Cursor, url: str, column: str, value) -> None:
+    """Replace the junction rows of one tag column for a game."""
+    table = _TAG_TABLES[column]
+    cursor.execute(f"DELETE FROM {table} WHERE url = ?", (url,))
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO {table} (url, name) VALUES (?, ?)",
+        [(url, name) for name in _as_tag_list(value)],
+    )
+
+
+def _backfill_tag_tables(cursor: sqlite3.Cursor) -> None:
+    """Fill junction tables from the JSON columns of existing rows."""
+    cursor.execute("SELECT url, game_categories, game_mechanics FROM games")
+    rows = cursor.fetchall()
+    for url, categories, mechanics in rows:
+        _save_tags(cursor, url, "game_categories", categories)
+        _save_tags(cursor, url, "game_mechanics", mechanics)
+    if rows:
+        logger.info("Migrated categories/mechanics of %d games to tag tables", len(rows))
+
+
+def _add_column(cursor: sqlite3.Cursor, table: str, column: str, definition: str) -> None:
+    """Add a column unless it exists (DBs created before versioning may already have it)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _migrate_create_games(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS games (
+            url TEXT PRIMARY KEY,
+            name TEXT,
+            final_price TEXT,
+            distributor TEXT,
+            category TEXT,
+            weight_kg REAL,
+            ean TEXT,
+            game_type TEXT,
+            min_age INTEGER,
+            game_language TEXT,
+            rules_language TEXT,
+            min_players INTEGER,
+            max_players INTEGER,
+            play_time_minutes INTEGER,
+            bgg_rating REAL,
+            complexity REAL,
+            author TEXT,
+            game_categories TEXT,
+            game_mechanics TEXT,
+            year_published INTEGER,
+            artists TEXT,
+            my_rating REAL,
+            has_demonic_vibe INTEGER DEFAULT 0,
+            owned INTEGER DEFAULT 0,
+            image TEXT
+        )
+    """)
+
+
+def _migrate_price_columns(cursor: sqlite3.Cursor) -> None:
+    _add_column(cursor, "games", "owned", "INTEGER DEFAULT 0")
+    _add_column(cursor, "games", "discount_percent", "INTEGER")
+    _add_column(cursor, "games", "original_price", "TEXT")
+
+
+def _migrate_tag_tables(cursor: sqlite3.Cursor) -> None:
+    for table in _TAG_TABLES.values():
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                url TEXT NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (url, name)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_name ON {table} (name, url)")
+    _backfill_tag_tables(cursor)
+
+
+def _migrate_price_index(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_games_price ON games (CAST(final_price AS INTEGER))"
+    )
+
+
+def _migrate_fetch_tracking(cursor: sqlite3.Cursor) -> None:
+    _add_column(cursor, "games", "content_hash", "TEXT")
+    _add_column(cursor, "games", "last_fetched_at", "TEXT")
+
+
+def _migrate_crawl_checkpoints(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+            crawl_key TEXT PRIMARY KEY,
+            pages_done TEXT NOT NULL DEFAULT '',
+            updated_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_checkpoint_urls (
+            crawl_key TEXT NOT NULL,
+            url TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (crawl_key, url)
+        )
+    """)
+
+
+def _migrate_change_tracking(cursor: sqlite3.Cursor) -> None:
+    _add_column(cursor, "games", "last_changed_at", "TEXT")
+    cursor.execute("UPDATE games SET last_changed_at = last_fetched_at WHERE last_changed_at IS NULL")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS price_history (
+            url TEXT NOT NULL,
+            observed_at TEXT NOT NULL,
+            final_price TEXT,
+            discount_percent INTEGER,
+            PRIMARY KEY (url, observed_at)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO price_history (url, observed_at, final_price, discount_percent)
+        SELECT url, last_fetched_at, final_price, discount_percent
+        FROM games WHERE last_fetched_at IS NOT NULL
+    """)
+
+
+def _migrate_order_indexes(cursor: sqlite3.Cursor) -> None:
+    # Expressions spelled out as shipped; queries use the same ones from _ORDER_EXPRESSIONS
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_order_my_rating ON games (IFNULL(my_rating, 0), url)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_order_name ON games (IFNULL(name, '') COLLATE NOCASE, url)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_games_order_final_price ON games (IFNULL(CAST(final_price AS INTEGER), 0), url)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_order_bgg_rating ON games (IFNULL(bgg_rating, 0), url)")
+
+
+def _migrate_flag_order_indexes(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_games_order_has_demonic_vibe ON games (IFNULL(has_demonic_vibe, 0), url)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_order_owned ON games (IFNULL(owned, 0), url)")
+
+
+def _migrate_name_search(cursor: sqlite3.Cursor) -> None:
+    # Trigram FTS5 index over games.name, so substring name search (LIKE '%term%'
+    # semantics, case-insensitive) is an index lookup. Skipped when this SQLite
+    # lacks FTS5/trigram; name filters then fall back to LIKE.
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS games_name_fts USING fts5(
+                name, content='games', content_rowid='rowid', tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning("Name search index unavailable, using LIKE: %s", e)
+        return
+    _create_name_fts_triggers(cursor)
+    cursor.execute("INSERT INTO games_name_fts (games_name_fts) VALUES ('rebuild')")
+
+
+def _create_name_fts_triggers(cursor: sqlite3.Cursor) -> None:
+    """Keep games_name_fts in step with games.name."""
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS games_name_fts_insert AFTER INSERT ON games BEGIN
+            INSERT INTO games_name_fts (rowid, name) VALUES (new.rowid, new.name);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS games_name_fts_delete AFTER DELETE ON games BEGIN
+            INSERT INTO games_name_fts (games_name_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS games_name_fts_update AFTER UPDATE OF name ON games BEGIN
+            INSERT INTO games_name_fts (games_name_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+            INSERT INTO games_name_fts (rowid, name) VALUES (new.rowid, new.name);
+        END
+    """)
+
+
+def _migrate_offline_filter_indexes(cursor: sqlite3.Cursor) -> None:
+    # Selective offline-search filters; the partial index only holds discounted rows
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_discounted ON games (discount_percent) WHERE discount_percent > 0")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_complexity ON games (complexity)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_min_players ON games (min_players)")
+
+
+def _migrate_rejected_pages(cursor: sqlite3.Cursor) -> None:
+    # Fetched pages that did not parse as games (categories, articles), so sitemap
+    # syncs skip them until their lastmod moves past rejected_at
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rejected_pages (
+            url TEXT PRIMARY KEY,
+            rejected_at TEXT NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+
+def _migrate_games_rowid_alias(cursor: sqlite3.Cursor) -> None:
+    # games_name_fts links to games by rowid, which VACUUM may renumber unless it is
+    # an explicit INTEGER PRIMARY KEY: rebuild games with id as that key (url stays
+    # unique for upserts), keeping every column, the current rowids and the indexes
+    cursor.execute("PRAGMA table_info(games)")
+    columns = [(row[1], row[2], row[4]) for row in cursor.fetchall()]  # name, type, default
+    definitions = ["id INTEGER PRIMARY KEY"] + [
+        "url TEXT NOT NULL UNIQUE" if name == "url"
+        else f"{name} {col_type}" + (f" DEFAULT {default}" if default is not None else "")
+        for name, col_type, default in columns
+    ]
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'games' AND sql IS NOT NULL"
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    names = ", ".join(name for name, _, _ in columns)
+    cursor.execute(f"CREATE TABLE games_new ({', '.join(definitions)})")
+    cursor.execute(f"INSERT INTO games_new (id, {names}) SELECT rowid, {names} FROM games WHERE url IS NOT NULL")
+    cursor.execute("DROP TABLE games")  # also drops its indexes and the name index triggers
+    cursor.execute("ALTER TABLE games_new RENAME TO games")
+    for sql in indexes:
+        cursor.execute(sql)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'games_name_fts'")
+    if cursor.fetchone():
+        _create_name_fts_triggers(cursor)
+        cursor.execute("INSERT INTO games_name_fts (games_name_fts) VALUES ('rebuild')")
+
+
+# Schema migrations in order; step N upgrades PRAGMA user_version N to N + 1.
+# Append new steps only - never edit or reorder shipped ones.
+_MIGRATIONS = [
+    _migrate_create_games,
+    _migrate_price_columns,
+    _migrate_tag_tables,
+    _migrate_price_index,
+    _migrate_order_indexes,
+    _migrate_fetch_tracking,
+    _migrate_crawl_checkpoints,
+    _migrate_change_tracking,
+    _migrate_flag_order_indexes,
+    _migrate_name_search,
+    _migrate_offline_filter_indexes,
+    _migrate_rejected_pages,
+    _migrate_games_rowid_alias,
+]
+
+
+def _apply_migrations(conn: sqlite3.Connection) -> None:
+    """Apply pending migrations, each in its own transaction together with its version bump."""
+    conn.isolation_level = None  # explicit BEGIN/COMMIT so DDL is transactional too
+    cursor = conn.cursor()
+    for version, migration in enumerate(_MIGRATIONS):
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock in case another process migrated meanwhile
+            if cursor.execute("PRAGMA user_version").fetchone()[0] > version:
+                cursor.execute("COMMIT")
+                continue
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {version + 1}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        logger.debug("Applied DB migration %d (%s)", version + 1, migration.__name__)
+
+
 def _init_db() -> None:
-    """Initialize the database with required tables (runs once)."""
+    """Bring the database schema up to date (runs once per process)."""
     global _db_initialized
     if _db_initialized:
         return
 
+    global _name_fts_available
     with closing(_get_connection()) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS games (
-                url TEXT PRIMARY KEY,
-                name TEXT,
-                final_price TEXT,
-                distributor TEXT,
-                category TEXT,
-                weight_kg REAL,
-                ean TEXT,
-                game_type TEXT,
-                min_age INTEGER,
-                game_language TEXT,
-                rules_language TEXT,
-                min_players INTEGER,
-                max_players INTEGER,
-                play_time_minutes INTEGER,
-                bgg_rating REAL,
-                complexity REAL,
-                author TEXT,
-                game_categories TEXT,
-                game_mechanics TEXT,
-                year_published INTEGER,
-                artists TEXT,
-                my_rating REAL,
-                has_demonic_vibe INTEGER DEFAULT 0,
-                owned INTEGER DEFAULT 0,
-                image TEXT
-            )
-        """)
-        for col_sql in [
-            "ALTER TABLE games ADD COLUMN owned INTEGER DEFAULT 0",
-            "ALTER TABLE games ADD COLUMN discount_percent INTEGER",
-            "ALTER TABLE games ADD COLUMN original_price TEXT",
-        ]:
-            try:
-                cursor.execute(col_sql)
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-        conn.commit()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < len(_MIGRATIONS):
+            _apply_migrations(conn)
+        _name_fts_available = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'games_name_fts'"
+        ).fetchone() is not None
 
     _db_initialized = True
 
@@ -89,6 +386,61 @@ def game_exists(url: str) -> bool:
         return cursor.fetchone() is not None
 
 
+class KnownGame(NamedTuple):
+    """Compact per-URL state needed by crawls, without building a BoardGame."""
+
+    owned: bool
+    has_demonic_vibe: bool
+    final_price: Optional[str]
+    discount_percent: Optional[int]
+    content_hash: Optional[str]
+    last_fetched_at: Optional[str]
+
+
+def load_known_games() -> dict[str, KnownGame]:
+    """Bulk-load KnownGame state for every stored URL in one query."""
+    _init_db()
+    with closing(_get_connection()) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT url, owned, has_demonic_vibe, final_price, discount_percent,
+                   content_hash, last_fetched_at
+            FROM games
+        """)
+        return {
+            row["url"]: KnownGame(
+                bool(row["owned"]),
+                bool(row["has_demonic_vibe"]),
+                row["final_price"],
+                row["discount_percent"],
+                row["content_hash"],
+                row["last_fetched_at"],
+            )
+            for row in cursor.fetchall()
+        }
+
+
+def load_rejected_pages() -> dict[str, str]:
+    """URL -> rejected_at (UTC ISO timestamp) of fetched pages that were not games."""
+    _init_db()
+    with closing(_get_connection()) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT url, rejected_at FROM rejected_pages")
+        return {row["url"]: row["rejected_at"] for row in cursor.fetchall()}
+
+
+def mark_pages_rejected(urls: Iterable[str]) -> None:
+    """Record fetched pages that did not parse as games, stamped with the current time."""
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    rows = [(url, now) for url in urls]
+    if not rows:
+        return
+    _init_db()
+    with closing(_get_connection()) as conn:
+        conn.executemany("INSERT OR REPLACE INTO rejected_pages (url, rejected_at) VALUES (?, ?)", rows)
+        conn.commit()
+
+
 def _encode_list(value) -> Optional[str]:
     """Encode list as JSON for DB storage."""
     if value is None:
@@ -105,49 +457,228 @@ def _ensure_not_list(value) -> Optional[str]:
     return value
 
 
+def content_hash(board_game: BoardGame) -> str:
+    """Hash of the scraped content of a game (ignores rating, user flags and timestamps)."""
+    content = board_game.to_json()
+    for key in ("my_rating", "deal"):
+        content.pop(key, None)
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+_GAME_COLUMNS = (
+    "url", "name", "final_price", "discount_percent", "original_price", "distributor", "category",
+    "weight_kg", "ean", "game_type", "min_age", "game_language", "rules_language",
+    "min_players", "max_players", "play_time_minutes", "bgg_rating", "complexity",
+    "author", "game_categories", "game_mechanics", "year_published", "artists", "my_rating",
+    "has_demonic_vibe", "owned", "image", "content_hash", "last_fetched_at",
+)
+
+# User-set flags: written only by update_game_boolean, so a save (e.g. a crawl holding
+# flags read before the user toggled them) never overwrites them on an existing row
+_USER_FLAG_COLUMNS = ("has_demonic_vibe", "owned")
+
+# Upsert keeps last_changed_at unless the scraped content (content_hash) differs
+_UPSERT_GAME_SQL = f"""
+    INSERT INTO games ({", ".join(_GAME_COLUMNS)}, last_changed_at)
+    VALUES ({", ".join("?" for _ in _GAME_COLUMNS)}, ?)
+    ON CONFLICT (url) DO UPDATE SET
+        {", ".join(f"{col} = excluded.{col}" for col in _GAME_COLUMNS if col != "url" and col not in _USER_FLAG_COLUMNS)},
+        last_changed_at = CASE
+            WHEN games.content_hash IS excluded.content_hash THEN games.last_changed_at
+            ELSE excluded.last_changed_at
+        END
+"""
+
+# Record a price point only when it differs from the latest one for the game
+_PRICE_HISTORY_SQL = """
+    INSERT OR REPLACE INTO price_history (url, observed_at, final_price, discount_percent)
+    SELECT ?1, ?2, ?3, ?4
+    WHERE NOT EXISTS (
+        SELECT 1 FROM (
+            SELECT final_price, discount_percent FROM price_history
+            WHERE url = ?1 ORDER BY observed_at DESC LIMIT 1
+        ) WHERE final_price IS ?3 AND discount_percent IS ?4
+    )
+"""
+
+
+def _write_game(cursor: sqlite3.Cursor, board_game: BoardGame) -> None:
+    """Write one game row, its tag rows and a price history point (caller commits)."""
+    fetched_at = getattr(board_game, "last_fetched_at", None)
+    changed_at = fetched_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+    final_price = _ensure_not_list(board_game.final_price)
+    discount_percent = getattr(board_game, "discount_percent", None)
+    cursor.execute(_UPSERT_GAME_SQL, (
+        board_game.url,
+        _ensure_not_list(board_game.name),
+        final_price,
+        discount_percent,
+        getattr(board_game, "original_price", None),
+        _ensure_not_list(board_game.distributor),
+        _ensure_not_list(board_game.category),
+        board_game.weight_kg,
+        _ensure_not_list(board_game.ean),
+        _ensure_not_list(board_game.game_type),
+        board_game.min_age,
+        _ensure_not_list(board_game.game_language),
+        _encode_list(board_game.rules_language),
+        board_game.min_players,
+        board_game.max_players,
+        board_game.play_time_minutes,
+        board_game.bgg_rating,
+        board_game.complexity,
+        _ensure_not_list(board_game.author),
+        _encode_list(board_game.game_categories),
+        _encode_list(board_game.game_mechanics),
+        board_game.year_published,
+        _encode_list(board_game.artists),
+        board_game.my_rating,
+        1 if getattr(board_game, "has_demonic_vibe", 0) else 0,
+        1 if getattr(board_game, "owned", 0) else 0,
+        getattr(board_game, "image", None),
+        content_hash(board_game),
+        fetched_at,
+        changed_at,
+    ))
+    if fetched_at is not None:
+        cursor.execute(_PRICE_HISTORY_SQL, (board_game.url, fetched_at, final_price, discount_percent))
+    _save_tags(cursor, board_game.url, "game_categories", board_game.game_categories)
+    _save_tags(cursor, board_game.url, "game_mechanics", board_game.game_mechanics)
+
+
 def save_game(board_game: BoardGame) -> None:
     """Save a BoardGame instance to the database."""
+    save_games([board_game])
+
+
+def save_games(board_games: list[BoardGame]) -> None:
+    """Save several BoardGame instances in a single transaction."""
     _init_db()
     with closing(_get_connection()) as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO games (
-                url, name, final_price, discount_percent, original_price, distributor, category,
-                weight_kg, ean, game_type, min_age, game_language, rules_language,
-                min_players, max_players, play_time_minutes, bgg_rating, complexity,
-                author, game_categories, game_mechanics, year_published, artists, my_rating,
-                has_demonic_vibe, owned, image
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            board_game.url,
-            _ensure_not_list(board_game.name),
-            _ensure_not_list(board_game.final_price),
-            getattr(board_game, "discount_percent", None),
-            getattr(board_game, "original_price", None),
-            _ensure_not_list(board_game.distributor),
-            _ensure_not_list(board_game.category),
-            board_game.weight_kg,
-            _ensure_not_list(board_game.ean),
-            _ensure_not_list(board_game.game_type),
-            board_game.min_age,
-            _ensure_not_list(board_game.game_language),
-            _encode_list(board_game.rules_language),
-            board_game.min_players,
-            board_game.max_players,
-            board_game.play_time_minutes,
-            board_game.bgg_rating,
-            board_game.complexity,
-            _ensure_not_list(board_game.author),
-            _encode_list(board_game.game_categories),
-            _encode_list(board_game.game_mechanics),
-            board_game.year_published,
-            _encode_list(board_game.artists),
-            board_game.my_rating,
-            1 if getattr(board_game, "has_demonic_vibe", 0) else 0,
-            1 if getattr(board_game, "owned", 0) else 0,
-            getattr(board_game, "image", None),
-        ))
+        for board_game in board_games:
+            _write_game(cursor, board_game)
         conn.commit()
+    _notify_changed([board_game.url for board_game in board_games])
+
+
+WRITER_QUEUE_SIZE = 256
+WRITER_BATCH_SIZE = 50
+_WRITER_STOP = object()
+
+
+class GameWriter:
+    """
+    Write-behind persistence for crawls.
+
+    put() hands a parsed game to a background thread that owns the single
+    write connection and saves queued games in batched transactions. put()
+    blocks while the queue is full (backpressure); flush() waits until every
+    queued game is committed and close() additionally stops the thread.
+    Writer errors are re-raised from the next put()/flush()/close().
+    """
+
+    def __init__(self, queue_size: int = WRITER_QUEUE_SIZE, batch_size: int = WRITER_BATCH_SIZE):
+        _init_db()
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._games_written = 0
+        self._batches = 0
+        self._batch_seconds_total = 0.0
+        self._batch_seconds_max = 0.0
+        self._max_queue_depth = 0
+        self._blocked_puts = 0
+        self._thread = threading.Thread(target=self._run, name="game-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, board_game: BoardGame) -> None:
+        """Queue a game for saving, blocking while the queue is full."""
+        if self._closed:
+            raise RuntimeError("GameWriter is closed")
+        self._raise_if_failed()
+        if self._queue.full():
+            with self._lock:
+                self._blocked_puts += 1
+        self._queue.put(board_game)
+        with self._lock:
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+
+    def flush(self) -> None:
+        """Barrier: return once every game queued so far is committed."""
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Flush pending games and stop the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_WRITER_STOP)
+            self._thread.join()
+        self._raise_if_failed()
+
+    def stats(self) -> dict:
+        """Queue depth and batch latency metrics."""
+        with self._lock:
+            batches = self._batches
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "blocked_puts": self._blocked_puts,
+                "games_written": self._games_written,
+                "batches": batches,
+                "avg_batch_ms": self._batch_seconds_total / batches * 1000 if batches else 0.0,
+                "max_batch_ms": self._batch_seconds_max * 1000,
+            }
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("GameWriter failed to save games") from self._error
+
+    def _run(self) -> None:
+        with closing(_get_connection()) as conn:
+            stop = False
+            while not stop:
+                batch = [self._queue.get()]
+                while len(batch) < self._batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                games = [item for item in batch if item is not _WRITER_STOP]
+                stop = len(games) != len(batch)
+                if games and self._error is None:
+                    self._write_batch(conn, games)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, conn: sqlite3.Connection, games: list[BoardGame]) -> None:
+        started = time.perf_counter()
+        try:
+            cursor = conn.cursor()
+            for board_game in games:
+                _write_game(cursor, board_game)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.exception("Error saving batch of %d games: %s", len(games), e)
+            self._error = e
+            return
+        elapsed = time.perf_counter() - started
+        _notify_changed([board_game.url for board_game in games])
+        with self._lock:
+            self._games_written += len(games)
+            self._batches += 1
+            self._batch_seconds_total += elapsed
+            self._batch_seconds_max = max(self._batch_seconds_max, elapsed)
+
+    def __enter__(self) -> "GameWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
 
 def load_game(url: str) -> Optional[BoardGame]:
@@ -170,35 +701,31 @@ def load_game(url: str) -> Optional[BoardGame]:
             cursor = conn.cursor()
             cursor.execute("UPDATE games SET my_rating = ? WHERE url = ?", (new_rating, url))
             conn.commit()
+        _notify_changed([url])
 
     return board_game
 
 
-_ORDER_QUERIES = {
-    "my_rating DESC": "SELECT * FROM games ORDER BY my_rating DESC",
-    "my_rating ASC": "SELECT * FROM games ORDER BY my_rating ASC",
-    "name ASC": "SELECT * FROM games ORDER BY name ASC",
-    "name DESC": "SELECT * FROM games ORDER BY name DESC",
-    "final_price ASC": "SELECT * FROM games ORDER BY final_price ASC",
-    "final_price DESC": "SELECT * FROM games ORDER BY final_price DESC",
-}
+_LOAD_CHUNK_SIZE = 500  # stays well below SQLite's bound-parameter limit
 
 
-def get_all_games(
-    limit: Optional[int] = None, order_by: str = "my_rating DESC"
-) -> list[BoardGame]:
-    """Get all games from database, optionally limited and ordered."""
+def load_games(urls: list[str]) -> dict[str, BoardGame]:
+    """Load several games by URL with chunked IN queries; unknown URLs are left out."""
     _init_db()
-    query = _ORDER_QUERIES.get(order_by, _ORDER_QUERIES["my_rating DESC"])
-
+    urls = list(dict.fromkeys(urls))
+    rows: list[sqlite3.Row] = []
     with closing(_get_connection()) as conn:
         cursor = conn.cursor()
-        if limit is not None:
-            cursor.execute(query + " LIMIT ?", (limit,))
-        else:
-            cursor.execute(query)
-        rows = cursor.fetchall()
+        for start in range(0, len(urls), _LOAD_CHUNK_SIZE):
+            chunk = urls[start:start + _LOAD_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"SELECT * FROM games WHERE url IN ({placeholders})", chunk)
+            rows.extend(cursor.fetchall())
+    return {game.url: game for game in _rows_to_games(rows)}
 
+
+def _rows_to_games(rows: list[sqlite3.Row]) -> list[BoardGame]:
+    """Convert DB rows to BoardGame instances, skipping rows that fail to convert."""
     games = []
     for row in rows:
         try:
@@ -208,51 +735,340 @@ def get_all_games(
     return games
 
 
-def search_games_in_db(
-    name: Optional[str] = None,
-    min_rating: Optional[float] = None,
-    max_price: Optional[int] = None,
-    distributor: Optional[str] = None,
-    limit: Optional[int] = None,
-) -> list[BoardGame]:
-    """Search games in database with filters."""
-    _init_db()
-    conditions = []
-    params = []
+# Sortable columns: SQL expression per column, each backed by an (expression, url) index
+# so keyset pagination can seek instead of scanning. NULLs sort as 0 / "". The indexes
+# are built by migration steps with these expressions written out; keep them identical.
+_ORDER_EXPRESSIONS = {
+    "my_rating": "IFNULL(my_rating, 0)",
+    "name": "IFNULL(name, '') COLLATE NOCASE",
+    "final_price": "IFNULL(CAST(final_price AS INTEGER), 0)",
+    "bgg_rating": "IFNULL(bgg_rating, 0)",
+    "has_demonic_vibe": "IFNULL(has_demonic_vibe, 0)",
+    "owned": "IFNULL(owned, 0)",
+    "url": "url",
+}
+DEFAULT_ORDER = "my_rating DESC"
+DEFAULT_BATCH_SIZE = 200
+
+
+def _parse_order(order_by: str) -> tuple[str, str]:
+    """Split "column DIRECTION" into a known column and ASC/DESC (falls back to DEFAULT_ORDER)."""
+    parts = order_by.split()
+    if len(parts) == 2 and parts[0] in _ORDER_EXPRESSIONS and parts[1].upper() in ("ASC", "DESC"):
+        return parts[0], parts[1].upper()
+    column, direction = DEFAULT_ORDER.split()
+    return column, direction
+
 
-    if name:
-        conditions.append("name LIKE ?")
-        params.append(f"%{name}%")
-    if min_rating is not None:
+def _build_filter_conditions(filters: Optional[dict]) -> tuple[list[str], list]:
+    """
+    Translate a filters dict into SQL conditions and parameters.
+
+    Supported keys: name, distributor (substring match), min_rating, min_price,
+    max_price, categories, mechanics (tag names) and match_all (default True:
+    a game must carry every requested tag of each kind). Offline search also
+    uses discounted, players (the game supports that many), min_complexity,
+    max_complexity, min_bgg_rating, game_types, game_language and
+    rules_language (substring matches) and urls; max_play_time is in minutes.
+    """
+    conditions: list[str] = []
+    params: list = []
+    filters = filters or {}
+
+    if filters.get("name"):
+        name = filters["name"]
+        if _name_fts_available and len(name) >= 3:
+            # Trigram index: a quoted phrase matches as a case-insensitive substring
+            conditions.append("rowid IN (SELECT rowid FROM games_name_fts WHERE games_name_fts MATCH ?)")
+            params.append('"' + name.replace('"', '""') + '"')
+        else:
+            conditions.append("name LIKE ?")
+            params.append(f"%{name}%")
+    if filters.get("distributor"):
+        conditions.append("distributor LIKE ?")
+        params.append(f"%{filters['distributor']}%")
+    if filters.get("min_rating") is not None:
         conditions.append("my_rating >= ?")
-        params.append(min_rating)
-    if max_price is not None:
+        params.append(filters["min_rating"])
+    if filters.get("min_price") is not None:
+        conditions.append("CAST(final_price AS INTEGER) >= ?")
+        params.append(filters["min_price"])
+    if filters.get("max_price") is not None:
         conditions.append("CAST(final_price AS INTEGER) <= ?")
-        params.append(max_price)
-    if distributor:
-        conditions.append("distributor LIKE ?")
-        params.append(f"%{distributor}%")
+        params.append(filters["max_price"])
+    if filters.get("discounted"):
+        conditions.append("discount_percent > 0")
+    if filters.get("players") is not None:
+        conditions.append("min_players <= ? AND IFNULL(max_players, min_players) >= ?")
+        params.extend([filters["players"], filters["players"]])
+    if filters.get("min_complexity") is not None:
+        conditions.append("complexity >= ?")
+        params.append(filters["min_complexity"])
+    if filters.get("max_complexity") is not None:
+        conditions.append("complexity <= ?")
+        params.append(filters["max_complexity"])
+    if filters.get("min_bgg_rating") is not None:
+        conditions.append("bgg_rating >= ?")
+        params.append(filters["min_bgg_rating"])
+    if filters.get("max_play_time") is not None:
+        conditions.append("play_time_minutes <= ?")
+        params.append(filters["max_play_time"])
+    if filters.get("game_types"):
+        conditions.append(f"game_type IN ({', '.join('?' for _ in filters['game_types'])})")
+        params.extend(filters["game_types"])
+    for column in ("game_language", "rules_language"):
+        if filters.get(column):
+            conditions.append(f"{column} LIKE ?")
+            params.append(f"%{filters[column]}%")
+    if filters.get("urls") is not None:
+        conditions.append(f"url IN ({', '.join('?' for _ in filters['urls'])})" if filters["urls"] else "0")
+        params.extend(filters["urls"])
+
+    match_all = filters.get("match_all", True)
+    for column, key in (("game_categories", "categories"), ("game_mechanics", "mechanics")):
+        names = list(dict.fromkeys(filters.get(key) or []))
+        if not names:
+            continue
+        placeholders = ", ".join("?" for _ in names)
+        subquery = f"SELECT url FROM {_TAG_TABLES[column]} WHERE name IN ({placeholders})"
+        params.extend(names)
+        if match_all:
+            subquery += " GROUP BY url HAVING COUNT(*) = ?"
+            params.append(len(names))
+        conditions.append(f"url IN ({subquery})")
+
+    return conditions, params
+
 
-    query = "SELECT * FROM games"
+def _keyset_page_query(
+    select: str,
+    order_by: str,
+    filters: Optional[dict],
+    after: Optional[tuple],
+    limit: int,
+    offset: int = 0,
+) -> tuple[str, list]:
+    """
+    Build one ordered page query over games with a sort_key column.
+
+    after is the (sort_key, url) of the previous page's last row for keyset
+    pagination; offset is only meant for jumping to a page with no known predecessor.
+    """
+    column, direction = _parse_order(order_by)
+    expr = _ORDER_EXPRESSIONS[column]
+    op = "<" if direction == "DESC" else ">"
+    conditions, params = _build_filter_conditions(filters)
+    if after is not None:
+        if column == "url":
+            conditions.append(f"url {op} ?")
+            params.append(after[1])
+        else:
+            # Expanded row-value comparison: SQLite only seeks expression indexes this way
+            conditions.append(f"{expr} {op}= ? AND ({expr} {op} ? OR url {op} ?)")
+            params.extend([after[0], after[0], after[1]])
+    query = f"SELECT {select}, {expr} AS sort_key FROM games"
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
-    query += " ORDER BY my_rating DESC"
-    if limit is not None:
-        query += " LIMIT ?"
-        params.append(limit)
+    query += f" ORDER BY {expr} {direction}, url {direction} LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    return query, params
+
+
+def iter_games(
+    order_by: str = DEFAULT_ORDER,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    filters: Optional[dict] = None,
+) -> Iterator[BoardGame]:
+    """
+    Yield games lazily in the given order, fetching batch_size rows at a time.
 
+    Uses keyset pagination on (sort expression, url), so each batch is an index
+    seek and memory stays flat regardless of catalog size. No connection is held
+    open between batches. See _build_filter_conditions for the filters dict.
+    """
+    _init_db()
+    last_key: Optional[tuple] = None
+
+    while True:
+        query, params = _keyset_page_query("*", order_by, filters, last_key, batch_size)
+        with closing(_get_connection()) as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        yield from _rows_to_games(rows)
+        if len(rows) < batch_size:
+            return
+        last_key = (rows[-1]["sort_key"], rows[-1]["url"])
+
+
+class GameRow(NamedTuple):
+    """The columns a game list shows, without building a BoardGame."""
+
+    url: str
+    name: Optional[str]
+    final_price: Optional[str]
+    discount_percent: Optional[int]
+    my_rating: Optional[float]
+    bgg_rating: Optional[float]
+    has_demonic_vibe: bool
+    owned: bool
+    sort_key: object  # value of the ORDER BY expression, for keyset paging
+    image: Optional[str] = None
+
+    @property
+    def page_key(self) -> tuple:
+        """`after` argument that continues a page right after this row."""
+        return (self.sort_key, self.url)
+
+
+def get_game_rows(
+    order_by: str = DEFAULT_ORDER,
+    filters: Optional[dict] = None,
+    limit: int = DEFAULT_BATCH_SIZE,
+    after: Optional[tuple] = None,
+    offset: int = 0,
+) -> list[GameRow]:
+    """
+    One page of list rows in SQL order (one indexed query per page).
+
+    Continue with after=rows[-1].page_key (keyset); use offset only to jump to
+    a page whose predecessor is unknown. Stored ratings are returned as is.
+    """
+    _init_db()
+    query, params = _keyset_page_query(
+        "url, name, final_price, discount_percent, my_rating, bgg_rating, has_demonic_vibe, owned, image",
+        order_by, filters, after, limit, offset,
+    )
     with closing(_get_connection()) as conn:
         cursor = conn.cursor()
         cursor.execute(query, params)
-        rows = cursor.fetchall()
+        return [
+            GameRow(
+                row["url"], row["name"], row["final_price"], row["discount_percent"], row["my_rating"],
+                row["bgg_rating"], bool(row["has_demonic_vibe"]), bool(row["owned"]), row["sort_key"],
+                row["image"],
+            )
+            for row in cursor.fetchall()
+        ]
+
+
+def count_games(filters: Optional[dict] = None) -> int:
+    """Number of games matching filters (see _build_filter_conditions)."""
+    _init_db()
+    conditions, params = _build_filter_conditions(filters)
+    query = "SELECT COUNT(*) FROM games"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    with closing(_get_connection()) as conn:
+        return conn.execute(query, params).fetchone()[0]
 
-    games = []
-    for row in rows:
-        try:
-            games.append(BoardGame.from_db_row(row))
-        except Exception as e:
-            logger.exception("Error converting row to BoardGame: %s", e)
-    return games
+
+class CatalogRow(NamedTuple):
+    """The columns of a game the in-memory catalog (utils.catalog) keeps."""
+
+    url: str
+    name: Optional[str]
+    price: Optional[int]
+    discount_percent: Optional[int]
+    my_rating: Optional[float]
+    bgg_rating: Optional[float]
+    min_players: Optional[int]
+    max_players: Optional[int]
+    play_time_minutes: Optional[int]
+    complexity: Optional[float]
+    has_demonic_vibe: bool
+    owned: bool
+    image: Optional[str]
+    categories: list[str]
+    mechanics: list[str]
+
+
+_CATALOG_SELECT = """
+    SELECT url, name, CAST(final_price AS INTEGER) AS price, discount_percent, my_rating, bgg_rating,
+           min_players, max_players, play_time_minutes, complexity, has_demonic_vibe, owned, image,
+           game_categories, game_mechanics
+    FROM games
+"""
+
+
+def load_catalog_rows(urls: Optional[list[str]] = None) -> list[CatalogRow]:
+    """Catalog columns of all games, or of the given URLs (unknown ones are left out)."""
+    _init_db()
+    with closing(_get_connection()) as conn:
+        cursor = conn.cursor()
+        if urls is None:
+            rows = cursor.execute(_CATALOG_SELECT).fetchall()
+        else:
+            urls = list(dict.fromkeys(urls))
+            rows = []
+            for start in range(0, len(urls), _LOAD_CHUNK_SIZE):
+                chunk = urls[start:start + _LOAD_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows.extend(cursor.execute(f"{_CATALOG_SELECT} WHERE url IN ({placeholders})", chunk).fetchall())
+    return [
+        CatalogRow(
+            row["url"], row["name"], row["price"], row["discount_percent"], row["my_rating"],
+            row["bgg_rating"], row["min_players"], row["max_players"], row["play_time_minutes"],
+            row["complexity"], bool(row["has_demonic_vibe"]), bool(row["owned"]), row["image"],
+            _as_tag_list(row["game_categories"]), _as_tag_list(row["game_mechanics"]),
+        )
+        for row in rows
+    ]
+
+
+def _take_games(games: Iterator[BoardGame], limit: Optional[int]) -> list[BoardGame]:
+    """Materialize at most limit games from an iterator (all when limit is None)."""
+    return list(games if limit is None else islice(games, limit))
+
+
+def get_all_games(
+    limit: Optional[int] = None, order_by: str = DEFAULT_ORDER
+) -> list[BoardGame]:
+    """Get all games from database, optionally limited and ordered."""
+    batch_size = min(limit, DEFAULT_BATCH_SIZE) if limit else DEFAULT_BATCH_SIZE
+    return _take_games(iter_games(order_by, batch_size=batch_size), limit)
+
+
+def search_games_in_db(
+    name: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    max_price: Optional[int] = None,
+    distributor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[BoardGame]:
+    """Search games in database with filters."""
+    filters = {
+        "name": name,
+        "min_rating": min_rating,
+        "max_price": max_price,
+        "distributor": distributor,
+    }
+    return _take_games(iter_games(filters=filters), limit)
+
+
+def find_games_by_tags(
+    categories: Optional[list[str]] = None,
+    mechanics: Optional[list[str]] = None,
+    match_all: bool = True,
+    max_price: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    limit: Optional[int] = None,
+) -> list[BoardGame]:
+    """
+    Find games by category/mechanic names (e.g. "Kostkové", "Solo / Solitaire Game").
+
+    With match_all=True a game must carry every requested tag of each kind,
+    otherwise any one of them is enough. Evaluated in SQL on the junction tables.
+    """
+    filters = {
+        "categories": categories,
+        "mechanics": mechanics,
+        "match_all": match_all,
+        "max_price": max_price,
+        "min_rating": min_rating,
+    }
+    return _take_games(iter_games(filters=filters), limit)
 
 
 def update_game_boolean(url: str, field: str, value: bool) -> bool:
@@ -269,6 +1085,7 @@ def update_game_boolean(url: str, field: str, value: bool) -> bool:
         cursor = conn.cursor()
         cursor.execute(sql, (1 if value else 0, url))
         conn.commit()
+    _notify_changed([url])
     return True
 
 
@@ -281,12 +1098,119 @@ def get_game_count() -> int:
         return cursor.fetchone()[0]
 
 
-def get_excluded_game_urls() -> list[str]:
-    """Get URLs of games marked as owned or has_demonic_vibe (for export to blocklist)."""
+def get_excluded_game_urls(urls: Optional[list[str]] = None) -> list[str]:
+    """
+    Get URLs of games marked as owned or has_demonic_vibe (for export to blocklist).
+
+    With urls, only those games are checked.
+    """
+    _init_db()
+    query = "SELECT url FROM games WHERE (owned = 1 OR has_demonic_vibe = 1)"
+    with closing(_get_connection()) as conn:
+        cursor = conn.cursor()
+        if urls is None:
+            return [row["url"] for row in cursor.execute(query).fetchall()]
+        urls = list(dict.fromkeys(urls))
+        result = []
+        for start in range(0, len(urls), _LOAD_CHUNK_SIZE):
+            chunk = urls[start:start + _LOAD_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            result.extend(row["url"] for row in cursor.execute(f"{query} AND url IN ({placeholders})", chunk))
+        return result
+
+
+class CrawlCheckpoint(NamedTuple):
+    """Saved progress of an interrupted crawl."""
+
+    pages_done: set[int]
+    discovered: list[str]  # full URLs in discovery order
+    completed: set[str]
+
+
+def load_checkpoint(crawl_key: str) -> Optional[CrawlCheckpoint]:
+    """Return the saved progress for crawl_key, or None when there is none."""
+    _init_db()
+    with closing(_get_connection()) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT pages_done FROM crawl_checkpoints WHERE crawl_key = ?", (crawl_key,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        cursor.execute(
+            "SELECT url, completed FROM crawl_checkpoint_urls WHERE crawl_key = ? ORDER BY rowid",
+            (crawl_key,),
+        )
+        rows = cursor.fetchall()
+    pages = {int(page) for page in row["pages_done"].split(",") if page}
+    return CrawlCheckpoint(
+        pages,
+        [r["url"] for r in rows],
+        {r["url"] for r in rows if r["completed"]},
+    )
+
+
+def save_checkpoint(
+    crawl_key: str,
+    pages_done: Iterable[int] = (),
+    discovered: Iterable[str] = (),
+    completed: Iterable[str] = (),
+) -> None:
+    """Add crawl progress to the checkpoint for crawl_key (creating it) in one transaction."""
     _init_db()
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
     with closing(_get_connection()) as conn:
         cursor = conn.cursor()
+        cursor.execute("SELECT pages_done FROM crawl_checkpoints WHERE crawl_key = ?", (crawl_key,))
+        row = cursor.fetchone()
+        pages = {int(page) for page in row["pages_done"].split(",") if page} if row else set()
+        pages.update(pages_done)
         cursor.execute(
-            "SELECT url FROM games WHERE owned = 1 OR has_demonic_vibe = 1"
+            "INSERT OR REPLACE INTO crawl_checkpoints (crawl_key, pages_done, updated_at) VALUES (?, ?, ?)",
+            (crawl_key, ",".join(str(page) for page in sorted(pages)), now),
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO crawl_checkpoint_urls (crawl_key, url) VALUES (?, ?)",
+            [(crawl_key, url) for url in discovered],
+        )
+        cursor.executemany(
+            "UPDATE crawl_checkpoint_urls SET completed = 1 WHERE crawl_key = ? AND url = ?",
+            [(crawl_key, url) for url in completed],
         )
-        return [row["url"] for row in cursor.fetchall()]
+        conn.commit()
+
+
+def clear_checkpoint(crawl_key: str) -> None:
+    """Forget saved progress for crawl_key (after a finished crawl or a fresh start)."""
+    _init_db()
+    with closing(_get_connection()) as conn:
+        conn.execute("DELETE FROM crawl_checkpoint_urls WHERE crawl_key = ?", (crawl_key,))
+        conn.execute("DELETE FROM crawl_checkpoints WHERE crawl_key = ?", (crawl_key,))
+        conn.commit()
+
+
+class RefreshCandidate(NamedTuple):
+    """Per-game inputs for choosing which stored games to re-fetch."""
+
+    url: str
+    my_rating: Optional[float]
+    discount_percent: Optional[int]
+    last_fetched_at: Optional[str]
+    last_changed_at: Optional[str]
+    price_changes: int  # recorded price/discount changes after the first observation
+
+
+def load_refresh_candidates() -> list[RefreshCandidate]:
+    """Load refresh inputs for every game that is neither owned nor evil, in one query."""
+    _init_db()
+    with closing(_get_connection()) as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT g.url, g.my_rating, g.discount_percent, g.last_fetched_at, g.last_changed_at,
+                   COALESCE(h.points, 1) - 1 AS price_changes
+            FROM games g
+            LEFT JOIN (
+                SELECT url, COUNT(*) AS points FROM price_history GROUP BY url
+            ) h ON h.url = g.url
+            WHERE COALESCE(g.owned, 0) = 0 AND COALESCE(g.has_demonic_vibe, 0) = 0
+        """)
+        return [RefreshCandidate(*row) for row in cursor.fetchall()]
@@ -2,16 +2,40 @@ import argparse
 import logging
 import sys
 
-from config import MIN_RATING_FOR_NOTIFICATION, PROMO_ACCEPTED_GAME_TYPES, to_czk_game_url
-from database import get_excluded_game_urls
-from integrations.onesignal_caller import send_custom_event
+from config import (
+    MIN_RATING_FOR_NOTIFICATION,
+    OFFLINE_ENDPOINT,
+    PROMO_ACCEPTED_GAME_TYPES,
+    REFRESH_BUDGET,
+    to_czk_game_url,
+)
+from database import (
+    GameWriter,
+    get_excluded_game_urls,
+    load_known_games,
+    load_refresh_candidates,
+    load_rejected_pages,
+)
 from model.board_game import BoardGame
-from ui.interface import run_interface
-from utils.blocklist import get_blocklist_path, is_url_excluded
+from utils.blocklist import is_url_excluded, load_excluded_urls, write_excluded_urls
 from utils.promo import get_promo_game
-from utils.search import present_results, search_for_game
+from utils.refresh import select_for_refresh
+from utils.search import (
+    CrawlBudget,
+    TopK,
+    discover_new_arrivals,
+    games_standings,
+    iter_budgeted_search,
+    iter_search,
+    present_results,
+    search_for_game,
+)
+from utils.sitemap import discover_from_sitemap
 from website_caller import WebsiteCaller
 
+# The OneSignal SDK and the GUI (customtkinter) are imported inside the commands
+# that use them, so headless commands start without loading either.
+
 # Configure root logger so all child loggers inherit the configuration
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +46,8 @@ logger = logging.getLogger(__name__)
 
 
 def run_promo_check() -> None:
+    from integrations.onesignal_caller import send_custom_event
+
     with WebsiteCaller(timeout=30, use_browser=True) as caller:
         try:
             promo_game = get_promo_game(caller)
@@ -42,32 +68,93 @@ def run_promo_check() -> None:
             logger.error("Error getting promo game: %s", e)
 
 
-def run_best_deals_check() -> None:
-    with WebsiteCaller(timeout=30, use_browser=True) as caller:
-        games = search_for_game(caller, filters=["discounted"])
-        # Filter out owned and excluded games
-        games = [
-            game
-            for game in games
-            if not getattr(game, "owned", False)
+def run_best_deals_check(
+    delta: bool = False,
+    budget_seconds: float | None = None,
+    budget_requests: int | None = None,
+    resume: bool = False,
+) -> None:
+    from integrations.onesignal_caller import send_custom_event
+
+    excluded = load_excluded_urls()
+
+    def is_candidate(game: BoardGame) -> bool:
+        # Skip owned, evil and excluded games
+        return (
+            not getattr(game, "owned", False)
             and not getattr(game, "has_demonic_vibe", False)
-            and not is_url_excluded(game.url)
-        ]
-        if not games:
+            and not is_url_excluded(game.url, excluded)
+        )
+
+    with WebsiteCaller(timeout=30, use_browser=True) as caller:
+        if budget_seconds is not None or budget_requests is not None:
+            budget = CrawlBudget(seconds=budget_seconds, requests=budget_requests)
+            games = iter_budgeted_search(caller, budget, filters=["discounted"], delta=delta)
+        else:
+            games = iter_search(caller, filters=["discounted"], delta=delta, resume=resume)
+        best = TopK(1, predicate=is_candidate).extend(games)
+        if not best:
             logger.info("No unowned discounted games found")
             return
-        best_deal_game = games[0]
+        best_deal_game = best.best()[0]
         best_deal_game.deal = "weekly"
         logger.info(best_deal_game.get_data_row())
         send_custom_event(best_deal_game.to_json())
 
 
-def run_search_check(filters: list | None = None, endpoint: str = "shop") -> None:
-    with WebsiteCaller(timeout=30, use_browser=True) as caller:
-        games = search_for_game(caller, filters=filters or [], endpoint=endpoint)
+def run_search_check(
+    filters: list | None = None,
+    endpoint: str = "shop",
+    delta: bool = False,
+    resume: bool = False,
+) -> None:
+    # Offline searches only re-fetch product pages, which need no browser (like refresh)
+    with WebsiteCaller(timeout=30, use_browser=endpoint != OFFLINE_ENDPOINT) as caller:
+        games = search_for_game(caller, filters=filters or [], endpoint=endpoint, delta=delta, resume=resume)
         present_results(games)
 
 
+def run_sitemap_sync(limit: int | None = None) -> None:
+    """Refresh games.db for the whole shop: fetch pages the sitemap reports as new or changed."""
+    stats: dict = {}
+    known = load_known_games()
+    with WebsiteCaller(timeout=30, use_browser=False) as caller:
+        urls = discover_from_sitemap(caller, known, stats=stats, rejected=load_rejected_pages())
+        if limit is not None:
+            urls = urls[:limit]
+        with GameWriter() as writer:
+            games = games_standings(urls, caller, writer=writer, known=known, stats=stats)
+    logger.info("Sitemap sync saved %d games (stats: %s)", len(games), stats)
+
+
+def run_new_arrivals() -> None:
+    """Fetch and rate products added since the last run, stopping at already-known listings."""
+    stats: dict = {}
+    known = load_known_games()
+    with WebsiteCaller(timeout=30, use_browser=False) as caller:
+        urls = discover_new_arrivals(caller, set(known), stats=stats)
+        if not urls:
+            logger.info("No new arrivals")
+            return
+        with GameWriter() as writer:
+            games = games_standings(urls, caller, writer=writer, known=known, stats=stats)
+    logger.info("New arrivals stats: %s", stats)
+    present_results(games)
+
+
+def run_refresh(budget: int = REFRESH_BUDGET) -> None:
+    """Re-fetch the stored games most worth refreshing, spending at most `budget` page requests."""
+    stats: dict = {}
+    urls = select_for_refresh(load_refresh_candidates(), budget)
+    if not urls:
+        logger.info("Nothing to refresh")
+        return
+    with WebsiteCaller(timeout=30, use_browser=False) as caller:
+        with GameWriter() as writer:
+            games = games_standings(urls, caller, writer=writer, stats=stats)
+    logger.info("Refreshed %d games (stats: %s)", len(games), stats)
+
+
 def run_game_check(url: str) -> None:
     czk_url = to_czk_game_url(url)
     with WebsiteCaller(timeout=30, use_browser=False) as caller:
@@ -79,16 +166,7 @@ def run_game_check(url: str) -> None:
 def run_export_excluded() -> None:
     """Export URLs of owned/evil games from DB to blocklist file."""
     urls = get_excluded_game_urls()
-    path = get_blocklist_path()
-    header = (
-        "# Excluded game URLs - never send notifications for these games\n"
-        "# One URL per line. Add via: uv run python main.py export-excluded\n"
-        "# Or edit manually. Used by CI and local runs.\n\n"
-    )
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(header)
-        for url in sorted(urls):
-            f.write(f"{url}\n")
+    path = write_excluded_urls(urls)
     logger.info("Exported %d URLs to %s", len(urls), path)
 
 
@@ -100,7 +178,19 @@ def main() -> None:
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     subparsers.add_parser("promo", help="Check daily promo game")
-    subparsers.add_parser("best-deals", help="Check weekly best discounted deals")
+    delta_help = "Only re-fetch games whose listing price/discount changed or whose data is stale"
+    resume_help = "Continue the last interrupted crawl with the same filters from its checkpoint"
+    best_deals_parser = subparsers.add_parser("best-deals", help="Check weekly best discounted deals")
+    best_deals_parser.add_argument("--delta", action="store_true", help=delta_help)
+    best_deals_parser.add_argument(
+        "--budget-seconds", type=float, default=None,
+        help="Stop fetching game pages after this many seconds (most promising games first)",
+    )
+    best_deals_parser.add_argument(
+        "--budget-requests", type=int, default=None,
+        help="Fetch at most this many game pages (most promising games first)",
+    )
+    best_deals_parser.add_argument("--resume", action="store_true", help=resume_help)
     subparsers.add_parser("interface", help="Launch GUI")
     subparsers.add_parser(
         "export-excluded",
@@ -109,6 +199,28 @@ def main() -> None:
 
     search_parser = subparsers.add_parser("search", help="Search games with filters")
     search_parser.add_argument("filters", nargs="*", help="Filter names (e.g. discounted, cheap)")
+    search_parser.add_argument("--delta", action="store_true", help=delta_help)
+    search_parser.add_argument("--resume", action="store_true", help=resume_help)
+    search_parser.add_argument(
+        "--offline", action="store_true",
+        help="Evaluate the filters against games.db; only stale matches are fetched live",
+    )
+
+    sync_parser = subparsers.add_parser(
+        "sync", help="Refresh the whole catalog from the shop sitemap (new/changed pages only)"
+    )
+    sync_parser.add_argument("--limit", type=int, default=None, help="Max pages to fetch this run")
+
+    subparsers.add_parser(
+        "new-arrivals", help="Fetch and rate products added since the last run (newest-first listing)"
+    )
+
+    refresh_parser = subparsers.add_parser(
+        "refresh", help="Re-fetch the stored games most worth refreshing (stale, near the threshold, volatile)"
+    )
+    refresh_parser.add_argument(
+        "--budget", type=int, default=REFRESH_BUDGET, help="Max game pages to fetch this run"
+    )
 
     game_parser = subparsers.add_parser("game", help="Check a specific game by URL")
     game_parser.add_argument("url", help="Game page URL")
@@ -116,15 +228,38 @@ def main() -> None:
     args = parser.parse_args()
     command = args.command
 
+    if command == "best-deals" and args.resume and (
+        args.budget_seconds is not None or args.budget_requests is not None
+    ):
+        parser.error("--resume cannot be combined with a crawl budget")
+
     if command == "promo":
         run_promo_check()
     elif command == "best-deals":
-        run_best_deals_check()
+        run_best_deals_check(
+            delta=args.delta,
+            budget_seconds=args.budget_seconds,
+            budget_requests=args.budget_requests,
+            resume=args.resume,
+        )
     elif command == "search":
-        run_search_check(filters=args.filters if args.filters else None)
+        run_search_check(
+            filters=args.filters if args.filters else None,
+            endpoint=OFFLINE_ENDPOINT if args.offline else "shop",
+            delta=args.delta,
+            resume=args.resume,
+        )
+    elif command == "sync":
+        run_sitemap_sync(limit=args.limit)
+    elif command == "new-arrivals":
+        run_new_arrivals()
+    elif command == "refresh":
+        run_refresh(budget=args.budget)
     elif command == "game":
         run_game_check(args.url)
     elif command == "interface":
+        from ui.interface import run_interface
+
         run_interface()
     elif command == "export-excluded":
         run_export_excluded()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime, timezone
 from typing import Any
 
 from bs4 import BeautifulSoup
@@ -100,6 +101,7 @@ class BoardGame:
         self.image = None
         self.discount_percent: int | None = None
         self.original_price: str | None = None
+        self.last_fetched_at: str | None = None  # UTC ISO timestamp of the last page parse
         self.parameters = {}
         if not skip_html_parsing and html_page_data:
             self.from_html(html_page_data)
@@ -145,6 +147,7 @@ class BoardGame:
         board_game.has_demonic_vibe = _get_row_bool(row, "has_demonic_vibe")
         board_game.owned = _get_row_bool(row, "owned")
         board_game.image = _get_row_value(row, "image")
+        board_game.last_fetched_at = _get_row_value(row, "last_fetched_at")
 
         board_game.rate()
         return board_game
@@ -228,12 +231,14 @@ class BoardGame:
             return [v.strip() for v in value_str.split(",")]
         return value_str
 
-    def _normalize_price(self, text: str) -> str | None:
+    @staticmethod
+    def _normalize_price(text: str) -> str | None:
         """Extract numeric price from '1 999 Kč' (Czech format)."""
         raw = text.replace(' ', '').replace('Kč', '').replace('\n', '').strip()
         return raw if raw and raw.isdigit() else None
 
-    def _parse_discount_percent(self, text: str) -> int | None:
+    @staticmethod
+    def _parse_discount_percent(text: str) -> int | None:
         """Extract discount from '–10 %' or '-10%'."""
         cleaned = text.replace('%', '').replace(' ', '').strip().lstrip('–\-')
         return int(cleaned) if cleaned.isdigit() else None
@@ -253,6 +258,7 @@ class BoardGame:
                 break
 
     def from_html(self, html):
+        self.last_fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
         soup = BeautifulSoup(html, 'html.parser')
         self.name = soup.find('h1').text.strip() if soup.find('h1') else None
 
@@ -291,7 +297,8 @@ class BoardGame:
             self.image = highlighted_link['href']
 
         self.parameters = {}
-        details_table = soup.find('div', class_='extended-description').find('table', class_='detail-parameters')
+        description = soup.find('div', class_='extended-description')
+        details_table = description.find('table', class_='detail-parameters') if description else None
         
         if not details_table:
             raise ValueError("Details table not found")
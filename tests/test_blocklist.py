@@ -0,0 +1,67 @@
+"""Tests for the blocklist file helpers."""
+
+import threading
+
+from utils.blocklist import BLOCKLIST_HEADER, BlocklistExporter, load_excluded_urls, write_excluded_urls
+
+
+def test_write_excluded_urls_is_atomic_and_readable(tmp_path, monkeypatch) -> None:
+    """The written file has the header and sorted URLs, and no temp files are left behind."""
+    path = tmp_path / "excluded.txt"
+    monkeypatch.setenv("EXCLUDED_URLS_FILE", str(path))
+    path.write_text("old content\n", encoding="utf-8")
+
+    assert write_excluded_urls(["https://example.com/b", "https://example.com/a/"]) == path
+    assert path.read_text(encoding="utf-8").startswith(BLOCKLIST_HEADER + "https://example.com/a/\n")
+    assert load_excluded_urls() == {"https://example.com/a", "https://example.com/b"}
+    assert [p.name for p in tmp_path.iterdir()] == ["excluded.txt"]
+
+
+def test_exporter_coalesces_queued_requests(tmp_path) -> None:
+    """Requests made while a write is queued share it; close() waits for the last write."""
+    path = tmp_path / "excluded.txt"
+    started, release = threading.Event(), threading.Event()
+    urls = {"https://example.com/a"}
+    loads = []
+
+    def load_urls(only=None) -> set[str]:
+        loads.append(len(urls))
+        started.set()
+        release.wait(5)
+        return set(urls)
+
+    exporter = BlocklistExporter(load_urls, path)
+    exporter.request()  # starts running, blocked in load_urls
+    assert started.wait(5)
+    urls.add("https://example.com/b")
+    exporter.request()
+    exporter.request()
+    release.set()
+    assert exporter.close(timeout=5)
+    assert loads == [1, 2]
+    assert path.read_text(encoding="utf-8").endswith("https://example.com/a\nhttps://example.com/b\n")
+
+
+def test_exporter_patches_toggled_urls(tmp_path) -> None:
+    """After the first write only toggled URLs are looked up; requests after close() are ignored."""
+    path = tmp_path / "excluded.txt"
+    excluded = {"https://example.com/a", "https://example.com/b"}
+    lookups = []
+
+    def load_urls(only=None) -> list[str]:
+        lookups.append(only)
+        return sorted(excluded if only is None else excluded & set(only))
+
+    exporter = BlocklistExporter(load_urls, path)
+    exporter.request(["https://example.com/a"])  # nothing loaded yet: full load
+    exporter._last.result(timeout=5)
+    excluded.discard("https://example.com/a")
+    excluded.add("https://example.com/c")
+    exporter.request(["https://example.com/a"])
+    exporter.request(["https://example.com/c"])
+    assert exporter.close(timeout=5)
+    assert sorted(url for only in lookups[1:] for url in only) == ["https://example.com/a", "https://example.com/c"]
+    assert path.read_text(encoding="utf-8").endswith("\nhttps://example.com/b\nhttps://example.com/c\n")
+
+    exporter.request(["https://example.com/b"])  # closed: logged and ignored, no RuntimeError
+    assert lookups.count(None) == 1
@@ -0,0 +1,96 @@
+"""Tests for the in-memory columnar catalog (needs NumPy; compared against the SQL queries)."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from database import count_games, get_game_rows, save_game, update_game_boolean
+from model.board_game import BoardGame
+from ui.virtual_table import CatalogTableModel
+from utils.catalog import CatalogSnapshot
+
+
+def _game(i: int, categories: list[str], mechanics: list[str]) -> BoardGame:
+    game = BoardGame(html_page_data=None, url=f"https://example.com/g{i:02d}", skip_html_parsing=True)
+    game.parameters = {}
+    # Non-ASCII capitals: NOCASE does not fold them, so "Šílené" sorts before "šachy"
+    prefixes = ["Game Alpha", "Game Beta", "Šílené kostky", "šachy", "Čistá hra", "čaj", "Zebra"]
+    game.name = f"{prefixes[i % len(prefixes)]} {i}"
+    game.final_price = str(300 + 150 * (i % 7)) if i != 5 else None
+    game.discount_percent = 10 if i % 4 == 0 else None
+    game.min_players = 1 + i % 3
+    game.max_players = None if i % 5 == 0 else 4
+    game.play_time_minutes = 30 + 15 * (i % 4)
+    game.complexity = [1.5, 2.3, 3.0, None][i % 4]
+    game.bgg_rating = 6.0 + (i % 5) * 0.5
+    game.game_categories = categories
+    game.game_mechanics = mechanics
+    game.rate()
+    return game
+
+
+@pytest.fixture
+def catalog_games(use_in_memory_db) -> None:
+    tags = ["Karetní", "Kostkové", "Logické"]
+    for i in range(20):
+        save_game(_game(i, [tags[i % 3]], ["Dice Rolling"] if i % 2 else ["Dice Rolling", "Solo / Solitaire Game"]))
+
+
+def test_queries_match_sql(catalog_games) -> None:
+    """Filtering, sorting (ties by url) and counts agree with the SQL queries they replace."""
+    catalog = CatalogSnapshot.load()
+    assert len(catalog) == 20
+    filter_sets = [
+        {},
+        {"name": "alpha"},
+        {"name": "ŠÍLENÉ"},
+        {"max_price": 900, "players": 3},
+        {"discounted": True, "min_bgg_rating": 7.0},
+        {"min_complexity": 2.3, "max_complexity": 3.0, "max_play_time": 60},
+        {"categories": ["Karetní", "Logické"], "match_all": False},
+        {"mechanics": ["Dice Rolling", "Solo / Solitaire Game"]},
+        {"categories": ["Karetní", "Unknown"]},
+        {"urls": ["https://example.com/g03", "https://example.com/g04", "https://example.com/missing"]},
+    ]
+    orders = ["my_rating DESC", "name ASC", "final_price ASC", "final_price DESC", "bgg_rating DESC", "url ASC"]
+    for filters in filter_sets:
+        assert catalog.count(filters) == count_games(filters), filters
+        for order_by in orders:
+            expected = [row.url for row in get_game_rows(order_by, filters, limit=100)]
+            assert [catalog.urls[i] for i in catalog.query(filters, order_by)] == expected, (filters, order_by)
+
+    expected_rows = get_game_rows("url ASC", limit=100)
+    assert catalog.rows(catalog.query({}, "url ASC")) == [row._replace(sort_key=None) for row in expected_rows]
+    with pytest.raises(KeyError):
+        catalog.mask({"distributor": "Mindok"})
+
+
+def test_top_k_and_many_tags(use_in_memory_db) -> None:
+    """top_k returns the best k by a column; tag bitsets grow past 64 tags."""
+    for i in range(70):
+        save_game(_game(i, [f"Tag {i}", "Shared"], []))
+    catalog = CatalogSnapshot.load()
+    assert [row.final_price for row in catalog.rows(catalog.top_k(8, column="final_price"))] == [
+        row.final_price for row in get_game_rows("final_price DESC", limit=8)
+    ]
+    assert [catalog.urls[i] for i in catalog.query({"categories": ["Tag 69", "Shared"]})] == ["https://example.com/g69"]
+    assert catalog.count({"categories": ["Tag 1", "Tag 68"], "match_all": False}) == 2
+    assert len(catalog.top_k(5, {"categories": ["Tag 2"]})) == 1
+
+
+def test_follows_database_writes_while_attached(catalog_games) -> None:
+    """Saves and flag updates reach an attached snapshot; a detached one stays as it was."""
+    catalog = CatalogSnapshot.load().attach()
+    model = CatalogTableModel(catalog, catalog.query({}, "url ASC"), key=lambda row: row.url, format_row=tuple)
+    update_game_boolean("https://example.com/g07", "owned", True)
+    assert catalog.urls[catalog.query({}, "owned DESC")[0]] == "https://example.com/g07"
+    assert model.item("https://example.com/g07").owned is True
+    assert model.index_of("https://example.com/g07") == 7
+
+    save_game(_game(42, ["Karetní"], []))
+    assert len(catalog) == 21
+    assert catalog.count({"categories": ["Karetní"]}) == count_games({"categories": ["Karetní"]})
+
+    catalog.detach()
+    save_game(_game(43, [], []))
+    assert len(catalog) == 21
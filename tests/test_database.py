@@ -1,8 +1,32 @@
 """Tests for database module."""
 
+import json
+import sqlite3
+from contextlib import closing
+
 import pytest
 
-from database import game_exists, get_game_count, load_game, save_game
+import database
+from database import (
+    _MIGRATIONS,
+    GameWriter,
+    _init_db,
+    _migrate_create_games,
+    clear_checkpoint,
+    count_games,
+    find_games_by_tags,
+    game_exists,
+    get_game_count,
+    get_game_rows,
+    iter_games,
+    load_checkpoint,
+    load_game,
+    load_refresh_candidates,
+    save_checkpoint,
+    save_game,
+    set_db_path,
+    update_game_boolean,
+)
 from model.board_game import BoardGame
 
 
@@ -48,3 +72,203 @@ def test_get_game_count(use_in_memory_db) -> None:
     game.rate()
     save_game(game)
     assert get_game_count() == 1
+
+
+def _tagged_game(url: str, price: str, categories: list[str], mechanics: list[str]) -> BoardGame:
+    game = BoardGame(html_page_data=None, url=url, skip_html_parsing=True)
+    game.parameters = {}
+    game.name = url.rsplit("/", 1)[-1]
+    game.final_price = price
+    game.game_categories = categories
+    game.game_mechanics = mechanics
+    game.rate()
+    return game
+
+
+def test_find_games_by_tags(use_in_memory_db) -> None:
+    """find_games_by_tags combines category, mechanic and price filters in SQL."""
+    save_game(_tagged_game("https://example.com/a", "899", ["Kostkové"], ["Solo / Solitaire Game", "Dice Rolling"]))
+    save_game(_tagged_game("https://example.com/b", "1499", ["Kostkové"], ["Solo / Solitaire Game", "Dice Rolling"]))
+    save_game(_tagged_game("https://example.com/c", "499", ["Karetní"], ["Dice Rolling"]))
+
+    both = find_games_by_tags(mechanics=["Solo / Solitaire Game", "Dice Rolling"], max_price=1000)
+    assert [g.url for g in both] == ["https://example.com/a"]
+
+    any_mech = find_games_by_tags(mechanics=["Solo / Solitaire Game", "Dice Rolling"], match_all=False)
+    assert {g.url for g in any_mech} == {"https://example.com/a", "https://example.com/b", "https://example.com/c"}
+
+    assert [g.url for g in find_games_by_tags(categories=["Karetní"])] == ["https://example.com/c"]
+
+
+def test_save_game_replaces_tags(use_in_memory_db) -> None:
+    """Re-saving a game rewrites its junction rows."""
+    game = _tagged_game("https://example.com/a", "899", ["Kostkové"], ["Dice Rolling"])
+    save_game(game)
+    game.game_categories = ["Karetní"]
+    save_game(game)
+    assert find_games_by_tags(categories=["Kostkové"]) == []
+    assert len(find_games_by_tags(categories=["Karetní"])) == 1
+
+
+def test_tag_tables_backfilled_for_existing_db(tmp_path) -> None:
+    """Opening a DB created before the tag tables migrates its JSON tags."""
+    db_path = tmp_path / "old.db"
+    with closing(sqlite3.connect(db_path)) as conn:
+        _migrate_create_games(conn.cursor())  # the games table as created before versioning
+        conn.execute(
+            "INSERT INTO games (url, name, final_price, bgg_rating, game_categories, game_mechanics, my_rating) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ("https://example.com/old", "Old", "599", 7.0, json.dumps(["Kostkové"]), json.dumps(["Dice Rolling"]), 0),
+        )
+        conn.commit()
+    set_db_path(db_path)
+    try:
+        _init_db()
+        with closing(sqlite3.connect(db_path)) as conn:
+            rows = conn.execute("SELECT url, name FROM game_mechanic").fetchall()
+        assert rows == [("https://example.com/old", "Dice Rolling")]
+    finally:
+        set_db_path("games.db")
+
+
+def test_migrations_applied_once(tmp_path, monkeypatch) -> None:
+    """Migrations bump PRAGMA user_version and are not re-run on an up-to-date DB."""
+    db_path = tmp_path / "games.db"
+    set_db_path(db_path)
+    try:
+        _init_db()
+        with closing(sqlite3.connect(db_path)) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == len(_MIGRATIONS)
+
+        def fail(cursor):
+            raise AssertionError("migration re-applied")
+
+        monkeypatch.setattr(database, "_MIGRATIONS", [fail] * len(_MIGRATIONS))
+        set_db_path(db_path)
+        _init_db()
+    finally:
+        set_db_path("games.db")
+
+
+def test_iter_games_keyset_pagination(use_in_memory_db) -> None:
+    """iter_games walks every game exactly once in order across batch boundaries."""
+    for i in range(7):
+        save_game(_tagged_game(f"https://example.com/g{i}", str(100 * (i % 3) + 100), [], []))
+    prices = [int(g.final_price) for g in iter_games("final_price ASC", batch_size=2)]
+    assert prices == sorted(prices)
+    assert len(prices) == 7
+    urls = [g.url for g in iter_games("final_price DESC", batch_size=3)]
+    assert len(set(urls)) == 7
+    cheap = list(iter_games(batch_size=2, filters={"max_price": 100}))
+    assert sorted(g.url for g in cheap) == ["https://example.com/g0", "https://example.com/g3", "https://example.com/g6"]
+
+
+def test_game_writer_batches_and_flushes(use_in_memory_db) -> None:
+    """GameWriter saves queued games in batches and close() is a barrier."""
+    with GameWriter(queue_size=4, batch_size=2) as writer:
+        for i in range(5):
+            writer.put(_tagged_game(f"https://example.com/w{i}", "500", ["Kostkové"], []))
+    assert get_game_count() == 5
+    stats = writer.stats()
+    assert stats["games_written"] == 5
+    assert stats["queue_depth"] == 0
+    assert stats["batches"] >= 3
+
+
+def test_crawl_checkpoint_roundtrip(use_in_memory_db) -> None:
+    """Checkpoint progress accumulates across saves and is removed by clear_checkpoint."""
+    assert load_checkpoint("shop:") is None
+    save_checkpoint("shop:", pages_done=[1], discovered=["https://example.com/a", "https://example.com/b"])
+    save_checkpoint("shop:", pages_done=[3], completed=["https://example.com/a"])
+    checkpoint = load_checkpoint("shop:")
+    assert checkpoint.pages_done == {1, 3}
+    assert checkpoint.discovered == ["https://example.com/a", "https://example.com/b"]
+    assert checkpoint.completed == {"https://example.com/a"}
+    clear_checkpoint("shop:")
+    assert load_checkpoint("shop:") is None
+
+
+def test_last_changed_at_and_price_history(use_in_memory_db) -> None:
+    """last_changed_at only moves when content changes; price history records each new price."""
+    url = "https://example.com/tracked"
+    game = _tagged_game(url, "500", [], [])
+    game.last_fetched_at = "2024-01-01T00:00:00+00:00"
+    save_game(game)
+    game.last_fetched_at = "2024-01-05T00:00:00+00:00"
+    save_game(game)
+    game.final_price = "400"
+    game.last_fetched_at = "2024-01-09T00:00:00+00:00"
+    save_game(game)
+
+    with closing(database._get_connection()) as conn:
+        changed = conn.execute("SELECT last_changed_at FROM games WHERE url = ?", (url,)).fetchone()[0]
+        history = conn.execute(
+            "SELECT final_price FROM price_history WHERE url = ? ORDER BY observed_at", (url,)
+        ).fetchall()
+    assert changed == "2024-01-09T00:00:00+00:00"
+    assert [row[0] for row in history] == ["500", "400"]
+    (candidate,) = load_refresh_candidates()
+    assert candidate.price_changes == 1
+    assert candidate.last_fetched_at == "2024-01-09T00:00:00+00:00"
+
+
+def test_get_game_rows_pages_in_sql_order(use_in_memory_db) -> None:
+    """Keyset and offset pages agree and follow the SQL order over the whole table."""
+    for i in range(9):
+        save_game(_tagged_game(f"https://example.com/p{i}", str(1000 - 100 * i), [], []))
+    update_game_boolean("https://example.com/p4", "owned", True)
+    first = get_game_rows("final_price ASC", limit=4)
+    second = get_game_rows("final_price ASC", limit=4, after=first[-1].page_key)
+    assert [r.url for r in second] == [r.url for r in get_game_rows("final_price ASC", limit=4, offset=4)]
+    prices = [int(r.final_price) for r in first + second]
+    assert prices == sorted(prices) and prices[0] == 200
+    assert get_game_rows("owned DESC", limit=1)[0].url == "https://example.com/p4"
+    assert count_games({"max_price": 500}) == 4
+
+
+def test_order_expressions_match_their_indexes(use_in_memory_db) -> None:
+    """Every sort expression is served by the index its migration step built."""
+    save_game(_tagged_game("https://example.com/p0", "500", [], []))
+    with closing(database._get_connection()) as conn:
+        for column, expr in database._ORDER_EXPRESSIONS.items():
+            if column == "url":
+                continue
+            plan = conn.execute(f"EXPLAIN QUERY PLAN SELECT url FROM games ORDER BY {expr}, url").fetchall()
+            assert any(f"idx_games_order_{column}" in row[-1] for row in plan), (column, plan)
+
+
+def test_name_filter_matches_substrings_via_index(use_in_memory_db) -> None:
+    """Name filters match case-insensitive substrings and follow renames through the index."""
+    for name in ("Wingspan", "Spirit Island", "Wingspan Asia"):
+        game = _tagged_game(f"https://example.com/{name.replace(' ', '-')}", "500", [], [])
+        game.name = name
+        save_game(game)
+    assert database._name_fts_available
+    assert sorted(r.name for r in get_game_rows("name ASC", {"name": "ngsp"})) == ["Wingspan", "Wingspan Asia"]
+    assert count_games({"name": "island"}) == 1
+    assert count_games({"name": "sp"}) == 3  # too short for trigrams: LIKE fallback
+
+    game = _tagged_game("https://example.com/Spirit-Island", "500", [], [])
+    game.name = "Spirit Island: Jagged Earth"
+    save_game(game)
+    assert count_games({"name": "jagged"}) == 1
+    assert count_games({"name": "island"}) == 1
+
+
+def test_name_index_survives_vacuum(tmp_path) -> None:
+    """games has an explicit INTEGER PRIMARY KEY, so VACUUM keeps the name index linked to its rows."""
+    set_db_path(tmp_path / "games.db")
+    try:
+        for name in ("Azul", "Brass", "Cascadia"):
+            game = _tagged_game(f"https://example.com/{name}", "500", [], [])
+            game.name = name
+            save_game(game)
+        with closing(sqlite3.connect(tmp_path / "games.db")) as conn:
+            conn.execute("DELETE FROM games WHERE url = 'https://example.com/Azul'")
+            conn.commit()
+            conn.execute("VACUUM")
+            assert conn.execute("SELECT pk FROM pragma_table_info('games') WHERE name = 'id'").fetchone() == (1,)
+        assert [r.url for r in get_game_rows("name ASC", {"name": "cascad"})] == ["https://example.com/Cascadia"]
+        assert count_games({"name": "brass"}) == 1
+    finally:
+        set_db_path("games.db")
@@ -0,0 +1,98 @@
+"""Tests for the GUI image service (fake network, real Pillow, temp disk cache)."""
+
+import io
+import threading
+
+from PIL import Image
+
+from ui.image_cache import ImageService
+
+
+def _png(width: int, height: int, color: str = "red") -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(out, format="PNG")
+    return out.getvalue()
+
+
+class _Response:
+    def __init__(self, content: bytes, status: int = 200):
+        self.content = content
+        self.status = status
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+
+class FakeCaller:
+    """Serves fixed bodies by URL and records requests."""
+
+    def __init__(self, bodies: dict[str, _Response]):
+        self.bodies = bodies
+        self.requested: list[str] = []
+
+    def get(self, url: str, params=None, headers=None) -> _Response:
+        self.requested.append(url)
+        return self.bodies[url]
+
+    def close(self) -> None:
+        pass
+
+
+def test_load_resizes_and_reuses_disk_cache(tmp_path) -> None:
+    """Images are resized to fit; a new service reads the original from disk instead of fetching."""
+    caller = FakeCaller({"https://img/a.png": _Response(_png(400, 200))})
+    service = ImageService(caller, cache_dir=tmp_path)
+    assert service.load("https://img/a.png", (100, 100)).size == (100, 50)
+    assert service.get("https://img/a.png", (100, 100)) is not None
+
+    cache_dir = tmp_path / "not-yet"
+    ImageService(caller, cache_dir=cache_dir)
+    assert not cache_dir.exists()  # the disk cache is scanned on first load, off the UI thread
+
+    again = ImageService(caller, cache_dir=tmp_path)
+    assert again.load("https://img/a.png", (40, 40)).size == (40, 20)
+    assert caller.requested == ["https://img/a.png"]
+    assert again.stats()["disk_hits"] == 1
+
+
+def test_caches_are_size_bounded(tmp_path) -> None:
+    """Disk and memory caches evict least recently used entries past their byte budgets."""
+    bodies = {f"https://img/{i}.png": _Response(_png(64, 64, "blue")) for i in range(3)}
+    body_size = len(bodies["https://img/0.png"].content)
+    service = ImageService(
+        FakeCaller(bodies), cache_dir=tmp_path, disk_bytes=2 * body_size, memory_bytes=2 * 64 * 64 * 3,
+    )
+    for url in bodies:
+        service.load(url, (64, 64))
+    assert len(list(tmp_path.iterdir())) == 2
+    assert service.get("https://img/0.png", (64, 64)) is None
+    assert service.get("https://img/2.png", (64, 64)) is not None
+
+
+def test_request_loads_once_in_background_and_skips_failures(tmp_path) -> None:
+    """Concurrent requests share one load; failed URLs are neither cached on disk nor retried."""
+    caller = FakeCaller({
+        "https://img/a.png": _Response(_png(10, 10)),
+        "https://img/missing.png": _Response(b"<html>not found</html>", status=404),
+    })
+    service = ImageService(caller, cache_dir=tmp_path, workers=1)
+    done = threading.Event()
+    results = []
+
+    def callback(image) -> None:
+        results.append(image)
+        if len(results) == 3:
+            done.set()
+
+    assert service.request("https://img/a.png", (8, 8), callback) is None
+    service.request("https://img/a.png", (8, 8), callback)
+    service.request("https://img/missing.png", (8, 8), callback)
+    assert done.wait(5)
+    assert sorted(image is None for image in results) == [False, False, True]
+    assert service.request("https://img/a.png", (8, 8), callback).size == (8, 8)
+    assert service.request("https://img/missing.png", (8, 8), callback) is None
+    assert caller.requested.count("https://img/a.png") == 1
+    assert caller.requested.count("https://img/missing.png") == 1
+    assert len(list(tmp_path.iterdir())) == 1
+    service.shutdown()
@@ -0,0 +1,95 @@
+"""Tests for the threaded crawl pipeline."""
+
+import threading
+import time
+
+import pytest
+
+from utils.pipeline import Pipeline, Stage
+
+
+def test_pipeline_runs_items_through_stages() -> None:
+    """Every source item passes each stage; stages may drop or fan out items."""
+    def source(emit) -> None:
+        for n in range(50):
+            emit(n)
+
+    def double(item, emit) -> None:
+        emit(item * 2)
+
+    def drop_odd_tens(item, emit) -> None:
+        if item % 20:
+            emit(item)
+
+    pipeline = Pipeline(source, [Stage("double", double, workers=3), Stage("filter", drop_odd_tens, workers=2)])
+    results = sorted(pipeline.results())
+    assert results == [n * 2 for n in range(50) if (n * 2) % 20]
+    stats = pipeline.stats()
+    assert stats["source"]["emitted"] == 50
+    assert stats["double"]["processed"] == 50
+    assert stats["filter"]["emitted"] == len(results)
+
+
+def test_pipeline_backpressure_bounds_queues() -> None:
+    """A slow stage blocks upstream instead of letting its inbox grow past queue_size."""
+    release = threading.Event()
+    emitted = []
+
+    def source(emit) -> None:
+        for n in range(30):
+            emit(n)
+            emitted.append(n)
+
+    def slow(item, emit) -> None:
+        release.wait()
+        emit(item)
+
+    pipeline = Pipeline(source, [Stage("slow", slow, queue_size=4)], output_size=4)
+    results: list[int] = []
+    consumer = threading.Thread(target=lambda: results.extend(pipeline.results()), daemon=True)
+    consumer.start()
+
+    # Wait until the source has stalled on the full inbox before letting the stage run
+    count = -1
+    for _ in range(100):
+        if emitted and len(emitted) == count:
+            break
+        count = len(emitted)
+        time.sleep(0.05)
+    assert 0 < len(emitted) <= 4 + 1 + 1  # queue_size + one item per worker + one in flight
+    release.set()
+    consumer.join(timeout=10)
+    assert sorted(results) == list(range(30))
+    assert pipeline.stats()["slow"]["max_queue_depth"] <= 4
+
+
+def test_pipeline_reraises_stage_error_and_stops() -> None:
+    """The first stage failure cancels the pipeline and surfaces from results()."""
+    def source(emit) -> None:
+        n = 0
+        while True:
+            emit(n)
+            n += 1
+
+    def explode(item, emit) -> None:
+        if item == 5:
+            raise RuntimeError("boom")
+        emit(item)
+
+    pipeline = Pipeline(source, [Stage("explode", explode, workers=2)])
+    with pytest.raises(RuntimeError, match="boom"):
+        list(pipeline.results())
+    assert pipeline.cancelled
+
+
+def test_pipeline_early_exit_cancels() -> None:
+    """Leaving the results loop early stops the (otherwise endless) source."""
+    def source(emit) -> None:
+        while True:
+            emit(1)
+
+    pipeline = Pipeline(source, [Stage("pass", lambda item, emit: emit(item))])
+    for count, _ in enumerate(pipeline.results(), 1):
+        if count == 10:
+            break
+    assert pipeline.cancelled
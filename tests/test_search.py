@@ -25,3 +25,458 @@ def test_category_and_mech_filters_exist() -> None:
         assert f in FILTERS, f"Category filter {f} should be in FILTERS"
     for f in MECHANIC_FILTERS:
         assert f in FILTERS, f"Mechanic filter {f} should be in FILTERS"
+
+
+class FakeCaller:
+    """Stands in for WebsiteCaller: serves canned HTML per URL and counts requests."""
+
+    def __init__(self, pages: dict[str, str]):
+        self.pages = pages
+        self.requested: list[str] = []
+
+    def get_text(self, url: str, params=None, headers=None) -> str:
+        self.requested.append(url)
+        return self.pages[url]
+
+
+def test_games_standings_saves_through_writer(use_in_memory_db, sample_game_html: str) -> None:
+    """games_standings parses, rates and persists every game via the writer."""
+    from config import BASE_URL
+    from database import GameWriter, load_game
+    from utils.search import games_standings
+
+    caller = FakeCaller({f"{BASE_URL}/a/": sample_game_html, f"{BASE_URL}/b/": sample_game_html})
+    with GameWriter() as writer:
+        games = games_standings(["/a/", "/b/"], caller, writer=writer)
+    assert len(games) == 2
+    assert load_game(f"{BASE_URL}/a/").name == "Test Board Game"
+
+
+def test_games_standings_preserves_flags_from_known_map(use_in_memory_db, sample_game_html: str) -> None:
+    """User flags come from the prefetched map and DB lookups are counted as avoided."""
+    from config import BASE_URL
+    from database import load_known_games, save_game, update_game_boolean
+    from model.board_game import RATING_PENALTY_DEMONIC
+    from model.board_game import BoardGame
+    from utils.search import games_standings
+
+    url = f"{BASE_URL}/a/"
+    save_game(BoardGame(sample_game_html, url))
+    update_game_boolean(url, "has_demonic_vibe", True)
+    known = load_known_games()
+    assert known[url].has_demonic_vibe is True
+    assert known[url].last_fetched_at is not None
+
+    stats: dict = {}
+    caller = FakeCaller({url: sample_game_html, f"{BASE_URL}/b/": sample_game_html})
+    games = games_standings(["/a/", "/b/"], caller, known=known, stats=stats)
+    flagged = next(g for g in games if g.url == url)
+    assert flagged.has_demonic_vibe is True
+    assert flagged.my_rating <= -RATING_PENALTY_DEMONIC
+    assert stats["known_games"] == 1
+    assert stats["db_queries_avoided"] == 3
+    assert stats["pipeline"]["fetch"]["processed"] == 2
+
+
+def test_games_standings_keeps_flags_toggled_during_crawl(use_in_memory_db, sample_game_html: str) -> None:
+    """A flag set after the known map was loaded survives the crawl saving that game."""
+    from config import BASE_URL
+    from database import load_game, load_known_games, save_game, update_game_boolean
+    from model.board_game import BoardGame
+    from utils.search import games_standings
+
+    url = f"{BASE_URL}/a/"
+    save_game(BoardGame(sample_game_html, url))
+    known = load_known_games()
+    update_game_boolean(url, "owned", True)
+
+    games_standings(["/a/"], FakeCaller({url: sample_game_html}), known=known)
+    assert load_game(url).owned is True
+
+
+def _listing_html(cards: list[tuple[str, str]]) -> str:
+    """Listing page with product cards (href, price text)."""
+    products = "".join(
+        f'<div class="product"><a href="{href}">x</a>'
+        f'<div class="price price-final"><strong>{price}</strong></div></div>'
+        for href, price in cards
+    )
+    return f'<html><body><div id="products">{products}</div></body></html>'
+
+
+class ListingCaller(FakeCaller):
+    """FakeCaller that serves listing pages by page number and product pages by URL."""
+
+    def __init__(self, listing_pages: list[str], product_pages: dict[str, str]):
+        super().__init__(product_pages)
+        self.listing_pages = listing_pages
+
+    def get_text(self, url: str, params=None, headers=None) -> str:
+        if "/strana-" in url:
+            self.requested.append(url)
+            page = int(url.split("/strana-")[1].split("/")[0])
+            if page <= len(self.listing_pages):
+                return self.listing_pages[page - 1]
+            return "<html><body></body></html>"
+        return super().get_text(url)
+
+
+def test_delta_search_skips_unchanged_cards(use_in_memory_db, sample_game_html: str) -> None:
+    """Delta mode only fetches detail pages for new or changed listing cards."""
+    from config import BASE_URL
+    from utils.search import search_for_game
+
+    pages = {f"{BASE_URL}/a/": sample_game_html, f"{BASE_URL}/b/": sample_game_html}
+    caller = ListingCaller([_listing_html([("/a/", "899 Kč"), ("/b/", "899 Kč")])], pages)
+    assert len(search_for_game(caller, delta=True)) == 2
+
+    caller = ListingCaller([_listing_html([("/a/", "899 Kč"), ("/b/", "799 Kč")])], pages)
+    games = search_for_game(caller, delta=True)
+    assert len(games) == 2
+    fetched = [url for url in caller.requested if "/strana-" not in url]
+    assert fetched == [f"{BASE_URL}/b/"]
+
+
+def test_iter_search_yields_saved_games(use_in_memory_db, sample_game_html: str) -> None:
+    """iter_search streams rated games and every one is persisted once the generator ends."""
+    from config import BASE_URL
+    from database import get_game_count
+    from utils.search import iter_search
+
+    pages = {f"{BASE_URL}/a/": sample_game_html, f"{BASE_URL}/b/": sample_game_html}
+    caller = ListingCaller([_listing_html([("/a/", "899 Kč"), ("/b/", "899 Kč")])], pages)
+    urls = sorted(game.url for game in iter_search(caller))
+    assert urls == [f"{BASE_URL}/a/", f"{BASE_URL}/b/"]
+    assert get_game_count() == 2
+
+
+def test_offline_search_queries_db_and_refreshes_stale_matches(
+    use_in_memory_db, sample_game_html: str, sample_game_html_with_discount: str
+) -> None:
+    """Offline search answers from games.db; only stale matches are fetched, and dropped if they no longer match."""
+    from config import BASE_URL
+    from database import save_game
+    from model.board_game import BoardGame
+    from utils.refresh import freshness_label
+    from utils.search import search_for_game
+
+    game_type = "<tr><th>1. Základní hra / rozšíření</th><td>Základní hra</td></tr>"
+    cheap = sample_game_html.replace("<table class=\"detail-parameters\">", f"<table class=\"detail-parameters\">{game_type}")
+    pricey = sample_game_html_with_discount.replace(
+        "<table class=\"detail-parameters\">", f"<table class=\"detail-parameters\">{game_type}"
+    )
+    urls = {name: f"{BASE_URL}/{name}/" for name in ("fresh", "stale", "pricey")}
+    save_game(BoardGame(cheap, urls["fresh"]))
+    save_game(BoardGame(pricey, urls["pricey"]))
+    stale = BoardGame(cheap, urls["stale"])
+    stale.last_fetched_at = "2020-01-01T00:00:00+00:00"
+    save_game(stale)
+    filters = ["cheap", "for_one_player", "cat:dice_game", "mech:solo"]
+
+    games = search_for_game(None, filters=filters, endpoint="offline")
+    assert sorted(g.url for g in games) == [urls["fresh"], urls["stale"]]
+    labels = {g.url: freshness_label(g.last_fetched_at, 7) for g in games}
+    assert labels == {urls["fresh"]: "today", urls["stale"]: labels[urls["stale"]]}
+    assert labels[urls["stale"]].endswith("stale")
+
+    # The stale game's page now shows a higher price: it is re-fetched and no longer matches
+    caller = FakeCaller({urls["stale"]: pricey})
+    games = search_for_game(caller, filters=filters, endpoint="offline")
+    assert [g.url for g in games] == [urls["fresh"]]
+    assert caller.requested == [urls["stale"]]
+    discounted = search_for_game(None, filters=["discounted", "mech:solo"], endpoint="offline")
+    assert sorted(g.url for g in discounted) == [urls["pricey"], urls["stale"]]
+
+
+def test_budgeted_search_fetches_best_priors_first(use_in_memory_db, sample_game_html: str) -> None:
+    """With a request budget, known high-rated games are fetched before cheap unknowns."""
+    from config import BASE_URL
+    from database import save_game
+    from model.board_game import BoardGame
+    from utils.search import CrawlBudget, iter_budgeted_search
+
+    save_game(BoardGame(sample_game_html, f"{BASE_URL}/known/"))
+    pages = {f"{BASE_URL}/{name}/": sample_game_html for name in ("known", "x", "y")}
+    listing = _listing_html([("/x/", "2 999 Kč"), ("/known/", "899 Kč"), ("/y/", "2 999 Kč")])
+    caller = ListingCaller([listing], pages)
+    stats: dict = {}
+    budget = CrawlBudget(requests=1)
+    games = list(iter_budgeted_search(caller, budget, stats=stats))
+    fetched = [url for url in caller.requested if "/strana-" not in url]
+    assert fetched == [f"{BASE_URL}/known/"]
+    assert [g.url for g in games] == [f"{BASE_URL}/known/"]
+    assert stats["budget_covered"] == 1
+    assert stats["budget_coverage"] == round(1 / 3, 3)
+
+
+def test_crawl_budget_charges_only_completed_fetches(use_in_memory_db, sample_game_html: str) -> None:
+    """Refunded reservations free requests for waiting fetches; fetches never made are not charged."""
+    import threading
+
+    from config import BASE_URL
+    from utils.search import CrawlBudget, iter_budgeted_search
+
+    budget = CrawlBudget(requests=2).start()
+    assert budget.take_request() and budget.take_request()
+    taken: list[bool] = []
+    waiter = threading.Thread(target=lambda: taken.append(budget.take_request()))
+    waiter.start()
+    budget.refund_request()  # e.g. the fetch failed
+    waiter.join(5)
+    assert taken == [True]
+    budget.complete_request()
+    budget.complete_request()
+    assert budget.used_requests == 2 and budget.take_request() is False
+
+    names = [f"g{i}" for i in range(6)]
+    caller = ListingCaller(
+        [_listing_html([(f"/{name}/", "899 Kč") for name in names])],
+        {f"{BASE_URL}/{name}/": sample_game_html for name in names},
+    )
+    stats: dict = {}
+    for _ in iter_budgeted_search(caller, CrawlBudget(requests=6), stats=stats):
+        break  # the consumer stops early: queued reservations are dropped, not charged
+    fetched = [url for url in caller.requested if "/strana-" not in url]
+    assert stats["budget_requests"] == len(fetched)
+
+
+def test_resumed_search_skips_completed_games(use_in_memory_db, sample_game_html: str) -> None:
+    """An abandoned crawl leaves a checkpoint; --resume does not re-fetch completed games."""
+    from config import BASE_URL
+    from database import load_checkpoint
+    from utils.search import build_filter_query, crawl_key, iter_search
+
+    key = crawl_key("shop", build_filter_query(None))
+    pages = {f"{BASE_URL}/{name}/": sample_game_html for name in ("a", "b", "c")}
+    listing = _listing_html([("/a/", "899 Kč"), ("/b/", "899 Kč"), ("/c/", "899 Kč")])
+    games = iter_search(ListingCaller([listing], pages))
+    first = next(games)
+    games.close()
+    assert first.url in load_checkpoint(key).completed
+
+    caller = ListingCaller([listing], pages)
+    resumed = iter_search(caller, resume=True)
+    assert sorted(g.url for g in resumed) == sorted(pages)
+    assert first.url not in caller.requested
+    assert load_checkpoint(key) is None
+
+
+def test_refresh_prefers_stale_games_near_threshold() -> None:
+    """Stale games near the notification threshold beat fresh or hopeless ones."""
+    from datetime import datetime, timezone
+
+    from config import MIN_RATING_FOR_NOTIFICATION
+    from database import RefreshCandidate
+    from utils.refresh import select_for_refresh
+
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    old, fresh = "2024-04-01T00:00:00+00:00", "2024-06-01T00:00:00+00:00"
+    candidates = [
+        RefreshCandidate("/fresh/", MIN_RATING_FOR_NOTIFICATION, 10, fresh, fresh, 3),
+        RefreshCandidate("/near/", MIN_RATING_FOR_NOTIFICATION - 5, 10, old, old, 2),
+        RefreshCandidate("/bad/", -100, None, old, old, 0),
+    ]
+    assert select_for_refresh(candidates, 2, now) == ["/near/", "/bad/"]
+    assert select_for_refresh(candidates, 1, now) == ["/near/"]
+
+
+def test_new_arrivals_stop_at_known_run() -> None:
+    """The newest-first walk stops at a run of known products without reading further pages."""
+    from config import BASE_URL
+    from utils.search import discover_new_arrivals
+
+    first = _listing_html([("/n1/", "1 Kč"), ("/k1/", "1 Kč"), ("/n2/", "1 Kč"), ("/k2/", "1 Kč")])
+    second = _listing_html([("/k3/", "1 Kč"), ("/n3/", "1 Kč")])
+    caller = ListingCaller([first, second, _listing_html([("/n4/", "1 Kč")])], {})
+    known = {f"{BASE_URL}/k{n}/" for n in range(1, 4)}
+    stats: dict = {}
+    urls = discover_new_arrivals(caller, known, stop_run=2, stats=stats)
+    assert urls == [f"{BASE_URL}/n1/", f"{BASE_URL}/n2/"]
+    assert stats == {"new_arrival_pages": 2, "new_arrivals": 2}
+    assert len(caller.requested) == 2
+
+
+def test_search_cache_reuses_pages_across_searches(use_in_memory_db, sample_game_html: str) -> None:
+    """A shared SearchCache answers a repeated search without any requests."""
+    from config import BASE_URL
+    from utils.search import search_for_game
+    from utils.search_cache import SearchCache, normalize_query
+
+    assert normalize_query("pv258=2,1&stock=1") == normalize_query("stock=1&pv258=1,2")
+    pages = {f"{BASE_URL}/a/": sample_game_html, f"{BASE_URL}/b/": sample_game_html}
+    caller = ListingCaller([_listing_html([("/a/", "899 Kč"), ("/b/", "899 Kč")])], pages)
+    cache = SearchCache()
+    first = search_for_game(caller, cache=cache)
+    requests = len(caller.requested)
+    second = search_for_game(caller, cache=cache)
+    assert len(caller.requested) == requests
+    assert [g.url for g in second] == [g.url for g in first]
+
+    expired = SearchCache(ttl_seconds=0, clock=iter(range(100)).__next__)
+    expired.put_game(first[0])
+    assert expired.get_game(first[0].url) is None
+
+
+def test_search_cache_hits_do_not_extend_product_ttl(use_in_memory_db, sample_game_html: str) -> None:
+    """A product page served from the cache still expires ttl_seconds after it was fetched."""
+    from config import BASE_URL
+    from utils.search import search_for_game
+    from utils.search_cache import SearchCache
+
+    now = [0.0]
+    caller = ListingCaller([_listing_html([("/a/", "899 Kč")])], {f"{BASE_URL}/a/": sample_game_html})
+    cache = SearchCache(ttl_seconds=10, clock=lambda: now[0])
+    search_for_game(caller, cache=cache)
+    now[0] = 5
+    requests = len(caller.requested)
+    search_for_game(caller, cache=cache)
+    assert len(caller.requested) == requests
+
+    now[0] = 12
+    search_for_game(caller, cache=cache)
+    assert caller.requested[requests:].count(f"{BASE_URL}/a/") == 1
+
+
+def test_top_k_keeps_best_games() -> None:
+    """TopK keeps only the k best accepted games, best first."""
+    from types import SimpleNamespace
+
+    from utils.search import TopK
+
+    games = [SimpleNamespace(url=f"/{n}/", my_rating=rating) for n, rating in enumerate([3, 9, 1, 7, 9, 5])]
+    top = TopK(3, predicate=lambda g: g.url != "/1/").extend(games)
+    assert [g.url for g in top.best()] == ["/4/", "/3/", "/5/"]
+    assert (top.seen, top.accepted, len(top)) == (6, 5, 3)
+    assert not TopK(1, predicate=lambda g: False).extend(games)
+
+
+def test_discover_listing_uses_pagination_widget() -> None:
+    """With a pagination widget all pages are fetched (concurrently) and kept in page order."""
+    from utils.search import discover_listing
+
+    pagination = '<div class="pagination"><a href="/deskove-hry/strana-2/">2</a><a href="/deskove-hry/strana-3/">3</a></div>'
+    pages = [
+        _listing_html([("/a/", "100 Kč")]).replace("</body>", pagination + "</body>"),
+        _listing_html([("/b/", "200 Kč")]),
+        _listing_html([("/c/", "300 Kč")]),
+    ]
+    progress = []
+    caller = ListingCaller(pages, {})
+    cards = discover_listing(caller, "", progress_callback=lambda **kw: progress.append(kw))
+    assert [c.url for c in cards] == ["/a/", "/b/", "/c/"]
+    assert [c.price for c in cards] == ["100", "200", "300"]
+    assert len(caller.requested) == 3  # no probing past the advertised last page
+    assert progress[-1]["stage"] == "pages_complete"
+    assert all(p["total"] == 3 for p in progress)
+
+
+def test_discover_listing_follows_truncated_pagination() -> None:
+    """A widget that only links a few pages ahead (1 2 3 … next) does not cut the listing short."""
+    from utils.search import discover_listing
+
+    def widget(*pages: int) -> str:
+        links = "".join(f'<a href="/deskove-hry/strana-{p}/">{p}</a>' for p in pages)
+        return f'<div class="pagination">{links}<span>…</span></div>'
+
+    widgets = {1: widget(2, 3), 2: widget(1, 3, 4), 3: widget(2, 4, 5), 4: widget(3, 5), 5: widget(4)}
+    pages = [
+        _listing_html([(f"/{n}/", "100 Kč")]).replace("</body>", widgets[n] + "</body>")
+        for n in range(1, 6)
+    ]
+    caller = ListingCaller(pages, {})
+    cards = discover_listing(caller, "")
+    assert [c.url for c in cards] == ["/1/", "/2/", "/3/", "/4/", "/5/"]
+    assert len(caller.requested) == 5
+
+
+def test_discover_listing_falls_back_to_sequential_probing() -> None:
+    """Without a pagination widget pages are probed until one has no products."""
+    from utils.search import discover_listing
+
+    caller = ListingCaller([_listing_html([("/a/", "100 Kč")]), _listing_html([("/b/", "200 Kč")])], {})
+    cards = discover_listing(caller, "")
+    assert [c.url for c in cards] == ["/a/", "/b/"]
+    assert len(caller.requested) == 3
+
+
+class _StreamResponse:
+    def __init__(self, body: bytes):
+        import io
+
+        self.raw = io.BytesIO(body)
+
+    def close(self) -> None:
+        pass
+
+
+class SitemapCaller:
+    """Serves sitemap XML documents for get_stream()."""
+
+    def __init__(self, documents: dict[str, str]):
+        self.documents = documents
+
+    def get_stream(self, url: str, params=None, headers=None) -> _StreamResponse:
+        return _StreamResponse(self.documents[url].encode())
+
+
+def test_discover_from_sitemap_queues_new_and_changed() -> None:
+    """Sitemap discovery follows product child sitemaps and compares lastmod to our fetch time."""
+    from config import BASE_URL
+    from database import KnownGame
+    from utils.sitemap import discover_from_sitemap
+
+    ns = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    index = (
+        f'<sitemapindex {ns}>'
+        f'<sitemap><loc>{BASE_URL}/sitemap-products.xml</loc></sitemap>'
+        f'<sitemap><loc>{BASE_URL}/sitemap-articles.xml</loc></sitemap>'
+        '</sitemapindex>'
+    )
+    products = (
+        f'<urlset {ns}>'
+        f'<url><loc>{BASE_URL}/new-game/</loc><lastmod>2026-01-02</lastmod></url>'
+        f'<url><loc>{BASE_URL}/changed/</loc><lastmod>2026-01-05T10:00:00+01:00</lastmod></url>'
+        f'<url><loc>{BASE_URL}/unchanged/</loc><lastmod>2026-01-01</lastmod></url>'
+        '<url><loc>https://elsewhere.example/x/</loc></url>'
+        '</urlset>'
+    )
+    caller = SitemapCaller({f"{BASE_URL}/sitemap.xml": index, f"{BASE_URL}/sitemap-products.xml": products})
+    fetched = "2026-01-03T00:00:00+00:00"
+    known = {
+        f"{BASE_URL}/changed/": KnownGame(False, False, "100", None, None, fetched),
+        f"{BASE_URL}/unchanged/": KnownGame(False, False, "100", None, None, fetched),
+    }
+    stats: dict = {}
+    urls = discover_from_sitemap(caller, known, sitemap_url=f"{BASE_URL}/sitemap.xml", stats=stats)
+    assert urls == [f"{BASE_URL}/new-game/", f"{BASE_URL}/changed/"]
+    assert stats == {"sitemap_entries": 3, "sitemap_queued": 2, "sitemap_rejected_skipped": 0}
+
+
+def test_sitemap_skips_pages_rejected_by_earlier_crawls(use_in_memory_db, sample_game_html: str) -> None:
+    """Fetched pages that are not games are remembered and only re-fetched once their lastmod moves."""
+    from config import BASE_URL
+    from database import load_known_games, load_rejected_pages
+    from utils.search import games_standings
+    from utils.sitemap import discover_from_sitemap
+
+    category, game = f"{BASE_URL}/karetni-hry/", f"{BASE_URL}/a/"
+    stats: dict = {}
+    caller = FakeCaller({category: "<html><body><h1>Karetní hry</h1></body></html>", game: sample_game_html})
+    games_standings([category, game], caller, stats=stats)
+    assert stats["pages_rejected"] == 1
+    rejected = load_rejected_pages()
+    assert list(rejected) == [category]
+
+    def sitemap(lastmod: str) -> SitemapCaller:
+        entries = "".join(
+            f"<url><loc>{url}</loc><lastmod>{lastmod}</lastmod></url>" for url in (category, game)
+        )
+        return SitemapCaller({f"{BASE_URL}/sitemap.xml": f"<urlset>{entries}</urlset>"})
+
+    stats = {}
+    urls = discover_from_sitemap(sitemap("2020-01-01"), load_known_games(), f"{BASE_URL}/sitemap.xml", stats, rejected)
+    assert urls == []
+    assert stats["sitemap_rejected_skipped"] == 1
+    assert discover_from_sitemap(sitemap("2999-01-01"), load_known_games(), f"{BASE_URL}/sitemap.xml", {}, rejected) == [
+        category, game,
+    ]
@@ -0,0 +1,24 @@
+"""Tests that headless commands start without the GUI and notification SDKs."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _loaded_after(code: str, modules: list[str]) -> list[str]:
+    """Which of modules are in sys.modules after running code in a fresh interpreter."""
+    check = f"{code}; import sys; print(','.join(m for m in {modules!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def test_importing_main_skips_gui_and_onesignal() -> None:
+    """`import main` (every CLI command) loads neither customtkinter, OneSignal nor Playwright."""
+    assert _loaded_after("import main", ["customtkinter", "onesignal", "playwright"]) == []
+
+
+def test_gui_defers_onesignal() -> None:
+    """The GUI modules load OneSignal only when a notification is sent."""
+    assert _loaded_after("import ui.interface", ["onesignal", "playwright"]) == []
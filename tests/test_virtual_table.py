@@ -0,0 +1,64 @@
+"""Tests for the virtualized table helpers (no display needed)."""
+
+from ui.virtual_table import ListTableModel, PagedTableModel, window_bounds
+
+
+def test_window_bounds_clamps_to_table() -> None:
+    """The materialized window covers viewport + overscan and never leaves the table."""
+    assert window_bounds(0, 10, 5, 1000) == (0, 20)
+    assert window_bounds(500, 10, 5, 1000) == (495, 515)
+    assert window_bounds(995, 10, 5, 1000) == (980, 1000)
+    assert window_bounds(0, 10, 5, 7) == (0, 7)
+
+
+def test_list_table_model_formats_only_requested_rows() -> None:
+    """rows() formats just the requested slice."""
+    formatted = []
+
+    def fmt(n: int) -> tuple:
+        formatted.append(n)
+        return (n, n * n)
+
+    model = ListTableModel(list(range(100)), key=str, format_row=fmt)
+    assert len(model) == 100
+    assert model.rows(10, 12) == [("10", (10, 100)), ("11", (11, 121))]
+    assert formatted == [10, 11]
+
+
+def test_paged_table_model_uses_keyset_after_first_page() -> None:
+    """Sequential pages continue from the previous page's key; jumps use an offset."""
+    data = list(range(50))
+    calls = []
+
+    def fetch(after, offset, limit):
+        calls.append((after, offset))
+        begin = after + 1 if after is not None else offset
+        return data[begin:begin + limit]
+
+    model = PagedTableModel(len(data), fetch, page_key=lambda n: n, key=str, format_row=lambda n: (n,), page_size=10)
+    assert [values[0] for _, values in model.rows(5, 15)] == list(range(5, 15))
+    assert calls == [(None, 0), (9, 0)]
+    assert [values[0] for _, values in model.rows(40, 60)] == list(range(40, 50))
+    assert calls[-1] == (None, 40)
+
+
+def test_paged_table_model_loads_in_background_and_updates_items() -> None:
+    """With a loader, missing pages show placeholders until loaded; cached items update in place."""
+    data = list(range(30))
+    jobs = []
+    loaded = []
+    model = PagedTableModel(
+        len(data), lambda after, offset, limit: data[offset:offset + limit], page_key=lambda n: n,
+        key=str, format_row=lambda n: (n,), page_size=10,
+        loader=lambda job, done: jobs.append((job, done)), on_loaded=lambda: loaded.append(True),
+    )
+    assert model.rows(0, 2) == [("", ("…",)), ("", ("…",))]
+    model.rows(0, 2)
+    assert len(jobs) == 1
+    job, done = jobs.pop()
+    done(job())
+    assert loaded and model.rows(0, 2) == [("0", (0,)), ("1", (1,))]
+    assert model.update_item("1", lambda n: -n) == 1
+    assert model.rows(1, 2) == [("-1", (-1,))]
+    assert model.update_item("25", lambda n: n) is None
+    assert model.item("1") == -1 and model.item("25") is None
@@ -1,23 +1,27 @@
 """Game details window for displaying board game information."""
 
 import webbrowser
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 import customtkinter as ctk
 
-from config import MIN_RATING_FOR_NOTIFICATION
-from integrations.onesignal_caller import send_custom_event
+from config import IMAGE_COVER_SIZE, MIN_RATING_FOR_NOTIFICATION
 
 if TYPE_CHECKING:
+    from PIL import Image
+
     from model.board_game import BoardGame
+    from ui.image_cache import ImageService
 
 
 class GameDetailsWindow(ctk.CTkToplevel):
     """Window to display detailed game information."""
 
-    def __init__(self, parent, game: "BoardGame") -> None:
+    def __init__(self, parent, game: "BoardGame", image_service: Optional["ImageService"] = None) -> None:
         super().__init__(parent)
         self.game = game
+        self.image_service = image_service
+        self.cover_label: Optional[ctk.CTkLabel] = None
         self.title(f"Game Details: {game.name}")
         self.geometry("800x700")
 
@@ -34,6 +38,15 @@ class GameDetailsWindow(ctk.CTkToplevel):
         )
         title_label.pack(pady=(0, 10))
 
+        if self.game.image and self.image_service is not None:
+            self.cover_label = ctk.CTkLabel(scroll_frame, text="🖼️ Loading cover...", height=IMAGE_COVER_SIZE[1])
+            self.cover_label.pack(pady=(0, 10))
+            cover = self.image_service.request(
+                self.game.image, IMAGE_COVER_SIZE, lambda image: self.after(0, lambda: self._show_cover(image))
+            )
+            if cover is not None:
+                self._show_cover(cover)
+
         url_button = ctk.CTkButton(
             scroll_frame,
             text=f"🔗 {self.game.url}",
@@ -104,6 +117,19 @@ class GameDetailsWindow(ctk.CTkToplevel):
             )
             notify_button.pack(pady=20)
 
+    def _show_cover(self, image: Optional["Image.Image"]) -> None:
+        """Put the loaded cover in place of the placeholder (the window may be closed by now)."""
+        if self.cover_label is None or not self.winfo_exists():
+            return
+        if image is None:
+            self.cover_label.configure(text="🖼️ No cover available")
+            return
+        cover = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+        self.cover_label.configure(image=cover, text="", height=image.height)
+
     def _send_notification(self) -> None:
         """Send OneSignal notification for the current game."""
+        # Imported on use: the OneSignal SDK is slow to load and most sessions never notify
+        from integrations.onesignal_caller import send_custom_event
+
         send_custom_event(self.game.to_json())
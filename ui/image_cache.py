@@ -0,0 +1,233 @@
+"""Cover art for the GUI: fetched, decoded and resized off the Tk thread, cached in memory and on disk."""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from PIL import Image
+
+from config import (
+    IMAGE_CACHE_DIR,
+    IMAGE_DISK_CACHE_BYTES,
+    IMAGE_FETCH_TIMEOUT,
+    IMAGE_MEMORY_CACHE_BYTES,
+    IMAGE_WORKERS,
+)
+from website_caller import WebsiteCaller
+
+logger = logging.getLogger(__name__)
+
+Size = tuple[int, int]
+
+
+def _image_bytes(image: Image.Image) -> int:
+    """Approximate decoded size of an image in memory."""
+    return image.width * image.height * len(image.getbands())
+
+
+class _DiskCache:
+    """
+    Original image files under a directory, keyed by URL hash, trimmed to max_bytes by mtime.
+
+    The directory is scanned on first use (from a loading worker), not when the
+    cache is created, so constructing it never touches the disk.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._files: Optional[OrderedDict[str, int]] = None
+        self._total = 0
+
+    def _index(self) -> OrderedDict[str, int]:
+        """File name -> size in LRU order, scanning the directory the first time (lock held)."""
+        if self._files is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entries = sorted(
+                (entry for entry in os.scandir(self.directory) if entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime,
+            )
+            self._files = OrderedDict((entry.name, entry.stat().st_size) for entry in entries)
+            self._total = sum(self._files.values())
+        return self._files
+
+    @staticmethod
+    def _name(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[bytes]:
+        name = self._name(url)
+        with self._lock:
+            files = self._index()
+            if name not in files:
+                return None
+            files.move_to_end(name)
+        path = self.directory / name
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mtime orders eviction across sessions
+        except OSError:
+            with self._lock:
+                self._total -= files.pop(name, 0)
+            return None
+        return data
+
+    def put(self, url: str, data: bytes) -> None:
+        name = self._name(url)
+        path = self.directory / name
+        with self._lock:
+            files = self._index()
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug("Could not cache image %s: %s", url, e)
+            return
+        with self._lock:
+            self._total += len(data) - files.pop(name, 0)
+            files[name] = len(data)
+            while self._total > self.max_bytes and len(files) > 1:
+                evicted, size = files.popitem(last=False)
+                self._total -= size
+                try:
+                    (self.directory / evicted).unlink()
+                except OSError:
+                    pass
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes on disk (0 until the directory has been scanned)."""
+        return self._total
+
+
+class ImageService:
+    """
+    Load images by URL at a given size without blocking the caller.
+
+    request() answers from the in-memory LRU of resized images, or schedules a
+    load on the worker pool and calls back (on a worker thread) when it is
+    done; concurrent requests for the same image share one load. A load reads
+    the original from the disk cache, downloading it on a miss, then decodes
+    and resizes it with Pillow. URLs that failed are not retried this session.
+    """
+
+    def __init__(
+        self,
+        caller: Optional[WebsiteCaller] = None,
+        cache_dir: Optional[Path] = IMAGE_CACHE_DIR,
+        memory_bytes: int = IMAGE_MEMORY_CACHE_BYTES,
+        disk_bytes: int = IMAGE_DISK_CACHE_BYTES,
+        workers: int = IMAGE_WORKERS,
+    ):
+        self.caller = caller if caller is not None else WebsiteCaller(timeout=IMAGE_FETCH_TIMEOUT)
+        self.memory_bytes = memory_bytes
+        self.disk = _DiskCache(cache_dir, disk_bytes) if cache_dir is not None else None
+        self._memory: OrderedDict[tuple[str, Size], Image.Image] = OrderedDict()
+        self._memory_total = 0
+        self._pending: dict[tuple[str, Size], list[Callable[[Optional[Image.Image]], None]]] = {}
+        self._failed: set[str] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="images")
+        self.fetched = 0
+        self.disk_hits = 0
+
+    def get(self, url: str, size: Size) -> Optional[Image.Image]:
+        """Resized image if it is in memory (never loads)."""
+        key = (url, size)
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+            return image
+
+    def request(self, url: str, size: Size,
+                callback: Callable[[Optional[Image.Image]], None]) -> Optional[Image.Image]:
+        """
+        Cached image now, or None and callback(image or None) from a worker once loaded.
+
+        The callback is not called when the image is returned directly or the
+        URL already failed.
+        """
+        image = self.get(url, size)
+        if image is not None:
+            return image
+        key = (url, size)
+        with self._lock:
+            if url in self._failed:
+                return None
+            if key in self._pending:
+                self._pending[key].append(callback)
+                return None
+            self._pending[key] = [callback]
+        self._executor.submit(self._load_and_notify, url, size)
+        return None
+
+    def load(self, url: str, size: Size) -> Image.Image:
+        """Read (disk cache or network), decode and resize one image; blocking."""
+        data = self.disk.get(url) if self.disk is not None else None
+        from_disk = data is not None
+        if from_disk:
+            self.disk_hits += 1
+        else:
+            response = self.caller.get(url)
+            response.raise_for_status()
+            data = response.content
+            self.fetched += 1
+        with Image.open(io.BytesIO(data)) as source:
+            source.draft("RGB", size)  # JPEG: decode at a reduced scale when possible
+            image = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+        image.thumbnail(size)
+        if not from_disk and self.disk is not None:
+            self.disk.put(url, data)  # only originals that decoded
+        self._remember((url, size), image)
+        return image
+
+    def _remember(self, key: tuple[str, Size], image: Image.Image) -> None:
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_total -= _image_bytes(old)
+            self._memory[key] = image
+            self._memory_total += _image_bytes(image)
+            while self._memory_total > self.memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_total -= _image_bytes(evicted)
+
+    def _load_and_notify(self, url: str, size: Size) -> None:
+        try:
+            image: Optional[Image.Image] = self.load(url, size)
+        except Exception as e:
+            logger.debug("Could not load image %s: %s", url, e)
+            image = None
+            with self._lock:
+                self._failed.add(url)
+        with self._lock:
+            callbacks = self._pending.pop((url, size), [])
+        for callback in callbacks:
+            try:
+                callback(image)
+            except Exception as e:
+                logger.debug("Image callback failed for %s: %s", url, e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memory_images": len(self._memory),
+                "memory_bytes": self._memory_total,
+                "disk_bytes": self.disk.total_bytes if self.disk is not None else 0,
+                "fetched": self.fetched,
+                "disk_hits": self.disk_hits,
+            }
+
+    def shutdown(self) -> None:
+        """Drop queued loads and close the connection; running loads are abandoned."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.caller.close()
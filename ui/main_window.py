@@ -1,29 +1,111 @@
 """Main application window for Tlama Caller GUI."""
 
+import logging
 import platform
 import threading
 import webbrowser
-from typing import List, Optional
+from bisect import insort
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
 
 import customtkinter as ctk
+from PIL import ImageTk
 from tkinter import ttk
 
-from config import CATEGORY_FILTERS, ENDPOINTS, FILTER_GROUPS, FILTERS, MECHANIC_FILTERS
+from config import (
+    CATEGORY_FILTERS,
+    DB_TAB_CATALOG,
+    DB_TAB_THUMBNAILS,
+    DELTA_MAX_AGE_DAYS,
+    ENDPOINTS,
+    FILTER_GROUPS,
+    FILTERS,
+    IMAGE_THUMBNAIL_SIZE,
+    MECHANIC_FILTERS,
+    OFFLINE_ENDPOINT,
+)
 from database import (
-    get_all_games,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_ORDER,
+    count_games,
     get_excluded_game_urls,
     get_game_count,
+    get_game_rows,
+    iter_games,
     load_game,
     save_game,
-    search_games_in_db,
     update_game_boolean,
 )
-from utils.blocklist import get_blocklist_path, is_url_excluded
+from utils.blocklist import BlocklistExporter, is_url_excluded, load_excluded_urls
 from model.board_game import BoardGame
 from ui.game_details import GameDetailsWindow
-from utils.search import search_for_game
+from ui.image_cache import ImageService
+from ui.virtual_table import CatalogTableModel, ListTableModel, PagedTableModel, VirtualTreeview
+from utils.refresh import freshness_label
+from utils.search import iter_search
+from utils.search_cache import SearchCache
 from website_caller import WebsiteCaller
 
+logger = logging.getLogger(__name__)
+
+# Search results shown, and how often streamed results/progress are pulled into the UI (10 Hz)
+SEARCH_RESULTS_LIMIT = 100
+_UI_REFRESH_MS = 100
+# Quiet period after the last keystroke before the DB tab filters by name
+_DB_SEARCH_DEBOUNCE_MS = 250
+# How long exiting waits for the last blocklist write and the browser to close
+_SHUTDOWN_TIMEOUT_SECONDS = 5
+_DB_TAB = "📚 Database"
+_SEARCH_TAB = "🔍 Search"
+# Tk photo images kept for DB-tab thumbnails (a few windows' worth of rows)
+_DB_THUMBNAIL_PHOTOS = 256
+
+
+class _SearchFeed:
+    """Hands rated games and the latest progress from the crawl thread to the Tk thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._games: List[BoardGame] = []
+        self._progress: Optional[tuple] = None
+        self._found = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+
+    def add(self, game: BoardGame) -> None:
+        with self._lock:
+            self._games.append(game)
+            self._found += 1
+
+    def set_progress(self, stage: str, current: int, total: Optional[int], message: str) -> None:
+        # Only the newest progress matters; the UI samples it once per refresh
+        with self._lock:
+            self._progress = (stage, current, total, message)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._done = True
+            self._error = error
+
+    def drain(self) -> tuple[List[BoardGame], Optional[tuple], int, bool, Optional[BaseException]]:
+        """(new games, latest progress, games found so far, finished?, error) since the last drain."""
+        with self._lock:
+            games, self._games = self._games, []
+            progress, self._progress = self._progress, None
+            return games, progress, self._found, self._done, self._error
+
+
+# DB tab column -> database sort column (sorting happens in SQL over the whole table)
+_DB_SORT_COLUMNS = {
+    "Name": "name",
+    "Price": "final_price",
+    "Rating": "my_rating",
+    "BGG": "bgg_rating",
+    "Evil": "has_demonic_vibe",
+    "Owned": "owned",
+}
+
 
 class TlamaCallerGUI(ctk.CTk):
     """Main application window."""
@@ -36,7 +118,11 @@ class TlamaCallerGUI(ctk.CTk):
         self._center_on_screen()
 
         self.caller: Optional[WebsiteCaller] = None
-        self.current_games: List[BoardGame] = []
+        # Shared by all searches in this window so overlapping searches reuse fetched pages
+        self.search_cache = SearchCache()
+        # Cover art for details windows and DB-tab thumbnails, loaded off the Tk thread
+        self.image_service = ImageService()
+        self.db_thumbnails: OrderedDict[str, ImageTk.PhotoImage] = OrderedDict()
 
         self._create_widgets()
         self._init_caller()
@@ -64,7 +150,9 @@ class TlamaCallerGUI(ctk.CTk):
     def _init_caller(self) -> None:
         """Initialize website caller in background."""
         def init() -> None:
-            self.caller = WebsiteCaller(timeout=30, use_browser=True)
+            # GUI searches, the search cache and cover art only use plain HTTP (get_text/get),
+            # so no browser: Playwright is neither imported nor launched by the GUI
+            self.caller = WebsiteCaller(timeout=30)
             self.after(0, lambda: self.status_label.configure(text="✅ Ready"))
 
         thread = threading.Thread(target=init, daemon=True)
@@ -100,22 +188,40 @@ class TlamaCallerGUI(ctk.CTk):
         self.status_label = ctk.CTkLabel(status_frame, text="⏳ Initializing...")
         self.status_label.pack(side="left", padx=20, pady=10)
 
-        self.tabview = ctk.CTkTabview(self)
+        self.tabview = ctk.CTkTabview(self, command=self._on_tab_changed)
         self.tabview.pack(fill="both", expand=True, padx=20, pady=20)
 
-        self.db_tab = self.tabview.add("📚 Database")
-        self.search_tab = self.tabview.add("🔍 Search")
+        self.db_tab = self.tabview.add(_DB_TAB)
+        self.search_tab = self.tabview.add(_SEARCH_TAB)
 
         self.db_sort_column: Optional[str] = None
         self.db_sort_direction: Optional[str] = None
-        self.db_games: List[BoardGame] = []
+        self.db_filters: dict = {}
+        self.db_model: Optional[PagedTableModel | CatalogTableModel] = None
+        self.catalog: Any = None  # utils.catalog.CatalogSnapshot once loaded
+        self.db_generation = 0
+        self.db_search_pending: Optional[str] = None
+        # All DB-tab queries and writes run here, off the Tk main loop
+        self.db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        # The blocklist file follows owned/evil toggles (written in the background)
+        self.blocklist = BlocklistExporter(get_excluded_game_urls)
+        self.cleanup_thread: Optional[threading.Thread] = None
 
         self.search_sort_column: Optional[str] = None
         self.search_sort_direction: Optional[str] = None
         self.search_games: List[BoardGame] = []
+        self.search_generation = 0
 
         self._create_database_tab()
-        self._create_search_tab()
+        if DB_TAB_CATALOG:
+            self._in_background(self._load_catalog, self._on_catalog_loaded)
+        # The Search tab's widgets are built on its first visit (see _on_tab_changed)
+        self.search_tab_built = False
+
+    def _on_tab_changed(self) -> None:
+        if self.tabview.get() == _SEARCH_TAB and not self.search_tab_built:
+            self.search_tab_built = True
+            self._create_search_tab()
 
     def _create_database_tab(self) -> None:
         top_frame = ctk.CTkFrame(self.db_tab)
@@ -138,17 +244,24 @@ class TlamaCallerGUI(ctk.CTk):
         self.db_search_entry = ctk.CTkEntry(search_frame, placeholder_text="Game name...")
         self.db_search_entry.pack(side="left", padx=10, fill="x", expand=True)
         self.db_search_entry.bind("<Return>", lambda e: self._search_database())
+        self.db_search_entry.bind("<KeyRelease>", self._schedule_db_search)
         ctk.CTkButton(search_frame, text="Search", command=self._search_database).pack(side="left", padx=10)
 
         list_frame = ctk.CTkFrame(self.db_tab)
         list_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
         columns = ("Name", "Price", "Rating", "BGG", "Evil", "Owned", "Link")
-        self.db_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=20)
+        self.db_tree = ttk.Treeview(
+            list_frame, columns=columns, show="tree headings" if DB_TAB_THUMBNAILS else "headings", height=20
+        )
 
         style = ttk.Style()
         style.configure("Treeview", font=("TkDefaultFont", 16))
         style.configure("Treeview.Heading", font=("TkDefaultFont", 10, "bold"))
+        if DB_TAB_THUMBNAILS:
+            style.configure("Thumbnails.Treeview", rowheight=IMAGE_THUMBNAIL_SIZE[1] + 4)
+            self.db_tree.configure(style="Thumbnails.Treeview")
+            self.db_tree.column("#0", width=IMAGE_THUMBNAIL_SIZE[0] + 12, stretch=False)
 
         for col in columns:
             if col == "Link":
@@ -165,10 +278,13 @@ class TlamaCallerGUI(ctk.CTk):
         self.db_tree.column("Owned", width=70, anchor="center")
         self.db_tree.column("Link", width=100)
 
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.db_tree.yview)
-        self.db_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
         self.db_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
+        # Only the rows around the viewport exist as tree items, so the whole catalog fits
+        self.db_table = VirtualTreeview(
+            self.db_tree, scrollbar, image=self._db_thumbnail if DB_TAB_THUMBNAILS else None
+        )
 
         self.db_tree.bind("<Double-1>", self._on_db_game_select)
         self.db_tree.bind("<Button-1>", self._on_db_tree_click)
@@ -188,7 +304,7 @@ class TlamaCallerGUI(ctk.CTk):
         endpoint_frame = ctk.CTkFrame(top_frame)
         endpoint_frame.pack(fill="x", padx=10, pady=(0, 10))
         ctk.CTkLabel(endpoint_frame, text="Endpoint:", width=100, anchor="w").pack(side="left", padx=10, pady=10)
-        endpoint_keys = [k for k in ENDPOINTS if k != "game"]
+        endpoint_keys = [k for k in ENDPOINTS if k != "game"] + [OFFLINE_ENDPOINT]
         self.endpoint_dropdown = ctk.CTkComboBox(
             endpoint_frame,
             values=endpoint_keys,
@@ -292,7 +408,7 @@ class TlamaCallerGUI(ctk.CTk):
 
         results_frame = ctk.CTkFrame(self.search_tab)
         results_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        columns = ("Name", "Price", "Rating", "BGG", "Link")
+        columns = ("Name", "Price", "Rating", "BGG", "Updated", "Link")
         self.search_tree = ttk.Treeview(results_frame, columns=columns, show="headings", height=15)
         for col in columns:
             if col == "Link":
@@ -304,11 +420,12 @@ class TlamaCallerGUI(ctk.CTk):
         self.search_tree.column("Price", width=100)
         self.search_tree.column("Rating", width=100)
         self.search_tree.column("BGG", width=80)
+        self.search_tree.column("Updated", width=110)
         self.search_tree.column("Link", width=100)
-        search_scrollbar = ttk.Scrollbar(results_frame, orient="vertical", command=self.search_tree.yview)
-        self.search_tree.configure(yscrollcommand=search_scrollbar.set)
+        search_scrollbar = ttk.Scrollbar(results_frame, orient="vertical")
         self.search_tree.pack(side="left", fill="both", expand=True)
         search_scrollbar.pack(side="right", fill="y")
+        self.search_table = VirtualTreeview(self.search_tree, search_scrollbar)
         self.search_tree.bind("<Double-1>", self._on_search_game_select)
         self.search_tree.bind("<Button-1>", self._on_search_tree_click)
         self.search_tree.bind("<Motion>", self._on_search_tree_motion)
@@ -392,33 +509,136 @@ class TlamaCallerGUI(ctk.CTk):
         for dropdown in self.filter_dropdowns.values():
             dropdown.set("Select...")
 
+    def _set_status(self, text: str) -> None:
+        if hasattr(self, "status_label") and self.status_label:
+            self.status_label.configure(text=text)
+
+    def _in_background(self, job: Callable[[], Any], done: Callable[[Any], None]) -> None:
+        """Run job() on the DB worker thread and hand its result to done() on the Tk thread."""
+        def run() -> None:
+            try:
+                result = job()
+            except Exception as err:
+                self.after(0, lambda msg=str(err): self._set_status(f"❌ Error: {msg}"))
+                return
+            self.after(0, lambda: done(result))
+
+        self.db_executor.submit(run)
+
+    @staticmethod
+    def _load_catalog() -> Any:
+        """Columnar snapshot of games.db that follows later writes, or None without NumPy."""
+        from utils.catalog import NUMPY_AVAILABLE, CatalogSnapshot  # NumPy is loaded off the startup path
+
+        if not NUMPY_AVAILABLE:
+            logger.info("NumPy is not installed; the Database tab pages SQL queries instead")
+            return None
+        catalog = CatalogSnapshot().attach()  # attached first so no write is missed while loading
+        catalog.update()
+        return catalog
+
+    def _on_catalog_loaded(self, catalog: Any) -> None:
+        if catalog is not None:
+            self.catalog = catalog
+            self._apply_db_sort(keep_position=True)
+
     def _refresh_database(self) -> None:
-        self.db_tree.delete(*self.db_tree.get_children())
-        try:
-            self.db_games = get_all_games(limit=1000)
-            count = get_game_count()
-            if hasattr(self, "status_label") and self.status_label:
-                self.status_label.configure(text=f"📚 Database: {count} games")
-            self._apply_db_sort()
-        except Exception as err:
-            if hasattr(self, "status_label") and self.status_label:
-                self.status_label.configure(text=f"❌ Error: {err}")
-
-    def _apply_db_sort(self) -> None:
-        self.db_tree.delete(*self.db_tree.get_children())
-        games = self.db_games.copy()
+        self.db_filters = {}
+        self._apply_db_sort(status="📚 Database: {count} games")
+
+    def _db_row(self, game: BoardGame) -> tuple:
+        return (
+            game.name or "N/A",
+            self._format_price(game),
+            f"{game.my_rating:.1f}" if game.my_rating else "N/A",
+            f"{game.bgg_rating:.1f}" if game.bgg_rating else "N/A",
+            "■" if getattr(game, "has_demonic_vibe", False) else "□",
+            "■" if getattr(game, "owned", False) else "□",
+            "🔗 Open" if game.url else "N/A",
+        )
+
+    def _apply_db_sort(self, keep_position: bool = False, status: Optional[str] = None) -> None:
+        """
+        Show the DB tab in the selected order.
+
+        Once the in-memory catalog is loaded, filtering and sorting happen
+        synchronously on it. Until then (or without NumPy) rows are paged in
+        from SQL as the table scrolls: counting and page queries run on the DB
+        worker thread, and a newer call supersedes older ones, whose queued
+        queries are skipped and whose results are dropped.
+        """
         if self.db_sort_column and self.db_sort_direction:
-            games = self._sort_games(games, self.db_sort_column, self.db_sort_direction)
-        for game in games:
-            self.db_tree.insert("", "end", values=(
-                game.name or "N/A",
-                self._format_price(game),
-                f"{game.my_rating:.1f}" if game.my_rating else "N/A",
-                f"{game.bgg_rating:.1f}" if game.bgg_rating else "N/A",
-                "■" if getattr(game, "has_demonic_vibe", False) else "□",
-                "■" if getattr(game, "owned", False) else "□",
-                "🔗 Open" if game.url else "N/A",
-            ), tags=(game.url,))
+            order_by = f"{_DB_SORT_COLUMNS[self.db_sort_column]} {self.db_sort_direction}"
+        else:
+            order_by = DEFAULT_ORDER
+        filters = dict(self.db_filters)
+        self.db_generation += 1
+        generation = self.db_generation
+
+        if self.catalog is not None:
+            model = CatalogTableModel(
+                self.catalog, self.catalog.query(filters, order_by), key=lambda row: row.url, format_row=self._db_row,
+            )
+            self.db_model = model
+            self.db_table.set_model(model, keep_position)
+            if status:
+                self._set_status(status.format(count=len(model)))
+            return
+
+        def current() -> bool:
+            return generation == self.db_generation
+
+        def show(count: Optional[int]) -> None:
+            if not current():
+                return
+            model = PagedTableModel(
+                count,
+                fetch=lambda after, offset, limit: (
+                    get_game_rows(order_by, filters, limit, after, offset) if current() else []
+                ),
+                page_key=lambda row: row.page_key,
+                key=lambda row: row.url,
+                format_row=self._db_row,
+                page_size=DEFAULT_BATCH_SIZE,
+                loader=self._in_background,
+                on_loaded=lambda: self._on_db_page_loaded(model),
+            )
+            self.db_model = model
+            self.db_table.set_model(model, keep_position)
+            if status:
+                self._set_status(status.format(count=count))
+
+        self._in_background(lambda: count_games(filters) if current() else None, show)
+
+    def _db_thumbnail(self, url: str) -> Any:
+        """Thumbnail for a DB-tab row, or "" while it loads (the row is redrawn when it arrives)."""
+        photo = self.db_thumbnails.get(url)
+        if photo is not None:
+            self.db_thumbnails.move_to_end(url)
+            return photo
+        row = self.db_model.item(url) if self.db_model is not None else None
+        if row is None or not row.image:
+            return ""
+        image = self.image_service.request(
+            row.image, IMAGE_THUMBNAIL_SIZE,
+            lambda loaded: loaded is not None and self.after(0, lambda: self._on_db_thumbnail_loaded(url)),
+        )
+        if image is None:
+            return ""
+        photo = ImageTk.PhotoImage(image)
+        self.db_thumbnails[url] = photo
+        if len(self.db_thumbnails) > _DB_THUMBNAIL_PHOTOS:
+            self.db_thumbnails.popitem(last=False)
+        return photo
+
+    def _on_db_thumbnail_loaded(self, url: str) -> None:
+        index = self.db_model.index_of(url) if self.db_model is not None else None
+        if index is not None:
+            self.db_table.update_row(index)
+
+    def _on_db_page_loaded(self, model: PagedTableModel) -> None:
+        if model is self.db_model:
+            self.db_table.refresh()
 
     def _sort_db_table(self, column: str) -> None:
         if self.db_sort_column != column:
@@ -433,8 +653,7 @@ class TlamaCallerGUI(ctk.CTk):
         self._apply_db_sort()
 
     def _update_db_headers(self) -> None:
-        columns = ("Name", "Price", "Rating", "BGG", "Evil", "Owned", "Link")
-        for col in columns:
+        for col in self.db_tree["columns"]:
             text = col
             if col == self.db_sort_column:
                 text = f"{col} ▼" if self.db_sort_direction == "DESC" else f"{col} ▲"
@@ -446,18 +665,17 @@ class TlamaCallerGUI(ctk.CTk):
 
         def rerate() -> None:
             try:
-                games = get_all_games(limit=None)
-                total = len(games)
+                total = get_game_count()
                 if total == 0:
                     self.after(0, lambda: self.status_label.configure(text="⚠️ No games found in database"))
                     return
                 self.after(0, lambda: self.status_label.configure(text=f"⭐ Rerating {total} games..."))
                 updated_count = 0
-                for idx, game in enumerate(games, 1):
-                    reloaded = load_game(game.url)
-                    if reloaded:
-                        save_game(reloaded)
-                        updated_count += 1
+                # Stream in url order: rows come back already re-rated and saving
+                # them does not move them in that order, so nothing is skipped
+                for idx, game in enumerate(iter_games(order_by="url ASC"), 1):
+                    save_game(game)
+                    updated_count += 1
                     if idx % 10 == 0 or idx == total:
                         self.after(0, lambda i=idx, t=total: self.status_label.configure(text=f"⭐ Rerating: {i}/{t} games..."))
                 self.after(0, lambda: self._refresh_database())
@@ -467,83 +685,117 @@ class TlamaCallerGUI(ctk.CTk):
 
         threading.Thread(target=rerate, daemon=True).start()
 
-    def _search_database(self) -> None:
-        self.db_tree.delete(*self.db_tree.get_children())
+    def _schedule_db_search(self, event: Any = None) -> None:
+        """Search-as-you-type: restart the debounce timer on every keystroke."""
+        if self.db_search_pending is not None:
+            self.after_cancel(self.db_search_pending)
+        self.db_search_pending = self.after(_DB_SEARCH_DEBOUNCE_MS, lambda: self._search_database(typed=True))
+
+    def _search_database(self, typed: bool = False) -> None:
+        if self.db_search_pending is not None:
+            self.after_cancel(self.db_search_pending)
+            self.db_search_pending = None
         search_term = self.db_search_entry.get().strip()
-        try:
-            self.db_games = search_games_in_db(name=search_term, limit=500) if search_term else get_all_games(limit=500)
-            self._apply_db_sort()
-            if hasattr(self, "status_label") and self.status_label:
-                self.status_label.configure(text=f"📚 Found {len(self.db_games)} games")
-        except Exception as err:
-            if hasattr(self, "status_label") and self.status_label:
-                self.status_label.configure(text=f"❌ Error: {err}")
+        filters = {"name": search_term} if search_term else {}
+        if typed and filters == self.db_filters:
+            return  # keys that did not change the text (arrows, modifiers)
+        self.db_filters = filters
+        self._apply_db_sort(status="📚 Found {count} games")
 
     def _search_games(self) -> None:
-        if not self.caller:
+        endpoint = self.endpoint_dropdown.get()
+        # Offline searches run from games.db; stale matches are re-fetched once the caller is ready
+        if not self.caller and endpoint != OFFLINE_ENDPOINT:
             self.status_label.configure(text="⏳ Please wait, initializing...")
             return
         if not self.selected_filters:
             self.status_label.configure(text="⚠️ Please select at least one filter")
             return
         self.status_label.configure(text=f"🔍 Searching with {len(self.selected_filters)} filters...")
-        self.search_tree.delete(*self.search_tree.get_children())
+        self.search_games = []
+        self._apply_search_sort()
         self.progress_frame.pack(fill="x", padx=10, pady=10)
         self.progress_bar.set(0)
         self.progress_label.configure(text="Starting search...")
 
-        def progress_callback(stage: str, current: int, total: Optional[int], message: str) -> None:
-            if stage == "pages":
-                self.after(0, lambda: self.progress_label.configure(text=message))
-                cp = self.progress_bar.get()
-                self.after(0, lambda: self.progress_bar.set(0.02 if cp >= 0.18 else cp + 0.02))
-            elif stage == "pages_complete":
-                self.after(0, lambda: self.progress_bar.set(0.2))
-                self.after(0, lambda: self.progress_label.configure(text=message))
-            elif stage == "games" and total and total > 0:
-                scaled = 0.2 + (current / total * 0.8)
-                self.after(0, lambda p=scaled: self.progress_bar.set(p))
-                self.after(0, lambda m=message: self.progress_label.configure(text=m))
+        self.search_generation += 1
+        feed = _SearchFeed()
+        filters = self.selected_filters.copy()
 
         def search() -> None:
             try:
-                endpoint = self.endpoint_dropdown.get()
-                games = search_for_game(
+                excluded = load_excluded_urls()
+                for game in iter_search(
                     self.caller,
-                    filters=self.selected_filters.copy(),
+                    filters=filters,
                     endpoint=endpoint,
-                    progress_callback=progress_callback,
-                )
-                self.current_games = games
-                self.after(0, lambda: self.progress_frame.pack_forget())
-                self.after(0, lambda: self._display_search_results(games))
+                    progress_callback=feed.set_progress,
+                    cache=self.search_cache,
+                ):
+                    if not is_url_excluded(game.url, excluded):
+                        feed.add(game)
             except Exception as err:
-                self.after(0, lambda: self.progress_frame.pack_forget())
-                self.after(0, lambda msg=str(err): self.status_label.configure(text=f"❌ Error: {msg}"))
+                feed.finish(err)
+            else:
+                feed.finish()
 
         threading.Thread(target=search, daemon=True).start()
+        self._pump_search(feed, self.search_generation)
 
-    def _display_search_results(self, games: List[BoardGame]) -> None:
-        self.search_tree.delete(*self.search_tree.get_children())
-        excluded = __import__("utils.blocklist", fromlist=["load_excluded_urls"]).load_excluded_urls()
-        filtered = [g for g in games if not is_url_excluded(g.url, excluded)]
-        self.search_games = filtered[:100]
-        self._apply_search_sort()
-        self.status_label.configure(text=f"✅ Found {len(filtered)} games")
+    def _pump_search(self, feed: "_SearchFeed", generation: int) -> None:
+        """Move results and the latest progress from the crawl thread into the UI (at _UI_REFRESH_MS)."""
+        if generation != self.search_generation:
+            return
+        games, progress, found, done, error = feed.drain()
+        if games:
+            # Kept in rating order by insertion; only the best SEARCH_RESULTS_LIMIT are shown
+            for game in games:
+                insort(self.search_games, game, key=lambda g: -(g.my_rating or 0))
+            del self.search_games[SEARCH_RESULTS_LIMIT:]
+            self._apply_search_sort(keep_position=True)
+        if progress:
+            self._show_search_progress(*progress)
+        if not done:
+            if games:
+                self.status_label.configure(text=f"🔍 Found {found} games so far...")
+            self.after(_UI_REFRESH_MS, lambda: self._pump_search(feed, generation))
+            return
+        self.progress_frame.pack_forget()
+        if error is not None:
+            self.status_label.configure(text=f"❌ Error: {error}")
+        else:
+            self.status_label.configure(text=f"✅ Found {found} games")
+
+    def _show_search_progress(self, stage: str, current: int, total: Optional[int], message: str) -> None:
+        if stage == "pages":
+            self.progress_label.configure(text=message)
+            if total:
+                self.progress_bar.set(current / total * 0.2)
+            else:
+                cp = self.progress_bar.get()
+                self.progress_bar.set(0.02 if cp >= 0.18 else cp + 0.02)
+        elif stage == "pages_complete":
+            self.progress_bar.set(0.2)
+            self.progress_label.configure(text=message)
+        elif stage == "games" and total and total > 0:
+            self.progress_bar.set(0.2 + (current / total * 0.8))
+            self.progress_label.configure(text=message)
+
+    def _search_row(self, game: BoardGame) -> tuple:
+        return (
+            game.name or "N/A",
+            self._format_price(game),
+            f"{game.my_rating:.1f}" if game.my_rating else "N/A",
+            f"{game.bgg_rating:.1f}" if game.bgg_rating else "N/A",
+            freshness_label(game.last_fetched_at, DELTA_MAX_AGE_DAYS),
+            "🔗 Open" if game.url else "N/A",
+        )
 
-    def _apply_search_sort(self) -> None:
-        self.search_tree.delete(*self.search_tree.get_children())
-        games = self.search_games.copy()
+    def _apply_search_sort(self, keep_position: bool = False) -> None:
+        games = self.search_games
         if self.search_sort_column and self.search_sort_direction:
             games = self._sort_games(games, self.search_sort_column, self.search_sort_direction)
-        for game in games:
-            self.search_tree.insert("", "end", values=(
-                game.name or "N/A",
-                self._format_price(game),
-                f"{game.my_rating:.1f}" if game.my_rating else "N/A",
-                f"{game.bgg_rating:.1f}" if game.bgg_rating else "N/A",
-                "🔗 Open" if game.url else "N/A",
-            ), tags=(game.url,))
+        self.search_table.set_model(ListTableModel(games, lambda g: g.url, self._search_row), keep_position)
 
     def _sort_search_table(self, column: str) -> None:
         if self.search_sort_column != column:
@@ -558,8 +810,7 @@ class TlamaCallerGUI(ctk.CTk):
         self._apply_search_sort()
 
     def _update_search_headers(self) -> None:
-        columns = ("Name", "Price", "Rating", "BGG", "Link")
-        for col in columns:
+        for col in self.search_tree["columns"]:
             text = col
             if col == self.search_sort_column:
                 text = f"{col} ▼" if self.search_sort_direction == "DESC" else f"{col} ▲"
@@ -582,19 +833,27 @@ class TlamaCallerGUI(ctk.CTk):
                 return 1 if getattr(game, "has_demonic_vibe", False) else 0
             elif column == "Owned":
                 return 1 if getattr(game, "owned", False) else 0
+            elif column == "Updated":
+                return game.last_fetched_at or ""
             elif column == "Link":
                 return game.url or ""
             return ""
 
         return sorted(games, key=get_sort_key, reverse=(direction == "DESC"))
 
+    @staticmethod
+    def _row_url(tree: ttk.Treeview, item: str) -> Optional[str]:
+        """URL stored as the row's tag (None for placeholder rows still loading)."""
+        tags = tree.item(item)["tags"]
+        return tags[0] if tags else None
+
     def _on_db_tree_motion(self, event: object) -> None:
         pointer = "pointinghand" if platform.system() == "Darwin" else "hand2"
         if self.db_tree.identify_region(event.x, event.y) == "cell":
             col = self.db_tree.identify_column(event.x)
             item = self.db_tree.identify_row(event.y)
             if item and col in ["#5", "#6", "#7"]:
-                url = self.db_tree.item(item)["tags"][0]
+                url = self._row_url(self.db_tree, item)
                 if url and url != "N/A":
                     self.db_tree.configure(cursor=pointer)
                     return
@@ -603,7 +862,7 @@ class TlamaCallerGUI(ctk.CTk):
     def _on_search_tree_motion(self, event: object) -> None:
         pointer = "pointinghand" if platform.system() == "Darwin" else "hand2"
         if self.search_tree.identify_region(event.x, event.y) == "cell":
-            if self.search_tree.identify_column(event.x) == "#5":
+            if self.search_tree.identify_column(event.x) == "#6":
                 item = self.search_tree.identify_row(event.y)
                 if item:
                     url = self.search_tree.item(item)["tags"][0]
@@ -619,30 +878,37 @@ class TlamaCallerGUI(ctk.CTk):
         item = self.db_tree.identify_row(event.y)
         if not item:
             return
-        url = self.db_tree.item(item)["tags"][0]
+        url = self._row_url(self.db_tree, item)
         if not url or url == "N/A":
             return
-        if col == "#5":
-            vals = self.db_tree.item(item)["values"]
-            new_val = vals[4] != "■"
-            update_game_boolean(url, "has_demonic_vibe", new_val)
-            g = next((x for x in self.db_games if x.url == url), None)
-            if g:
-                g.has_demonic_vibe = new_val
-            self._apply_db_sort()
-        elif col == "#6":
-            vals = self.db_tree.item(item)["values"]
-            new_val = vals[5] != "■"
-            update_game_boolean(url, "owned", new_val)
-            g = next((x for x in self.db_games if x.url == url), None)
-            if g:
-                g.owned = new_val
-            self._apply_db_sort()
+        if col in ("#5", "#6"):
+            field = "has_demonic_vibe" if col == "#5" else "owned"
+            new_val = self.db_tree.item(item)["values"][int(col[1:]) - 1] != "■"
+            self._toggle_db_flag(url, field, new_val)
         elif col == "#7":
             webbrowser.open(url)
 
+    def _toggle_db_flag(self, url: str, field: str, value: bool) -> None:
+        """Update one row in place right away and write the flag on the DB worker."""
+        sorted_by_flag = self.db_sort_column and _DB_SORT_COLUMNS[self.db_sort_column] == field
+        if not sorted_by_flag and self.db_model is not None:
+            index = self.db_model.update_item(url, lambda row: row._replace(**{field: value}))
+            if index is not None:
+                self.db_table.update_row(index)
+
+        def written(_: object) -> None:
+            # Sorted by the toggled column: the row moves, so re-query around the current position
+            if sorted_by_flag:
+                self._apply_db_sort(keep_position=True)
+
+        def write() -> None:
+            update_game_boolean(url, field, value)
+            self.blocklist.request([url])
+
+        self._in_background(write, written)
+
     def _on_search_tree_click(self, event: object) -> None:
-        if self.search_tree.identify_region(event.x, event.y) != "cell" or self.search_tree.identify_column(event.x) != "#5":
+        if self.search_tree.identify_region(event.x, event.y) != "cell" or self.search_tree.identify_column(event.x) != "#6":
             return
         item = self.search_tree.identify_row(event.y)
         if item:
@@ -653,44 +919,52 @@ class TlamaCallerGUI(ctk.CTk):
     def _on_db_game_select(self, event: object) -> None:
         sel = self.db_tree.selection()
         if sel:
-            url = self.db_tree.item(sel[0])["tags"][0]
-            game = load_game(url)
-            if game:
-                GameDetailsWindow(self, game)
+            url = self._row_url(self.db_tree, sel[0])
+            if url:
+                self._in_background(lambda: load_game(url), lambda game: game and GameDetailsWindow(self, game, self.image_service))
 
     def _on_search_game_select(self, event: object) -> None:
         sel = self.search_tree.selection()
         if sel:
             url = self.search_tree.item(sel[0])["tags"][0]
-            game = next((g for g in self.current_games if g.url == url), None)
+            game = next((g for g in self.search_games if g.url == url), None)
             if game:
-                GameDetailsWindow(self, game)
+                GameDetailsWindow(self, game, self.image_service)
 
     def on_closing(self) -> None:
-        if self.caller:
-            try:
-                self.caller.close()
-            except Exception:
-                pass
-        try:
-            urls = get_excluded_game_urls()
-            path = get_blocklist_path()
-            header = (
-                "# Excluded game URLs - never send notifications for these games\n"
-                "# One URL per line. Add via: uv run python main.py export-excluded\n"
-                "# Or edit manually. Used by CI and local runs.\n\n"
-            )
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(header)
-                for url in sorted(urls):
-                    f.write(f"{url}\n")
-        except Exception:
-            pass
+        """Close the window right away; pending writes and the browser are finished in the background."""
+        self.db_generation += 1  # queued DB-tab reads become no-ops
+        self.db_executor.shutdown(wait=False)
+        self.image_service.shutdown()
+        if self.catalog is not None:
+            self.catalog.detach()
+        caller = self.caller
+
+        def cleanup() -> None:
+            self.db_executor.shutdown(wait=True)  # flag writes still queued
+            if not self.blocklist.close(timeout=_SHUTDOWN_TIMEOUT_SECONDS):
+                logger.warning("Blocklist write still running at exit")
+            if caller:
+                try:
+                    caller.close()
+                except Exception as e:
+                    logger.warning("Could not close the website caller: %s", e)
+
+        self.cleanup_thread = threading.Thread(target=cleanup, name="shutdown", daemon=True)
+        self.cleanup_thread.start()
         self.destroy()
 
+    def wait_for_cleanup(self, timeout: float = _SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """Give the shutdown cleanup up to timeout seconds (it is abandoned after that)."""
+        if self.cleanup_thread is not None:
+            self.cleanup_thread.join(timeout)
+            if self.cleanup_thread.is_alive():
+                logger.warning("Shutdown cleanup did not finish within %ss", timeout)
+
 
 def run_interface() -> None:
     """Run the GUI application."""
     app = TlamaCallerGUI()
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
     app.mainloop()
+    app.wait_for_cleanup()
@@ -0,0 +1,354 @@
+"""Virtualized ttk.Treeview: only a window of rows around the viewport exists as items."""
+
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Protocol, Sequence
+
+from tkinter import ttk
+
+# Extra rows materialized above and below the viewport so short scrolls stay native
+OVERSCAN_ROWS = 20
+_DEFAULT_ROW_HEIGHT = 20
+
+Row = tuple[str, tuple]  # (key stored as the item's first tag, column values)
+
+
+class TableModel(Protocol):
+    """Row source for VirtualTreeview; rows(start, stop) is only called for the visible window."""
+
+    def __len__(self) -> int: ...
+
+    def rows(self, start: int, stop: int) -> list[Row]: ...
+
+
+class ListTableModel:
+    """TableModel over an in-memory list, formatting rows on demand."""
+
+    def __init__(self, items: Sequence[Any], key: Callable[[Any], str], format_row: Callable[[Any], tuple]):
+        self.items = items
+        self.key = key
+        self.format_row = format_row
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def rows(self, start: int, stop: int) -> list[Row]:
+        return [(self.key(item), self.format_row(item)) for item in self.items[start:stop]]
+
+
+# loader(job, done): run job() off the UI thread, then call done(result) on the UI thread
+Loader = Callable[[Callable[[], Any], Callable[[Any], None]], None]
+
+
+class PagedTableModel:
+    """
+    TableModel over a paged query, fetching pages lazily as the window reaches them.
+
+    fetch(after, offset, limit) returns one page of items. A page whose
+    predecessor is cached continues from page_key(last item) (keyset
+    pagination, with offset 0); other pages (jumps via the scrollbar) use
+    offset. At most max_pages pages are kept, least recently used dropped first.
+
+    With a loader, pages are fetched in the background: rows() returns
+    placeholder rows (empty key) for pages still loading and on_loaded() is
+    called on the UI thread as each page arrives. Cached items are indexed by key.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        fetch: Callable[[Optional[Any], int, int], list],
+        page_key: Callable[[Any], Any],
+        key: Callable[[Any], str],
+        format_row: Callable[[Any], tuple],
+        page_size: int = 200,
+        max_pages: int = 50,
+        loader: Optional[Loader] = None,
+        on_loaded: Optional[Callable[[], None]] = None,
+        placeholder: tuple = ("…",),
+    ):
+        self.count = count
+        self.fetch = fetch
+        self.page_key = page_key
+        self.key = key
+        self.format_row = format_row
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.loader = loader
+        self.on_loaded = on_loaded
+        self.placeholder = placeholder
+        self._pages: OrderedDict[int, list] = OrderedDict()
+        self._pending: set[int] = set()
+        self._index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _request(self, page: int) -> tuple[Optional[Any], int]:
+        """(after, offset) arguments for fetching page."""
+        previous = self._pages.get(page - 1)
+        if previous:
+            return self.page_key(previous[-1]), 0
+        return None, page * self.page_size
+
+    def _store(self, page: int, items: list) -> None:
+        self._pending.discard(page)
+        self._pages[page] = items
+        base = page * self.page_size
+        for offset, item in enumerate(items):
+            self._index[self.key(item)] = base + offset
+        while len(self._pages) > self.max_pages:
+            evicted, old_items = self._pages.popitem(last=False)
+            for item in old_items:
+                if self._index.get(self.key(item), -1) // self.page_size == evicted:
+                    del self._index[self.key(item)]
+
+    def _loaded(self, page: int, items: list) -> None:
+        self._store(page, items)
+        if self.on_loaded is not None:
+            self.on_loaded()
+
+    def _page(self, page: int) -> Optional[list]:
+        """Cached items of page; fetched now (sync) or requested (async, returns None)."""
+        items = self._pages.get(page)
+        if items is not None:
+            self._pages.move_to_end(page)
+            return items
+        after, offset = self._request(page)
+        if self.loader is None:
+            self._store(page, self.fetch(after, offset, self.page_size))
+            return self._pages[page]
+        if page not in self._pending:
+            self._pending.add(page)
+            self.loader(
+                lambda: self.fetch(after, offset, self.page_size),
+                lambda loaded: self._loaded(page, loaded),
+            )
+        return None
+
+    def rows(self, start: int, stop: int) -> list[Row]:
+        stop = min(stop, self.count)
+        result: list[Row] = []
+        if start >= stop:
+            return result
+        for page in range(start // self.page_size, (stop - 1) // self.page_size + 1):
+            base = page * self.page_size
+            lo, hi = max(start, base), min(stop, base + self.page_size)
+            items = self._page(page)
+            if items is None:
+                result.extend(("", self.placeholder) for _ in range(lo, hi))
+                continue
+            result.extend((self.key(item), self.format_row(item)) for item in items[lo - base:hi - base])
+            # A short page (rows deleted since counting) is padded so indexes stay aligned
+            result.extend(("", self.placeholder) for _ in range(len(items[lo - base:hi - base]), hi - lo))
+        return result
+
+    def index_of(self, key: str) -> Optional[int]:
+        """Row index of a cached item by key."""
+        return self._index.get(key)
+
+    def item(self, key: str) -> Optional[Any]:
+        """Cached item by key, or None if its page is not loaded."""
+        index = self._index.get(key)
+        if index is None:
+            return None
+        items = self._pages.get(index // self.page_size)
+        offset = index % self.page_size
+        return items[offset] if items is not None and offset < len(items) else None
+
+    def update_item(self, key: str, update: Callable[[Any], Any]) -> Optional[int]:
+        """Replace a cached item with update(item); returns its row index, or None if not cached."""
+        index = self._index.get(key)
+        if index is None:
+            return None
+        page, offset = divmod(index, self.page_size)
+        items = self._pages.get(page)
+        if items is None or offset >= len(items):
+            return None
+        items[offset] = update(items[offset])
+        return index
+
+
+class CatalogTableModel:
+    """
+    TableModel over row indices into an in-memory catalog (utils.catalog.CatalogSnapshot).
+
+    Every row is available synchronously: rows() turns just the requested
+    slice of indices into items via catalog.rows(). Items changed with
+    update_item() are kept as overrides until the model is replaced.
+    """
+
+    def __init__(self, catalog: Any, indices: Sequence[int], key: Callable[[Any], str],
+                 format_row: Callable[[Any], tuple]):
+        self.catalog = catalog
+        self.indices = indices
+        self.key = key
+        self.format_row = format_row
+        self._overrides: dict[str, Any] = {}
+        self._positions: Optional[dict[int, int]] = None  # catalog row -> row index, built on first lookup
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def _items(self, start: int, stop: int) -> list:
+        items = self.catalog.rows(self.indices[start:stop])
+        if self._overrides:
+            items = [self._overrides.get(self.key(item), item) for item in items]
+        return items
+
+    def rows(self, start: int, stop: int) -> list[Row]:
+        return [(self.key(item), self.format_row(item)) for item in self._items(start, stop)]
+
+    def index_of(self, key: str) -> Optional[int]:
+        """Row index of an item by key, or None if it is not in this view."""
+        row = self.catalog.index_of(key)
+        if row is None:
+            return None
+        if self._positions is None:
+            self._positions = {int(index): position for position, index in enumerate(self.indices)}
+        return self._positions.get(row)
+
+    def item(self, key: str) -> Optional[Any]:
+        index = self.index_of(key)
+        return self._items(index, index + 1)[0] if index is not None else None
+
+    def update_item(self, key: str, update: Callable[[Any], Any]) -> Optional[int]:
+        """Replace an item with update(item); returns its row index, or None if not in this view."""
+        index = self.index_of(key)
+        if index is None:
+            return None
+        self._overrides[key] = update(self._items(index, index + 1)[0])
+        return index
+
+
+def window_bounds(top: int, visible: int, overscan: int, total: int) -> tuple[int, int]:
+    """[start, stop) of rows to materialize for a viewport starting at row `top`."""
+    size = visible + 2 * overscan
+    start = max(0, min(top - overscan, total - size))
+    return start, min(total, start + size)
+
+
+class VirtualTreeview:
+    """
+    Drive a ttk.Treeview from a TableModel, keeping only viewport + overscan rows as items.
+
+    Item iids are a fixed pool that is re-filled in place when the window
+    moves, so sorting or scrolling a large table costs one window of
+    item() calls instead of deleting and re-inserting every row. The given
+    scrollbar reflects the position in the whole model; the tree's own
+    yscrollcommand is taken over to slide the window when a scroll nears its edge.
+    With image(key), each row also shows the returned image (or "" for none)
+    in the tree column.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar,
+                 model: Optional[TableModel] = None, overscan: int = OVERSCAN_ROWS,
+                 image: Optional[Callable[[str], Any]] = None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.overscan = overscan
+        self.image = image
+        self.model: TableModel = model if model is not None else ListTableModel([], str, tuple)
+        self.start = 0
+        self._iids: list[str] = []
+        self._visible = max(1, int(tree.cget("height")))
+        tree.configure(yscrollcommand=self._on_tree_scrolled)
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.bind("<Configure>", self._on_configure, add="+")
+
+    def __len__(self) -> int:
+        return len(self.model)
+
+    def set_model(self, model: TableModel, keep_position: bool = False) -> None:
+        """Show a new model from its first row (or at the current scroll position)."""
+        top = self._top() if keep_position and self._iids else 0
+        self.model = model
+        self._render(top)
+
+    def refresh(self) -> None:
+        """Re-read the current window from the model (after a sort, filter or edit)."""
+        self._render(self._top())
+
+    def index_of(self, iid: str) -> Optional[int]:
+        """Model row index of a materialized item."""
+        try:
+            return self.start + self._iids.index(iid)
+        except ValueError:
+            return None
+
+    def update_row(self, index: int) -> None:
+        """Re-read one row from the model if it is materialized (a single item() call)."""
+        offset = index - self.start
+        if 0 <= offset < len(self._iids):
+            (key, values), = self.model.rows(index, index + 1)
+            self._fill(self._iids[offset], key, values)
+
+    def _fill(self, iid: str, key: str, values: tuple) -> None:
+        if self.image is None:
+            self.tree.item(iid, values=values, tags=(key,) if key else ())
+        else:
+            self.tree.item(iid, values=values, tags=(key,) if key else (), image=self.image(key) if key else "")
+
+    def _top(self) -> int:
+        """Model index of the first row in the viewport."""
+        first, _ = self.tree.yview()
+        return self.start + int(round(first * len(self._iids)))
+
+    def _render(self, top: int) -> None:
+        total = len(self.model)
+        top = max(0, min(top, max(total - self._visible, 0)))
+        start, stop = window_bounds(top, self._visible, self.overscan, total)
+        rows = self.model.rows(start, stop)
+        while len(self._iids) < len(rows):
+            self._iids.append(self.tree.insert("", "end"))
+        if len(self._iids) > len(rows):
+            self.tree.delete(*self._iids[len(rows):])
+            del self._iids[len(rows):]
+        for iid, (key, values) in zip(self._iids, rows):
+            self._fill(iid, key, values)
+        self.start = start
+        if self._iids:
+            self.tree.yview_moveto((top - start) / len(self._iids))
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        total = len(self.model)
+        if not total or not self._iids:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first, last = self.tree.yview()
+        pool = len(self._iids)
+        self.scrollbar.set((self.start + first * pool) / total, (self.start + last * pool) / total)
+
+    def _on_tree_scrolled(self, first: str, last: str) -> None:
+        """Tree scrolled natively (wheel, keys): slide the window before it runs out of rows."""
+        pool = len(self._iids)
+        if pool:
+            top = self.start + int(round(float(first) * pool))
+            margin = self.overscan // 2
+            near_top = self.start > 0 and top - self.start < margin
+            near_bottom = self.start + pool < len(self.model) and self.start + pool - (top + self._visible) < margin
+            if near_top or near_bottom:
+                self._render(top)
+                return
+        self._update_scrollbar()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        total = len(self.model)
+        if action == "moveto":
+            top = int(float(amount) * total)
+        else:
+            step = self._visible if unit == "pages" else 1
+            top = self._top() + int(amount) * step
+        self._render(top)
+
+    def _on_configure(self, event: Any) -> None:
+        row_height = _DEFAULT_ROW_HEIGHT
+        for iid in self._iids:
+            bbox = self.tree.bbox(iid)
+            if bbox:
+                row_height = max(bbox[3], 1)
+                break
+        visible = max(1, event.height // row_height)
+        if visible != self._visible:
+            self._visible = visible
+            self.refresh()
@@ -1,7 +1,6 @@
 """Utility functions for scraping and processing board game data."""
 
 from .promo import get_promo_game, get_promo_game_url
-from .search import search_for_game
-
-__all__ = ['get_promo_game', 'get_promo_game_url', 'search_for_game']
+from .search import TopK, iter_search, search_for_game
 
+__all__ = ['TopK', 'get_promo_game', 'get_promo_game_url', 'iter_search', 'search_for_game']
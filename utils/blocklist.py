@@ -1,7 +1,20 @@
 """Blocklist of game URLs to exclude from notifications (evil/owned games)."""
 
+import logging
 import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+BLOCKLIST_HEADER = (
+    "# Excluded game URLs - never send notifications for these games\n"
+    "# One URL per line. Add via: uv run python main.py export-excluded\n"
+    "# Or edit manually. Used by CI and local runs.\n\n"
+)
 
 
 def _normalize_url(url: str) -> str:
@@ -42,3 +55,93 @@ def is_url_excluded(url: str, excluded: set[str] | None = None) -> bool:
     if excluded is None:
         excluded = load_excluded_urls()
     return _normalize_url(url) in excluded
+
+
+def write_excluded_urls(urls: Iterable[str], path: Optional[Path] = None) -> Path:
+    """
+    Write the blocklist (header + sorted URLs) atomically and return its path.
+
+    The content goes to a temp file in the same directory that then replaces
+    the blocklist, so readers never see a partly written file.
+    """
+    path = Path(path) if path is not None else get_blocklist_path()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(BLOCKLIST_HEADER)
+            for url in sorted(urls):
+                f.write(f"{url}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+class BlocklistExporter:
+    """
+    Keep the blocklist file in step with flag toggles, writing on a background thread.
+
+    The first write loads every excluded URL with load_urls(None); after that,
+    request(urls) only asks load_urls(urls) which of the toggled games are
+    still excluded and patches the in-memory set before the file is replaced.
+    Requests made while a write is still queued share it, so a burst of flag
+    toggles costs one write that reflects all of them. Requests after close()
+    are ignored.
+    """
+
+    def __init__(self, load_urls: Callable[[Optional[list[str]]], Iterable[str]], path: Optional[Path] = None):
+        self.load_urls = load_urls
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blocklist")
+        self._lock = threading.Lock()
+        self._queued: Optional[Future] = None
+        self._last: Optional[Future] = None
+        self._closed = False
+        self._urls: Optional[set[str]] = None  # blocklist content, once loaded
+        self._changed: Optional[set[str]] = set()  # toggled since the last write; None reloads everything
+
+    def request(self, urls: Optional[Iterable[str]] = None) -> None:
+        """Queue a write covering the games at urls (all games when urls is None)."""
+        with self._lock:
+            if self._closed:
+                logger.debug("Blocklist exporter closed; write request ignored")
+                return
+            if urls is None or self._changed is None:
+                self._changed = None
+            else:
+                self._changed.update(urls)
+            if self._queued is not None:
+                return
+            self._queued = self._last = self._executor.submit(self._write)
+
+    def _write(self) -> None:
+        with self._lock:
+            self._queued = None  # later requests need a new write
+            changed, self._changed = self._changed, set()
+        try:
+            if self._urls is None or changed is None:
+                self._urls = set(self.load_urls(None))
+            elif changed:
+                excluded = set(self.load_urls(sorted(changed)))
+                self._urls = (self._urls - changed) | excluded
+            path = write_excluded_urls(self._urls, self.path)
+            logger.debug("Blocklist written to %s", path)
+        except Exception as e:
+            self._urls = None  # state unknown: reload everything next time
+            logger.error("Could not write blocklist: %s", e)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting requests and wait up to timeout for the pending write; True if it finished."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False)
+        last = self._last
+        if last is None:
+            return True
+        return not wait([last], timeout=timeout).not_done
@@ -0,0 +1,305 @@
+"""Columnar in-memory snapshot of games.db for instant filtering, sorting and top-K (optional NumPy)."""
+
+import string
+import threading
+from typing import Iterable, Optional
+
+from database import (
+    DEFAULT_ORDER,
+    CatalogRow,
+    GameRow,
+    add_change_listener,
+    load_catalog_rows,
+    remove_change_listener,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: uv sync --extra catalog
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Numeric columns kept as float64 arrays (thresholds compare exactly as in SQL); NULL is NaN,
+# so comparisons exclude it like SQL does
+_NUMERIC_COLUMNS = (
+    "price", "discount_percent", "my_rating", "bgg_rating",
+    "min_players", "max_players", "play_time_minutes", "complexity",
+)
+_FLAG_COLUMNS = ("has_demonic_vibe", "owned")
+# Sort columns (as in database.get_game_rows) -> the array they sort by
+_ORDER_COLUMNS = {
+    "my_rating": "my_rating",
+    "final_price": "price",
+    "bgg_rating": "bgg_rating",
+    "has_demonic_vibe": "has_demonic_vibe",
+    "owned": "owned",
+}
+_SUPPORTED_FILTERS = {
+    "name", "min_rating", "min_price", "max_price", "discounted", "players", "min_complexity",
+    "max_complexity", "min_bgg_rating", "max_play_time", "categories", "mechanics", "match_all", "urls",
+}
+_INITIAL_CAPACITY = 1024
+# SQLite's NOCASE collation folds ASCII letters only (so 'Š' and 'š' still differ)
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class _TagBits:
+    """Per-row bitsets over a growing tag vocabulary (64 tags per uint64 word)."""
+
+    def __init__(self, capacity: int):
+        self.vocabulary: dict[str, int] = {}
+        self.bits = np.zeros((capacity, 1), dtype=np.uint64)
+
+    def grow(self, capacity: int) -> None:
+        grown = np.zeros((capacity, self.bits.shape[1]), dtype=np.uint64)
+        grown[:len(self.bits)] = self.bits
+        self.bits = grown
+
+    def _bit(self, name: str) -> int:
+        bit = self.vocabulary.get(name)
+        if bit is None:
+            bit = self.vocabulary[name] = len(self.vocabulary)
+            if bit // 64 >= self.bits.shape[1]:
+                self.bits = np.hstack([self.bits, np.zeros((len(self.bits), 1), dtype=np.uint64)])
+        return bit
+
+    def set_row(self, row: int, names: Iterable[str]) -> None:
+        self.bits[row] = 0
+        for name in names:
+            bit = self._bit(name)
+            self.bits[row, bit // 64] |= np.uint64(1 << (bit % 64))
+
+    def mask(self, names: list[str], match_all: bool, size: int) -> "np.ndarray":
+        """Rows carrying all (or any) of names; unknown names match nothing."""
+        query = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        known = [self.vocabulary[name] for name in names if name in self.vocabulary]
+        if not known or (match_all and len(known) < len(set(names))):
+            return np.zeros(size, dtype=bool)
+        for bit in known:
+            query[bit // 64] |= np.uint64(1 << (bit % 64))
+        hits = self.bits[:size] & query
+        return (hits == query).all(axis=1) if match_all else (hits != 0).any(axis=1)
+
+
+class CatalogSnapshot:
+    """
+    The catalog as NumPy columns plus category/mechanic bitsets, one row per game.
+
+    Built once with load(); after attach() it follows writes to games.db
+    (saves, flag updates, re-ratings) through the database change listener,
+    re-reading only the changed rows. Rows never move, so indices returned by
+    query() and top_k() stay valid across updates. filters dicts use the keys
+    of database._build_filter_conditions that the catalog holds columns for
+    (plus max_play_time). Safe to query and update from different threads.
+    """
+
+    def __init__(self, rows: Iterable[CatalogRow] = ()):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is required for the catalog. Install it with: uv sync --extra catalog")
+        self._lock = threading.RLock()
+        self.size = 0
+        capacity = _INITIAL_CAPACITY
+        self.urls: list[str] = []
+        self.names: list[Optional[str]] = []
+        self.images: list[Optional[str]] = []
+        self._index: dict[str, int] = {}
+        self._numeric = {column: np.full(capacity, np.nan, dtype=np.float64) for column in _NUMERIC_COLUMNS}
+        self._flags = {column: np.zeros(capacity, dtype=bool) for column in _FLAG_COLUMNS}
+        self._categories = _TagBits(capacity)
+        self._mechanics = _TagBits(capacity)
+        self._orders: dict[str, "np.ndarray"] = {}
+        self._lower_names: Optional["np.ndarray"] = None
+        self._attached = False
+        self._apply(list(rows))
+
+    @classmethod
+    def load(cls) -> "CatalogSnapshot":
+        """Build a snapshot of every game in games.db."""
+        return cls(load_catalog_rows())
+
+    def __len__(self) -> int:
+        return self.size
+
+    # --- keeping current ---
+
+    def attach(self) -> "CatalogSnapshot":
+        """Start following database writes."""
+        if not self._attached:
+            add_change_listener(self.update)
+            self._attached = True
+        return self
+
+    def detach(self) -> None:
+        if self._attached:
+            remove_change_listener(self.update)
+            self._attached = False
+
+    def update(self, urls: Optional[list[str]] = None) -> None:
+        """Re-read the given games (all games when urls is None) from the database; new ones are appended."""
+        self._apply(load_catalog_rows(urls))
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._flags["owned"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for column, values in self._numeric.items():
+            grown = np.full(capacity, np.nan, dtype=np.float64)
+            grown[:self.size] = values[:self.size]
+            self._numeric[column] = grown
+        for column, values in self._flags.items():
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:self.size] = values[:self.size]
+            self._flags[column] = grown
+        self._categories.grow(capacity)
+        self._mechanics.grow(capacity)
+
+    def _apply(self, rows: list[CatalogRow]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            self._grow(self.size + len(rows))
+            for row in rows:
+                index = self._index.get(row.url)
+                if index is None:
+                    index = self._index[row.url] = self.size
+                    self.size += 1
+                    self.urls.append(row.url)
+                    self.names.append(row.name)
+                    self.images.append(row.image)
+                else:
+                    self.names[index] = row.name
+                    self.images[index] = row.image
+                for column in _NUMERIC_COLUMNS:
+                    value = getattr(row, column)
+                    self._numeric[column][index] = np.nan if value is None else value
+                for column in _FLAG_COLUMNS:
+                    self._flags[column][index] = getattr(row, column)
+                self._categories.set_row(index, row.categories)
+                self._mechanics.set_row(index, row.mechanics)
+            # Cached sort orders and the name search array are rebuilt on next use
+            self._orders.clear()
+            self._lower_names = None
+
+    # --- queries ---
+
+    def _column(self, name: str) -> "np.ndarray":
+        values = self._numeric.get(name)
+        return values[:self.size] if values is not None else self._flags[name][:self.size]
+
+    def mask(self, filters: Optional[dict] = None) -> "np.ndarray":
+        """Boolean row mask of games matching filters."""
+        filters = filters or {}
+        unsupported = {key for key, value in filters.items() if value is not None} - _SUPPORTED_FILTERS
+        if unsupported:
+            raise KeyError(f"Filters not supported by the catalog: {', '.join(sorted(unsupported))}")
+        with self._lock:
+            n = self.size
+            mask = np.ones(n, dtype=bool)
+            col = self._column
+            if filters.get("name"):
+                if self._lower_names is None:
+                    self._lower_names = np.array([(name or "").lower() for name in self.names], dtype=str)
+                mask &= np.char.find(self._lower_names, filters["name"].lower()) >= 0
+            for key, column, keep in (
+                ("min_rating", "my_rating", np.greater_equal),
+                ("min_price", "price", np.greater_equal),
+                ("max_price", "price", np.less_equal),
+                ("min_complexity", "complexity", np.greater_equal),
+                ("max_complexity", "complexity", np.less_equal),
+                ("min_bgg_rating", "bgg_rating", np.greater_equal),
+                ("max_play_time", "play_time_minutes", np.less_equal),
+            ):
+                if filters.get(key) is not None:
+                    mask &= keep(col(column), filters[key])
+            if filters.get("discounted"):
+                mask &= col("discount_percent") > 0
+            if filters.get("players") is not None:
+                players = filters["players"]
+                min_players, max_players = col("min_players"), col("max_players")
+                mask &= (min_players <= players) & (np.where(np.isnan(max_players), min_players, max_players) >= players)
+            match_all = filters.get("match_all", True)
+            for key, tags in (("categories", self._categories), ("mechanics", self._mechanics)):
+                names = list(dict.fromkeys(filters.get(key) or []))
+                if names:
+                    mask &= tags.mask(names, match_all, n)
+            if filters.get("urls") is not None:
+                rows = [self._index[url] for url in filters["urls"] if url in self._index]
+                selected = np.zeros(n, dtype=bool)
+                selected[rows] = True
+                mask &= selected
+            return mask
+
+    def count(self, filters: Optional[dict] = None) -> int:
+        return int(self.mask(filters).sum())
+
+    def _sort_key(self, column: str) -> "np.ndarray":
+        if column == "url":
+            return np.argsort(np.array(self.urls, dtype=str), kind="stable").argsort()
+        if column == "name":
+            # Same order as name COLLATE NOCASE: ASCII-folded, then by code point
+            return np.array([(name or "").translate(_NOCASE) for name in self.names], dtype=str)
+        return np.nan_to_num(self._column(_ORDER_COLUMNS[column]).astype(np.float64), nan=0.0)  # NULLs sort as 0
+
+    def _order(self, order_by: str) -> "np.ndarray":
+        """All rows in order_by order, ties broken by url in the same direction (as in SQL)."""
+        order = self._orders.get(order_by)
+        if order is None:
+            parts = order_by.split()
+            if len(parts) != 2 or parts[0] not in (*_ORDER_COLUMNS, "name", "url") or parts[1].upper() not in ("ASC", "DESC"):
+                parts = DEFAULT_ORDER.split()
+            column, direction = parts[0], parts[1].upper()
+            url_rank = self._sort_key("url")
+            order = url_rank.argsort() if column == "url" else np.lexsort((url_rank, self._sort_key(column)))
+            if direction == "DESC":
+                order = order[::-1]
+            self._orders[order_by] = order
+        return order
+
+    def query(self, filters: Optional[dict] = None, order_by: str = DEFAULT_ORDER) -> "np.ndarray":
+        """Row indices of matching games in order_by order ("column ASC|DESC" as for get_game_rows)."""
+        with self._lock:
+            mask = self.mask(filters)
+            order = self._order(order_by)
+            return order[mask[order]]
+
+    def top_k(self, k: int, filters: Optional[dict] = None, column: str = "my_rating") -> "np.ndarray":
+        """Row indices of the k matching games with the highest column value, best first (ties in any order)."""
+        with self._lock:
+            candidates = np.flatnonzero(self.mask(filters))
+            values = self._sort_key(column)[candidates]
+            if k < len(candidates):
+                best = np.argpartition(-values, k - 1)[:k]
+                candidates, values = candidates[best], values[best]
+            return candidates[np.argsort(-values, kind="stable")]
+
+    def index_of(self, url: str) -> Optional[int]:
+        return self._index.get(url)
+
+    def rows(self, indices: Iterable[int]) -> list[GameRow]:
+        """GameRows (the Database tab's row type) for row indices; sort_key is not set."""
+        def value(column: str, index: int):
+            number = self._numeric[column][index]
+            return None if np.isnan(number) else float(number)
+
+        with self._lock:
+            result = []
+            for index in indices:
+                index = int(index)
+                price = value("price", index)
+                discount = value("discount_percent", index)
+                result.append(GameRow(
+                    self.urls[index],
+                    self.names[index],
+                    None if price is None else str(int(price)),
+                    None if discount is None else int(discount),
+                    value("my_rating", index),
+                    value("bgg_rating", index),
+                    bool(self._flags["has_demonic_vibe"][index]),
+                    bool(self._flags["owned"][index]),
+                    None,
+                    self.images[index],
+                ))
+            return result
@@ -0,0 +1,212 @@
+"""Threaded producer/consumer pipeline with bounded queues between stages."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stage functions receive (item, emit) and call emit(output) zero or more times
+Emit = Callable[[Any], None]
+StageFunc = Callable[[Any, Emit], None]
+
+PIPELINE_QUEUE_SIZE = 64
+_POLL_SECONDS = 0.1
+_END = object()
+
+
+class PipelineCancelled(Exception):
+    """Raised inside stage threads once the pipeline is cancelled."""
+
+
+class Stage:
+    """A pipeline stage: `workers` threads apply func to items from a bounded inbox."""
+
+    def __init__(self, name: str, func: StageFunc, workers: int = 1,
+                 queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.inbox: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.emitted = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def stats(self, elapsed: float) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "processed": self.processed,
+                "emitted": self.emitted,
+                "queue_depth": self.inbox.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "per_second": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+                "busy_seconds": round(self.busy_seconds, 3),
+            }
+
+
+class Pipeline:
+    """
+    Run source -> stages -> output with one bounded queue in front of each stage.
+
+    source(emit) produces the initial items. Each stage's emit blocks while the
+    next queue is full, so backpressure propagates back to the source. Iterate
+    results() to consume the last stage's outputs as they are produced; leaving
+    the iteration early cancels the pipeline. The first exception raised by the
+    source or a stage cancels the pipeline and is re-raised from results().
+    on_cancel() is called when the pipeline is cancelled, to wake a source that
+    blocks on something other than emit().
+    """
+
+    def __init__(self, source: Callable[[Emit], None], stages: list[Stage],
+                 output_size: int = PIPELINE_QUEUE_SIZE, on_cancel: Optional[Callable[[], None]] = None):
+        self.source = source
+        self.stages = stages
+        self.on_cancel = on_cancel
+        self.output: queue.Queue = queue.Queue(maxsize=output_size)
+        self._cancelled = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._threads: list[threading.Thread] = []
+        self._started_at: Optional[float] = None
+        self.source_emitted = 0
+
+    def cancel(self) -> None:
+        """Stop all stages; blocked producers give up at their next poll."""
+        self._cancelled.set()
+        if self.on_cancel is not None:
+            self.on_cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def stats(self) -> dict:
+        """Per-stage throughput and queue depth (safe to call while running)."""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        result = {"source": {"emitted": self.source_emitted}}
+        for stage in self.stages:
+            result[stage.name] = stage.stats(elapsed)
+        result["output"] = {"queue_depth": self.output.qsize()}
+        return result
+
+    def _put(self, target: queue.Queue, item: Any, stage: Optional[Stage] = None) -> None:
+        """Blocking put that still notices cancellation."""
+        while True:
+            if self._cancelled.is_set():
+                raise PipelineCancelled()
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                continue
+        if stage is not None:
+            with stage._lock:
+                stage.max_queue_depth = max(stage.max_queue_depth, target.qsize())
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+        self.cancel()
+
+    def _downstream(self, index: int) -> tuple[queue.Queue, Optional[Stage]]:
+        """Queue (and owning stage) that stage `index` emits into; -1 is the source."""
+        if index + 1 < len(self.stages):
+            nxt = self.stages[index + 1]
+            return nxt.inbox, nxt
+        return self.output, None
+
+    def _run_source(self) -> None:
+        target, owner = self._downstream(-1)
+
+        def emit(item: Any) -> None:
+            self._put(target, item, owner)
+            self.source_emitted += 1
+
+        try:
+            self.source(emit)
+        except PipelineCancelled:
+            pass
+        except Exception as e:
+            logger.exception("Pipeline source failed: %s", e)
+            self._fail(e)
+        finally:
+            self._finish(-1)
+
+    def _run_worker(self, index: int, done: threading.Barrier) -> None:
+        stage = self.stages[index]
+        target, owner = self._downstream(index)
+
+        def emit(item: Any) -> None:
+            self._put(target, item, owner)
+            with stage._lock:
+                stage.emitted += 1
+
+        try:
+            while not self._cancelled.is_set():
+                try:
+                    item = stage.inbox.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+                if item is _END:
+                    break
+                started = time.perf_counter()
+                stage.func(item, emit)
+                with stage._lock:
+                    stage.processed += 1
+                    stage.busy_seconds += time.perf_counter() - started
+        except PipelineCancelled:
+            pass
+        except Exception as e:
+            logger.exception("Pipeline stage %s failed: %s", stage.name, e)
+            self._fail(e)
+        finally:
+            # The last worker of a stage to finish signals end-of-stream downstream
+            if done.wait() == 0:
+                self._finish(index)
+
+    def _finish(self, index: int) -> None:
+        """Send end-of-stream to whatever follows stage `index` (one marker per worker)."""
+        target, owner = self._downstream(index)
+        markers = owner.workers if owner is not None else 1
+        for _ in range(markers):
+            try:
+                self._put(target, _END)
+            except PipelineCancelled:
+                return
+
+    def results(self) -> Iterator[Any]:
+        """Start the pipeline and yield outputs of the last stage as they arrive."""
+        self._started_at = time.perf_counter()
+        self._threads = [threading.Thread(target=self._run_source, name="pipeline-source", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            done = threading.Barrier(stage.workers)
+            for n in range(stage.workers):
+                self._threads.append(threading.Thread(
+                    target=self._run_worker, args=(index, done),
+                    name=f"pipeline-{stage.name}-{n}", daemon=True,
+                ))
+        for thread in self._threads:
+            thread.start()
+
+        try:
+            while True:
+                try:
+                    item = self.output.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    if self._cancelled.is_set():
+                        break
+                    continue
+                if item is _END:
+                    break
+                yield item
+        finally:
+            # Normal end, early exit by the consumer or failure: stop and reap all threads
+            self.cancel()
+            for thread in self._threads:
+                thread.join()
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,83 @@
+"""Staleness-based selection of stored games to re-fetch (main.py refresh)."""
+
+import heapq
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import (
+    MIN_RATING_FOR_NOTIFICATION,
+    RATING_OUTSTANDING,
+    REFRESH_CHANGE_HALF_LIFE_DAYS,
+    REFRESH_PROXIMITY_SCALE,
+    REFRESH_STALE_DAYS,
+    REFRESH_VOLATILITY_CAP,
+    REFRESH_WEIGHTS,
+)
+from database import RefreshCandidate
+
+logger = logging.getLogger(__name__)
+
+
+def _days_since(value: Optional[str], now: datetime) -> Optional[float]:
+    """Days between a stored UTC ISO timestamp and now (None if missing or unparsable)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return max((now - parsed).total_seconds() / 86400, 0.0)
+
+
+def freshness_label(last_fetched_at: Optional[str], max_age_days: float, now: Optional[datetime] = None) -> str:
+    """Short age of stored game data for result lists ("today", "3d", "20d stale", "never")."""
+    days = _days_since(last_fetched_at, now or datetime.now(timezone.utc))
+    if days is None:
+        return "never"
+    label = "today" if days < 1 else f"{int(days)}d"
+    return f"{label} stale" if days > max_age_days else label
+
+
+def refresh_score(candidate: RefreshCandidate, now: Optional[datetime] = None) -> float:
+    """
+    How worthwhile re-fetching this game is now (higher first; 0 for just-fetched games).
+
+    Never-fetched rows count as fully stale; rows without a change timestamp
+    get no recent-change credit.
+    """
+    now = now or datetime.now(timezone.utc)
+    fetched_days = _days_since(candidate.last_fetched_at, now)
+    staleness = 1.0 if fetched_days is None else min(fetched_days / REFRESH_STALE_DAYS, 1.0)
+
+    rating = candidate.my_rating or 0.0
+    terms = {
+        "rating": min(max(rating, 0.0) / RATING_OUTSTANDING, 1.0),
+        "proximity": math.exp(-abs(rating - MIN_RATING_FOR_NOTIFICATION) / REFRESH_PROXIMITY_SCALE),
+        "volatility": min(candidate.price_changes / REFRESH_VOLATILITY_CAP, 1.0),
+        "recent_change": 0.0,
+    }
+    changed_days = _days_since(candidate.last_changed_at, now)
+    if changed_days is not None:
+        terms["recent_change"] = 0.5 ** (changed_days / REFRESH_CHANGE_HALF_LIFE_DAYS)
+    return staleness * sum(REFRESH_WEIGHTS[name] * value for name, value in terms.items())
+
+
+def select_for_refresh(
+    candidates: list[RefreshCandidate],
+    limit: int,
+    now: Optional[datetime] = None,
+) -> list[str]:
+    """URLs of the `limit` best-scoring candidates, best first (just-fetched games are skipped)."""
+    now = now or datetime.now(timezone.utc)
+    scored = ((refresh_score(candidate, now), candidate.url) for candidate in candidates)
+    best = heapq.nlargest(limit, (entry for entry in scored if entry[0] > 0))
+    if best:
+        logger.info(
+            "Refresh: %d/%d games selected (scores %.2f..%.2f)",
+            len(best), len(candidates), best[0][0], best[-1][0],
+        )
+    return [url for _, url in best]
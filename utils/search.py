@@ -1,24 +1,94 @@
+import copy
+import heapq
 import logging
-from typing import Callable, Optional
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 
 from bs4 import BeautifulSoup
 
-from config import BASE_URL, ENDPOINTS, FILTERS
-from database import game_exists, load_game, save_game
+from config import (
+    BASE_URL,
+    BUDGET_UNKNOWN_PRIOR,
+    CHECKPOINT_INTERVAL,
+    CRAWL_WORKERS,
+    DELTA_MAX_AGE_DAYS,
+    DISCOVERY_WORKERS,
+    ENDPOINTS,
+    FILTERS,
+    NEW_ARRIVALS_MAX_PAGES,
+    NEW_ARRIVALS_STOP_RUN,
+    NEW_ARRIVALS_SORT,
+    OFFLINE_ENDPOINT,
+    OFFLINE_FILTERS,
+    OFFLINE_REFRESH_LIMIT,
+    OFFLINE_TAG_NAMES,
+)
+from database import (
+    DEFAULT_BATCH_SIZE,
+    GameWriter,
+    KnownGame,
+    clear_checkpoint,
+    iter_games,
+    load_checkpoint,
+    load_games,
+    load_known_games,
+    mark_pages_rejected,
+    save_checkpoint,
+    save_game,
+)
 from model.board_game import BoardGame
+from utils.pipeline import Pipeline, Stage
+from utils.search_cache import SearchCache
 from website_caller import WebsiteCaller
 
 logger = logging.getLogger(__name__)
 
+_PAGE_IN_HREF = re.compile(r"strana-(\d+)")
 
-def search_for_game(
-    caller: WebsiteCaller,
-    filters: Optional[list[str]] = None,
-    pages: int = 1000,
-    endpoint: str = "shop",
-    progress_callback: Optional[Callable[..., None]] = None,
-) -> list[BoardGame]:
-    games_urls = []
+
+class ListingCard(NamedTuple):
+    """What a listing page shows about a product before its detail page is fetched."""
+
+    url: str
+    price: Optional[str]
+    discount_percent: Optional[int]
+
+
+def _parse_listing_card(product) -> ListingCard:
+    """Read URL, final price and discount badge from a listing product card."""
+    href = product.find("a").get("href")
+    price_el = product.find(class_="price-final")
+    discount_el = product.find(class_="price-save") or product.find(class_="flag-discount")
+    price = BoardGame._normalize_price(price_el.get_text().replace("\xa0", " ")) if price_el else None
+    discount = (
+        BoardGame._parse_discount_percent(discount_el.get_text().replace("\xa0", " "))
+        if discount_el else None
+    )
+    return ListingCard(href, price, discount)
+
+
+def _full_url(game_url: str) -> str:
+    """Listing hrefs are site-relative; sitemap URLs are already absolute."""
+    return game_url if game_url.startswith("http") else f"{BASE_URL}{game_url}"
+
+
+def _card_unchanged(card: Optional[ListingCard], existing: Optional[KnownGame], cutoff: str) -> bool:
+    """True when a listing card matches the stored row and that row is fresh enough to reuse."""
+    if card is None or existing is None or card.price is None or not existing.last_fetched_at:
+        return False
+    return (
+        card.price == existing.final_price
+        and (card.discount_percent or 0) == (existing.discount_percent or 0)
+        and existing.last_fetched_at >= cutoff
+    )
+
+
+def build_filter_query(filters: Optional[list[str]] = None) -> str:
+    """Build the listing query string for filter names ("cat:"/"mech:" prefixes supported)."""
     basic_filters = ["available", "games_only"]
     filters = basic_filters + (filters or [])
     mechanics="pv264="
@@ -43,90 +113,813 @@ def search_for_game(
         query += f"{categories[:-1]}&"
     if mechanics != "pv264=":
         query += f"{mechanics[:-1]}&"
-    query = query[:-1]
+    return query[:-1]
+
+
+def build_offline_filters(filters: Optional[list[str]] = None) -> dict:
+    """
+    Translate filter names (as for build_filter_query) into a database filters dict.
+
+    "cat:"/"mech:" tags are matched by name and, like the shop's filters, any
+    one tag of a kind is enough.
+    """
+    query: dict = {"categories": [], "mechanics": [], "match_all": False}
+    for filter_name in ["games_only"] + (filters or []):
+        if filter_name.startswith(("cat:", "mech:")):
+            kind, key = filter_name.split(":", 1)
+            if key not in OFFLINE_TAG_NAMES:
+                raise KeyError(f"Unknown {'category' if kind == 'cat' else 'mechanic'} filter: {filter_name}")
+            query["categories" if kind == "cat" else "mechanics"].append(OFFLINE_TAG_NAMES[key])
+        elif filter_name in OFFLINE_FILTERS:
+            query.update(OFFLINE_FILTERS[filter_name])
+        elif filter_name not in FILTERS:
+            raise KeyError(f"Unknown filter: {filter_name}")
+    return query
+
 
-    # Stage 1: Fetch pages
-    total_pages = 0
-    for i in range(1, pages + 1):
-        url = f"{BASE_URL}{ENDPOINTS[endpoint]}strana-{i}/?"
-        url += query
+def _listing_page_url(endpoint: str, page: int, query: str) -> str:
+    return f"{BASE_URL}{ENDPOINTS[endpoint]}strana-{page}/?{query}"
+
+
+def _parse_page_count(soup: BeautifulSoup) -> Optional[int]:
+    """Highest page number linked from the pagination widget, or None if there is none."""
+    pagination = soup.find(class_="pagination")
+    if not pagination:
+        return None
+    numbers = []
+    for link in pagination.find_all("a"):
+        text = link.get_text(strip=True)
+        if text.isdigit():
+            numbers.append(int(text))
+        match = _PAGE_IN_HREF.search(link.get("href") or "")
+        if match:
+            numbers.append(int(match.group(1)))
+    return max(numbers) if numbers else None
+
+
+def _parse_listing_page(html: str) -> tuple[Optional[list[ListingCard]], Optional[int]]:
+    """Return a listing page's cards (None past the last page) and its advertised page count."""
+    soup = BeautifulSoup(html, "html.parser")
+    products_div = soup.find("div", id="products")
+    if products_div is None:
+        return None, None
+    cards = [_parse_listing_card(product) for product in products_div.find_all("div", class_="product")]
+    return cards, _parse_page_count(soup)
+
+
+def iter_listing_pages(
+    caller: WebsiteCaller,
+    query: str,
+    endpoint: str = "shop",
+    pages: int = 1000,
+    progress_callback: Optional[Callable[..., None]] = None,
+    workers: int = DISCOVERY_WORKERS,
+    skip_pages: Optional[set[int]] = None,
+    cache: Optional[SearchCache] = None,
+) -> Iterator[tuple[int, list[ListingCard]]]:
+    """
+    Yield (page number, cards) for every listing page matching query, as soon as each page arrives.
+
+    The page count is read from the first page's pagination widget and the
+    remaining pages are fetched concurrently (yielded in completion order);
+    when later pages' widgets link further pages (truncated paginators), those
+    are fetched in another batch.
+    Without the widget, pages are probed sequentially until one has no product list.
+    Pages in skip_pages (already handled by a resumed crawl) are not yielded;
+    page 1 and each batch's last page are still fetched, for the page count. Parsed pages are reused
+    from cache when given.
+    """
+    skip_pages = skip_pages or set()
+
+    def fetch_page(page: int) -> tuple[Optional[list[ListingCard]], Optional[int]]:
+        if cache is not None:
+            cached = cache.get_listing(endpoint, query, page)
+            if cached is not None:
+                return cached
+        url = _listing_page_url(endpoint, page, query)
         logger.debug("Fetching page URL: %s", url)
-        html_resp = caller.get_text(url)
-        soup = BeautifulSoup(html_resp, "html.parser")
-        try:
-            games = soup.find("div", id="products").find_all("div", class_="product")
-        except AttributeError as e:
-            logger.debug("No more pages: %s", e)
-            break
-        games_urls.extend([game.find("a").get("href") for game in games])
-        total_pages = i
+        parsed = _parse_listing_page(caller.get_text(url))
+        if cache is not None:
+            cache.put_listing(endpoint, query, page, parsed)
+        return parsed
+
+    first_cards, page_count = fetch_page(1)
+    if first_cards is None:
+        logger.debug("No products on first page")
+        return
+    found = len(first_cards)
+
+    if page_count is not None:
+        total = min(page_count, pages)
+        if progress_callback:
+            progress_callback(stage="pages", current=1, total=total, message=f"Fetching page 1/{total}...")
+        if 1 not in skip_pages:
+            yield 1, first_cards
+        done = 1
+        first = 2
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discover") as executor:
+            while first <= total:
+                # The batch's last page is fetched even when skipped: its widget may link further pages
+                futures = {
+                    executor.submit(fetch_page, page): page
+                    for page in range(first, total + 1) if page not in skip_pages or page == total
+                }
+                first = total + 1
+                try:
+                    for future in as_completed(futures):
+                        done += 1
+                        page = futures[future]
+                        page_cards, later_count = future.result()
+                        if page_cards is None:
+                            logger.warning("Listing page %d has no products", page)
+                        if later_count is not None and later_count > total:
+                            # Truncated widgets (1 2 3 … next) only link a few pages past the current one
+                            total = min(later_count, pages)
+                        if progress_callback:
+                            progress_callback(stage="pages", current=done, total=total,
+                                              message=f"Fetching page {done}/{total}...")
+                        if page in skip_pages:
+                            continue
+                        found += len(page_cards or [])
+                        yield page, page_cards or []
+                finally:
+                    for future in futures:
+                        future.cancel()
+        total_pages = total
+    else:
         if progress_callback:
-            progress_callback(stage="pages", current=i, total=None, message=f"Fetching page {i}...")
+            progress_callback(stage="pages", current=1, total=None, message="Fetching page 1...")
+        if 1 not in skip_pages:
+            yield 1, first_cards
+        total_pages = 1
+        for i in range(2, pages + 1):
+            if i in skip_pages:
+                total_pages = i
+                continue
+            page_cards, _ = fetch_page(i)
+            if page_cards is None:
+                logger.debug("No more pages after page %d", i - 1)
+                break
+            found += len(page_cards)
+            total_pages = i
+            if progress_callback:
+                progress_callback(stage="pages", current=i, total=None, message=f"Fetching page {i}...")
+            yield i, page_cards
 
-    # After stage 1, we know how many games to fetch
-    total_games = len(games_urls)
     if progress_callback:
         progress_callback(stage="pages_complete", current=total_pages, total=total_pages,
-                         message=f"Found {total_games} games. Starting to fetch game data...")
+                         message=f"Found {found} games.")
 
-    games = games_standings(games_urls, caller, progress_callback=progress_callback, total_games=total_games)
-    return games
 
-def games_standings(
-    games_urls: list[str],
+def discover_listing(
     caller: WebsiteCaller,
+    query: str,
+    endpoint: str = "shop",
+    pages: int = 1000,
     progress_callback: Optional[Callable[..., None]] = None,
-    total_games: Optional[int] = None,
-) -> list[BoardGame]:
-    games = []
-    total_games = total_games or len(games_urls)
+    workers: int = DISCOVERY_WORKERS,
+) -> list[ListingCard]:
+    """Collect the listing cards of every page matching query, in page order."""
+    by_page = dict(iter_listing_pages(caller, query, endpoint, pages, progress_callback, workers))
+    return [card for page in sorted(by_page) for card in by_page[page]]
+
 
-    for idx, game_url in enumerate(games_urls, 1):
-        full_url = f"{BASE_URL}{game_url}"
-        logger.debug("Fetching game: %s", full_url)
+def discover_new_arrivals(
+    caller: WebsiteCaller,
+    known_urls: set[str],
+    endpoint: str = "shop",
+    stop_run: int = NEW_ARRIVALS_STOP_RUN,
+    max_pages: int = NEW_ARRIVALS_MAX_PAGES,
+    stats: Optional[dict] = None,
+) -> list[str]:
+    """
+    Walk the listing newest-first and return full URLs of products not in known_urls.
+
+    Stops at the first run of stop_run consecutive known products (everything
+    older is assumed known), at the last page, or after max_pages pages.
+    Counters are added to stats when given.
+    """
+    stats = stats if stats is not None else {}
+    query = f"{build_filter_query()}&{NEW_ARRIVALS_SORT}"
+    new_urls: list[str] = []
+    run = 0
+    pages_read = 0
+    for page in range(1, max_pages + 1):
+        url = _listing_page_url(endpoint, page, query)
+        logger.debug("Fetching new arrivals page: %s", url)
+        cards, page_count = _parse_listing_page(caller.get_text(url))
+        if cards is None:
+            break
+        pages_read = page
+        for card in cards:
+            full_url = _full_url(card.url)
+            if full_url in known_urls:
+                run += 1
+                if run >= stop_run:
+                    break
+            else:
+                run = 0
+                if full_url not in new_urls:
+                    new_urls.append(full_url)
+        if run >= stop_run or (page_count is not None and page >= page_count):
+            break
+    stats["new_arrival_pages"] = pages_read
+    stats["new_arrivals"] = len(new_urls)
+    logger.info("New arrivals: %d new products in %d listing pages", len(new_urls), pages_read)
+    return new_urls
+
+
+class _CrawlItem:
+    """A product moving through the crawl pipeline."""
+
+    __slots__ = ("url", "existing", "html", "game", "reused", "rejected", "from_cache")
+
+    def __init__(self, url: str, existing: Optional[KnownGame] = None, game: Optional[BoardGame] = None):
+        self.url = url
+        self.existing = existing
+        self.html: Optional[str] = None
+        self.game = game
+        self.reused = game is not None
+        self.rejected = False  # fetched, but the page is not a game
+        self.from_cache = False  # parsed earlier in the session; already saved and cached
+
+
+def _make_items(
+    game_urls: list[str],
+    known: dict[str, KnownGame],
+    stats: dict,
+    cards: Optional[dict[str, ListingCard]] = None,
+    cutoff: Optional[str] = None,
+) -> list[_CrawlItem]:
+    """
+    Turn discovered URLs into crawl items, attaching known state and, in delta
+    mode (cards and cutoff given), stored games whose listing card is unchanged.
+    """
+    full_urls = [_full_url(game_url) for game_url in game_urls]
+    reusable: dict[str, BoardGame] = {}
+    if cards is not None and cutoff is not None:
+        reusable = load_games([
+            full_url for game_url, full_url in zip(game_urls, full_urls)
+            if _card_unchanged(cards.get(game_url), known.get(full_url), cutoff)
+        ])
+        stats["fetches_skipped"] = stats.get("fetches_skipped", 0) + len(reusable)
+
+    items = []
+    for full_url in full_urls:
+        existing = known.get(full_url)
+        if existing:
+            stats["known_games"] = stats.get("known_games", 0) + 1
+        # Previously game_exists() for every game plus load_game() for known ones
+        stats["db_queries_avoided"] = stats.get("db_queries_avoided", 0) + (2 if existing else 1)
+        items.append(_CrawlItem(full_url, existing, reusable.get(full_url)))
+    stats["discovered"] = stats.get("discovered", 0) + len(items)
+    return items
+
+
+def _crawl_stages(
+    caller: WebsiteCaller,
+    save: Callable[[BoardGame], None],
+    budget: Optional["CrawlBudget"] = None,
+    cache: Optional[SearchCache] = None,
+) -> list[Stage]:
+    """
+    fetch -> parse -> rate -> persist stages; reused items pass straight through.
 
-        if game_exists(full_url):
-            # Always re-fetch game data to get latest price and other updated information
-            # But preserve user-set boolean values (owned, has_demonic_vibe)
-            existing_game = load_game(full_url)
-            preserved_owned = getattr(existing_game, 'owned', False) if existing_game else False
-            preserved_evil = getattr(existing_game, 'has_demonic_vibe', False) if existing_game else False
+    With a cache, games parsed earlier in the session skip fetch and parse
+    (they are still re-rated with current flags). Only freshly fetched games
+    are saved and put back in the cache, so cached pages still expire.
+    """
 
-            game_data = caller.get_text(full_url)
+    def fetch(item: _CrawlItem, emit) -> None:
+        if not item.reused:
+            if cache is not None:
+                item.game = cache.get_game(item.url)
+                if item.game is not None:
+                    item.from_cache = True
+                    if budget is not None:
+                        budget.refund_request()
+                    emit(item)
+                    return
+            if budget is not None and budget.out_of_time():
+                # Drop queued work once the clock runs out instead of overrunning it
+                budget.refund_request()
+                return
+            logger.debug("Fetching game: %s", item.url)
             try:
-                board_game = BoardGame(game_data, full_url)
-                # Preserve the boolean values that users set
-                board_game.owned = preserved_owned
-                board_game.has_demonic_vibe = preserved_evil
-            except ValueError as e:
-                logger.warning("Error parsing game data for %s: %s", full_url, e)
-                if progress_callback:
-                    progress_callback(stage="games", current=idx, total=total_games,
-                                     message=f"Fetching game {idx}/{total_games}...")
-                continue
-            save_game(board_game)
-        else:
-            game_data = caller.get_text(full_url)
+                item.html = caller.get_text(item.url)
+            except BaseException:
+                if budget is not None:
+                    budget.refund_request()
+                raise
+            if budget is not None:
+                budget.complete_request()
+        emit(item)
+
+    def parse(item: _CrawlItem, emit) -> None:
+        if not item.reused and item.game is None:
+            game = BoardGame(html_page_data=None, url=item.url, skip_html_parsing=True)
             try:
-                board_game = BoardGame(game_data, full_url)
+                game.from_html(item.html)
+                item.game = game
             except ValueError as e:
-                logger.warning("Error parsing game data for %s: %s", full_url, e)
-                if progress_callback:
-                    progress_callback(stage="games", current=idx, total=total_games,
-                                     message=f"Fetching game {idx}/{total_games}...")
-                continue
-            board_game.rate()
-            save_game(board_game)
+                logger.warning("Error parsing game data for %s: %s", item.url, e)
+                item.rejected = True
+            item.html = None
+        emit(item)
 
-        games.append(board_game)
+    def rate(item: _CrawlItem, emit) -> None:
+        if not item.reused and item.game is not None:
+            # Always re-fetched for the latest price, but user-set flags are preserved
+            if item.existing:
+                item.game.owned = item.existing.owned
+                item.game.has_demonic_vibe = item.existing.has_demonic_vibe
+            item.game.rate()
+        emit(item)
 
-        if progress_callback:
-            progress_callback(stage="games", current=idx, total=total_games,
-                             message=f"Fetching game {idx}/{total_games}...")
+    def persist(item: _CrawlItem, emit) -> None:
+        if not item.reused and not item.from_cache and item.game is not None:
+            save(item.game)
+            if cache is not None:
+                cache.put_game(item.game)
+        emit(item)
+
+    return [
+        Stage("fetch", fetch, CRAWL_WORKERS["fetch"]),
+        Stage("parse", parse, CRAWL_WORKERS["parse"]),
+        Stage("rate", rate, CRAWL_WORKERS["rate"]),
+        Stage("persist", persist, CRAWL_WORKERS["persist"]),
+    ]
+
+
+def _run_crawl(
+    produce: Callable[[Callable[[_CrawlItem], None]], None],
+    caller: WebsiteCaller,
+    save: Callable[[BoardGame], None],
+    stats: dict,
+    progress_callback: Optional[Callable[..., None]] = None,
+    total_games: Optional[int] = None,
+    budget: Optional["CrawlBudget"] = None,
+    cache: Optional[SearchCache] = None,
+) -> Iterator[BoardGame]:
+    """Run the crawl pipeline over the items produce(emit) emits, yielding games as they finish."""
+    pipeline = Pipeline(produce, _crawl_stages(caller, save, budget, cache),
+                        on_cancel=budget.cancel if budget is not None else None)
+    done = 0
+    rejected: list[str] = []
+    try:
+        for item in pipeline.results():
+            done += 1
+            if item.rejected:
+                rejected.append(item.url)
+            if progress_callback:
+                total = total_games or stats.get("discovered") or done
+                progress_callback(stage="games", current=done, total=total,
+                                  message=f"Fetching game {done}/{total}...")
+            if item.game is not None:
+                yield item.game
+    finally:
+        stats["pipeline"] = pipeline.stats()
+        if rejected:
+            # Remembered so sitemap syncs do not fetch these non-game pages again
+            mark_pages_rejected(rejected)
+            stats["pages_rejected"] = len(rejected)
+        if cache is not None:
+            stats["cache"] = cache.stats()
+        skipped = stats.get("fetches_skipped")
+        if skipped is not None and stats.get("discovered"):
+            stats["fetch_skip_rate"] = round(skipped / stats["discovered"], 3)
+            logger.info(
+                "Delta crawl: skipped %d/%d detail fetches (%.0f%%)",
+                skipped, stats["discovered"], stats["fetch_skip_rate"] * 100,
+            )
+
+
+def _delta_cutoff(max_age_days: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat(timespec="seconds")
+
+
+class _CheckpointTracker:
+    """Collect crawl progress and save it to the checkpoint every CHECKPOINT_INTERVAL games."""
+
+    def __init__(self, crawl_key: str, before_save: Callable[[], None], interval: int = CHECKPOINT_INTERVAL):
+        self.crawl_key = crawl_key
+        self.before_save = before_save
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pages: list[int] = []
+        self._discovered: list[str] = []
+        self._completed: list[str] = []
+
+    def page_done(self, page: int, urls: list[str]) -> None:
+        with self._lock:
+            self._pages.append(page)
+            self._discovered.extend(urls)
+
+    def completed(self, url: str) -> None:
+        with self._lock:
+            self._completed.append(url)
+            due = len(self._completed) >= self.interval
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        # Completed games must be on disk before they are marked completed
+        self.before_save()
+        with self._lock:
+            pages, discovered, completed = self._pages, self._discovered, self._completed
+            self._pages, self._discovered, self._completed = [], [], []
+        save_checkpoint(self.crawl_key, pages, discovered, completed)
 
+
+def crawl_key(endpoint: str, query: str) -> str:
+    """Checkpoint key of a listing crawl."""
+    return f"{endpoint}:{query}"
+
+
+def iter_search(
+    caller: WebsiteCaller,
+    filters: Optional[list[str]] = None,
+    pages: int = 1000,
+    endpoint: str = "shop",
+    progress_callback: Optional[Callable[..., None]] = None,
+    delta: bool = False,
+    resume: bool = False,
+    cache: Optional[SearchCache] = None,
+) -> Iterator[BoardGame]:
+    """
+    Search the shop listing with filters and yield each game as soon as it is rated.
+
+    Games arrive in crawl order, not by rating; every game is also saved.
+    Discovery and detail fetching overlap: each listing page feeds the
+    fetch -> parse -> rate -> persist pipeline as soon as it arrives.
+    With delta=True, detail pages are only fetched for new URLs, games whose
+    listing price/discount changed, or rows older than DELTA_MAX_AGE_DAYS;
+    the rest are loaded from the database. Closing the generator early stops the crawl.
+
+    Progress is checkpointed to the database while crawling and cleared when
+    the crawl finishes. With resume=True, an interrupted crawl with the same
+    endpoint and filters continues from its checkpoint: finished pages are not
+    re-listed and completed games are loaded from the database.
+
+    A SearchCache shared between searches (e.g. one per GUI window) lets
+    repeated or overlapping searches reuse listing and product pages.
+
+    The "offline" endpoint searches games.db instead (see iter_offline_search).
+    """
+    if endpoint == OFFLINE_ENDPOINT:
+        yield from iter_offline_search(caller, filters, progress_callback, cache=cache)
+        return
+    query = build_filter_query(filters)
+    key = crawl_key(endpoint, query)
+    checkpoint = load_checkpoint(key) if resume else None
+    if checkpoint is None:
+        clear_checkpoint(key)
+    else:
+        logger.info(
+            "Resuming crawl %s: %d pages, %d/%d games already done",
+            key, len(checkpoint.pages_done), len(checkpoint.completed), len(checkpoint.discovered),
+        )
+    known = load_known_games()
+    cutoff = _delta_cutoff(DELTA_MAX_AGE_DAYS) if delta else None
+    stats: dict = {}
+
+    def produce(emit) -> None:
+        seen: set[str] = set()
+        if checkpoint is not None:
+            seen.update(checkpoint.discovered)
+            done = load_games([url for url in checkpoint.discovered if url in checkpoint.completed])
+            stats["resumed_completed"] = len(done)
+            stats["discovered"] = len(checkpoint.discovered)
+            for url in checkpoint.discovered:
+                emit(_CrawlItem(url, known.get(url), done.get(url)))
+        for page, page_cards in iter_listing_pages(
+            caller, query, endpoint=endpoint, pages=pages, progress_callback=progress_callback,
+            skip_pages=checkpoint.pages_done if checkpoint else None, cache=cache,
+        ):
+            page_cards = [card for card in page_cards if _full_url(card.url) not in seen]
+            cards = {card.url: card for card in page_cards}
+            items = _make_items(list(cards), known, stats, cards, cutoff)
+            seen.update(item.url for item in items)
+            tracker.page_done(page, [item.url for item in items])
+            for item in items:
+                emit(item)
+
+    # Persist through a write-behind queue; leaving the block is the flush/close barrier
+    with GameWriter() as writer:
+        tracker = _CheckpointTracker(key, writer.flush)
+        try:
+            for game in _run_crawl(produce, caller, writer.put, stats, progress_callback, cache=cache):
+                tracker.completed(game.url)
+                yield game
+        except BaseException:
+            # Failed or abandoned: keep what was done for --resume
+            tracker.save()
+            raise
+        finally:
+            logger.info("Crawl stats: %s", stats)
+    clear_checkpoint(key)
+    logger.info("Persistence stats: %s", writer.stats())
+
+
+def iter_offline_search(
+    caller: Optional[WebsiteCaller],
+    filters: Optional[list[str]] = None,
+    progress_callback: Optional[Callable[..., None]] = None,
+    max_age_days: float = DELTA_MAX_AGE_DAYS,
+    refresh_limit: int = OFFLINE_REFRESH_LIMIT,
+    cache: Optional[SearchCache] = None,
+    stats: Optional[dict] = None,
+) -> Iterator[BoardGame]:
+    """
+    Evaluate filters against games.db and yield matching games.
+
+    Matches fetched within max_age_days are yielded first, straight from the
+    database and best rated first. Of the stale ones, the best rated
+    refresh_limit are re-fetched live (when a caller is given); then all stale
+    matches are yielded as now stored, so refreshed games that stopped matching
+    are left out. last_fetched_at tells how fresh each game is.
+    """
+    stats = stats if stats is not None else {}
+    query = build_offline_filters(filters)
+    cutoff = _delta_cutoff(max_age_days)
+    stale: list[str] = []
+    fresh = 0
+    for game in iter_games(filters=query):
+        if game.last_fetched_at and game.last_fetched_at >= cutoff:
+            fresh += 1
+            yield game
+        else:
+            stale.append(game.url)
+    refresh = stale[:refresh_limit] if caller is not None else []
+    stats.update(offline_fresh=fresh, offline_stale=len(stale), offline_refreshed=len(refresh))
+    if progress_callback:
+        progress_callback(stage="pages_complete", current=1, total=1,
+                          message=f"{fresh + len(stale)} local matches, refreshing {len(refresh)} stale...")
+
+    if refresh:
+        known = load_known_games()
+
+        def produce(emit) -> None:
+            for item in _make_items(refresh, known, stats):
+                emit(item)
+
+        with GameWriter() as writer:
+            for _ in _run_crawl(produce, caller, writer.put, stats, progress_callback, len(refresh), cache=cache):
+                pass
+    # Stale matches as now stored: refreshed rows may no longer match, failed fetches keep their old data
+    for start in range(0, len(stale), DEFAULT_BATCH_SIZE):
+        yield from iter_games(filters={**query, "urls": stale[start:start + DEFAULT_BATCH_SIZE]})
+    logger.info("Offline search stats: %s", stats)
+
+
+def search_for_game(
+    caller: WebsiteCaller,
+    filters: Optional[list[str]] = None,
+    pages: int = 1000,
+    endpoint: str = "shop",
+    progress_callback: Optional[Callable[..., None]] = None,
+    delta: bool = False,
+    resume: bool = False,
+    cache: Optional[SearchCache] = None,
+) -> list[BoardGame]:
+    """Search, fetch, rate and save every game found (see iter_search); best rated first."""
+    games = list(iter_search(caller, filters, pages, endpoint, progress_callback, delta, resume, cache))
+    games.sort(key=lambda x: x.my_rating, reverse=True)
+    return games
+
+
+class CrawlBudget:
+    """
+    Wall-clock and/or detail-request limit for a crawl (None means unlimited).
+
+    The clock starts with start() and includes listing discovery; only detail
+    page fetches count against the request limit. A fetch is reserved with
+    take_request() when it is queued and charged by complete_request() once
+    the page arrives; refund_request() returns the reservation of a fetch that
+    failed or was dropped, so only completed fetches use up the budget.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, requests: Optional[int] = None):
+        self.seconds = seconds
+        self.requests = requests
+        self.used_requests = 0
+        self._reserved = 0
+        self._cancelled = False
+        self._started_at: Optional[float] = None
+        self._settled = threading.Condition()
+
+    def start(self) -> "CrawlBudget":
+        self._started_at = time.monotonic()
+        return self
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started_at if self._started_at is not None else 0.0
+
+    def out_of_time(self) -> bool:
+        return self.seconds is not None and self.elapsed >= self.seconds
+
+    def _remaining_seconds(self) -> Optional[float]:
+        return max(0.0, self.seconds - self.elapsed) if self.seconds is not None else None
+
+    def take_request(self) -> bool:
+        """
+        Reserve one detail fetch; False once either limit is reached or after cancel().
+
+        While the rest of the request limit is reserved by fetches in flight,
+        waits for them: a refunded one frees its request for this caller.
+        """
+        with self._settled:
+            while not self._cancelled and not self.out_of_time():
+                if self.requests is None or self.used_requests + self._reserved < self.requests:
+                    self._reserved += 1
+                    return True
+                if self.used_requests >= self.requests:
+                    break
+                self._settled.wait(self._remaining_seconds())
+            return False
+
+    def complete_request(self) -> None:
+        """Charge a reserved fetch whose page arrived."""
+        with self._settled:
+            self._reserved -= 1
+            self.used_requests += 1
+            self._settled.notify_all()
+
+    def refund_request(self) -> None:
+        """Return the reservation of a fetch that failed or was not made."""
+        with self._settled:
+            self._reserved -= 1
+            self._settled.notify_all()
+
+    def cancel(self) -> None:
+        """Stop handing out requests (the crawl ended); wakes a waiting take_request()."""
+        with self._settled:
+            self._cancelled = True
+            self._settled.notify_all()
+
+
+def _prior_score(card: ListingCard, existing: Optional[KnownGame], stored: Optional[BoardGame]) -> float:
+    """
+    Cheap estimate of a game's rating before its detail page is fetched.
+
+    Known games are re-rated from their stored data with the card's current
+    price/discount; unknown games get the price/discount part of the rating
+    plus BUDGET_UNKNOWN_PRIOR. Owned and evil games go last.
+    """
+    if existing is not None and (existing.owned or existing.has_demonic_vibe):
+        return float("-inf")
+    game = copy.copy(stored) if stored is not None else BoardGame(html_page_data=None, url=card.url,
+                                                                  skip_html_parsing=True)
+    if card.price is not None:
+        game.final_price = card.price
+        game.discount_percent = card.discount_percent
+    score = game.rate()
+    return score if stored is not None else score + BUDGET_UNKNOWN_PRIOR
+
+
+def iter_budgeted_search(
+    caller: WebsiteCaller,
+    budget: CrawlBudget,
+    filters: Optional[list[str]] = None,
+    endpoint: str = "shop",
+    progress_callback: Optional[Callable[..., None]] = None,
+    delta: bool = False,
+    stats: Optional[dict] = None,
+) -> Iterator[BoardGame]:
+    """
+    Like iter_search, but crawl detail pages best-prior-first until budget runs out.
+
+    The whole listing is discovered first so fetches can be ordered by
+    _prior_score. Games reused in delta mode cost no requests. Coverage of the
+    discovered catalog is logged and added to stats.
+    """
+    stats = stats if stats is not None else {}
+    budget.start()
+    cards = {card.url: card for card in discover_listing(
+        caller, build_filter_query(filters), endpoint=endpoint, progress_callback=progress_callback,
+    )}
+    known = load_known_games()
+    cutoff = _delta_cutoff(DELTA_MAX_AGE_DAYS) if delta else None
+    items = _make_items(list(cards), known, stats, cards, cutoff)
+    stored = load_games([item.url for item in items if item.existing and not item.reused])
+    card_by_full_url = {_full_url(url): card for url, card in cards.items()}
+    priors = {
+        item.url: _prior_score(card_by_full_url[item.url], item.existing, stored.get(item.url))
+        for item in items
+    }
+    items.sort(key=lambda item: priors[item.url], reverse=True)
+
+    def produce(emit) -> None:
+        for item in items:
+            if not item.reused and not budget.take_request():
+                break
+            emit(item)
+
+    covered = 0
+    with GameWriter() as writer:
+        try:
+            for game in _run_crawl(produce, caller, writer.put, stats, progress_callback, len(items), budget):
+                covered += 1
+                yield game
+        finally:
+            stats["budget_covered"] = covered
+            stats["budget_requests"] = budget.used_requests
+            stats["budget_coverage"] = round(covered / len(items), 3) if items else 1.0
+            logger.info(
+                "Budgeted crawl covered %d/%d games (%.0f%%) with %d requests in %.1fs",
+                covered, len(items), stats["budget_coverage"] * 100, budget.used_requests, budget.elapsed,
+            )
+    logger.info("Persistence stats: %s", writer.stats())
+
+
+class TopK:
+    """
+    Keep the k best games seen so far (by key, default my_rating) in a min-heap.
+
+    Memory stays at k games however many are added. Games rejected by the
+    optional predicate are not kept but are counted as seen.
+    """
+
+    def __init__(
+        self,
+        k: int,
+        key: Callable[[BoardGame], float] = lambda game: game.my_rating,
+        predicate: Optional[Callable[[BoardGame], bool]] = None,
+    ):
+        self.k = k
+        self.key = key
+        self.predicate = predicate
+        self.seen = 0
+        self.accepted = 0
+        # (key, insertion order, game); the counter breaks ties without comparing games
+        self._heap: list[tuple[float, int, BoardGame]] = []
+
+    def add(self, game: BoardGame) -> bool:
+        """Offer a game; return True if it is currently among the best k."""
+        self.seen += 1
+        if self.predicate is not None and not self.predicate(game):
+            return False
+        self.accepted += 1
+        entry = (self.key(game), self.accepted, game)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if self.k and entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def extend(self, games: Iterable[BoardGame]) -> "TopK":
+        for game in games:
+            self.add(game)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def best(self) -> list[BoardGame]:
+        """The kept games, best first (earlier arrivals first among equal keys)."""
+        return [game for _, _, game in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+
+def games_standings(
+    games_urls: list[str],
+    caller: WebsiteCaller,
+    progress_callback: Optional[Callable[..., None]] = None,
+    total_games: Optional[int] = None,
+    writer: Optional[GameWriter] = None,
+    known: Optional[dict[str, KnownGame]] = None,
+    stats: Optional[dict] = None,
+    cards: Optional[dict[str, ListingCard]] = None,
+    max_age_days: float = DELTA_MAX_AGE_DAYS,
+) -> list[BoardGame]:
+    """
+    Fetch, rate and save each game; saves go through writer when given.
+
+    known is the prefetched URL -> KnownGame map (loaded here when omitted) used
+    to carry over user flags without per-game DB queries. Passing the listing
+    cards enables delta mode: games whose card matches a row fetched within
+    max_age_days are loaded from the database instead of re-fetched. Counters
+    are added to stats when given.
+    """
+    if known is None:
+        known = load_known_games()
+    stats = stats if stats is not None else {}
+    cutoff = _delta_cutoff(max_age_days) if cards is not None else None
+
+    def produce(emit) -> None:
+        for item in _make_items(games_urls, known, stats, cards, cutoff):
+            emit(item)
+
+    save = writer.put if writer else save_game
+    games = list(_run_crawl(
+        produce, caller, save, stats, progress_callback, total_games or len(games_urls),
+    ))
     games.sort(key=lambda x: x.my_rating, reverse=True)
     return games
 
+
 def present_results(games: list[BoardGame]) -> None:
     """Print search results to stdout (CLI output)."""
     print("--------------------------------")
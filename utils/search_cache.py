@@ -0,0 +1,93 @@
+"""Per-session memo of parsed product pages and listing pages, shared by repeated searches."""
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from config import SEARCH_CACHE_TTL_SECONDS, to_czk_game_url
+from model.board_game import BoardGame
+
+
+def canonical_product_url(url: str) -> str:
+    """Cache key of a product page: Czech URL without query, fragment or trailing slash."""
+    return to_czk_game_url(url).split("#", 1)[0].split("?", 1)[0].rstrip("/")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Order-independent form of a listing query string.
+
+    Parameters are sorted, and so are the comma-separated values of
+    multi-value parameters (pv258=b,a and pv258=a,b are the same listing).
+    """
+    params = [
+        (key, ",".join(sorted(value.split(","))))
+        for key, value in parse_qsl(query, keep_blank_values=True)
+    ]
+    return urlencode(sorted(params), safe=",")
+
+
+class SearchCache:
+    """
+    Thread-safe TTL memo for one session (e.g. one GUI window).
+
+    Parsed games are keyed by canonical product URL; listing pages by endpoint,
+    normalized query and page number. Entries older than ttl_seconds are
+    ignored and dropped. Games are copied in and out so callers can re-rate
+    or flag them without touching the cached copy.
+    """
+
+    def __init__(self, ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._games: dict[str, tuple[float, BoardGame]] = {}
+        self._listings: dict[tuple[str, str, int], tuple[float, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, store: dict, key) -> Optional[Any]:
+        with self._lock:
+            entry = store.get(key)
+            if entry is not None and self._clock() - entry[0] > self.ttl_seconds:
+                del store[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, store: dict, key, value: Any) -> None:
+        with self._lock:
+            store[key] = (self._clock(), value)
+
+    def get_game(self, url: str) -> Optional[BoardGame]:
+        game = self._get(self._games, canonical_product_url(url))
+        return copy.copy(game) if game is not None else None
+
+    def put_game(self, game: BoardGame) -> None:
+        self._put(self._games, canonical_product_url(game.url), copy.copy(game))
+
+    def get_listing(self, endpoint: str, query: str, page: int) -> Optional[Any]:
+        return self._get(self._listings, (endpoint, normalize_query(query), page))
+
+    def put_listing(self, endpoint: str, query: str, page: int, value: Any) -> None:
+        self._put(self._listings, (endpoint, normalize_query(query), page), value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._games.clear()
+            self._listings.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "games": len(self._games),
+                "listing_pages": len(self._listings),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,127 @@
+"""Catalog discovery from the shop's XML sitemaps (whole shop, not just filtered listings)."""
+
+import gzip
+import logging
+import xml.etree.ElementTree as ET
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Iterator, NamedTuple, Optional
+
+from config import BASE_URL, SITEMAP_PRODUCT_HINT, SITEMAP_URL, to_czk_game_url
+from database import KnownGame
+from website_caller import WebsiteCaller
+
+logger = logging.getLogger(__name__)
+
+
+class SitemapEntry(NamedTuple):
+    url: str
+    lastmod: Optional[str]
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag ('{ns}url' -> 'url')."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _iter_sitemap_file(caller: WebsiteCaller, url: str) -> Iterator[tuple[str, SitemapEntry]]:
+    """
+    Stream one sitemap file, yielding ("sitemap", entry) for index children and
+    ("url", entry) for pages. Elements are cleared as they are consumed, so memory
+    stays flat for large sitemaps.
+    """
+    with closing(caller.get_stream(url)) as response:
+        source = gzip.GzipFile(fileobj=response.raw) if url.endswith(".gz") else response.raw
+        for _, elem in ET.iterparse(source, events=("end",)):
+            kind = _local_name(elem.tag)
+            if kind not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in elem:
+                name = _local_name(child.tag)
+                if name == "loc":
+                    loc = (child.text or "").strip()
+                elif name == "lastmod":
+                    lastmod = (child.text or "").strip() or None
+            elem.clear()
+            if loc:
+                yield kind, SitemapEntry(loc, lastmod)
+
+
+def iter_sitemap_entries(caller: WebsiteCaller, sitemap_url: str = SITEMAP_URL) -> Iterator[SitemapEntry]:
+    """Yield page entries of a sitemap, following a sitemap index to its (product) children."""
+    children = []
+    for kind, entry in _iter_sitemap_file(caller, sitemap_url):
+        if kind == "url":
+            yield entry
+        else:
+            children.append(entry)
+    if not children:
+        return
+    product_children = [c for c in children if SITEMAP_PRODUCT_HINT in c.url]
+    for child in product_children or children:
+        logger.debug("Reading child sitemap: %s", child.url)
+        yield from iter_sitemap_entries(caller, child.url)
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    """Parse a W3C datetime (date-only values count as UTC midnight)."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _needs_fetch(entry: SitemapEntry, fetched_at: Optional[str]) -> bool:
+    """Never-fetched pages are always queued; others only when lastmod is newer than our fetch."""
+    if not fetched_at:
+        return True
+    if not entry.lastmod:
+        return False
+    lastmod = _parse_timestamp(entry.lastmod)
+    fetched = _parse_timestamp(fetched_at)
+    return lastmod is None or fetched is None or lastmod > fetched
+
+
+def discover_from_sitemap(
+    caller: WebsiteCaller,
+    known: dict[str, KnownGame],
+    sitemap_url: str = SITEMAP_URL,
+    stats: Optional[dict] = None,
+    rejected: Optional[dict[str, str]] = None,
+) -> list[str]:
+    """
+    Return full URLs of shop pages that are new or changed since we last fetched them.
+
+    rejected maps pages fetched earlier that were not games (categories,
+    articles; see database.load_rejected_pages) to when that was found; they
+    count as fetched then, so they are only retried once their lastmod is
+    newer. Entries outside BASE_URL are ignored and English URLs are mapped to
+    their Czech (CZK) equivalents. Counters are added to stats when given.
+    """
+    stats = stats if stats is not None else {}
+    rejected = rejected or {}
+    queued: dict[str, None] = {}
+    seen = skipped_rejected = 0
+    for entry in iter_sitemap_entries(caller, sitemap_url):
+        if not entry.url.startswith(BASE_URL):
+            continue
+        url = to_czk_game_url(entry.url)
+        seen += 1
+        if url in queued:
+            continue
+        existing = known.get(url)
+        if existing is not None:
+            fetched_at = existing.last_fetched_at
+        else:
+            fetched_at = rejected.get(url)
+        if _needs_fetch(entry, fetched_at):
+            queued[url] = None
+        elif existing is None:
+            skipped_rejected += 1
+    stats["sitemap_entries"] = seen
+    stats["sitemap_queued"] = len(queued)
+    stats["sitemap_rejected_skipped"] = skipped_rejected
+    logger.info("Sitemap: %d entries, %d new or changed", seen, len(queued))
+    return list(queued)
@@ -4,9 +4,10 @@ Website Caller Utility
 A simple utility class for making HTTP requests to websites.
 """
 
+import importlib.util
 import logging
 import time
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from urllib.parse import urlparse
 
 import requests
@@ -22,11 +23,11 @@ RETRY_EXCEPTIONS = (
     requests.exceptions.ChunkedEncodingError,
 )
 
-try:
-    from playwright.sync_api import sync_playwright, Browser, BrowserContext
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+# Playwright is only imported when a caller with use_browser=True is created
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext
 
 
 class WebsiteCaller:
@@ -51,14 +52,16 @@ class WebsiteCaller:
 
         # Browser automation setup
         self._playwright = None
-        self._browser: Optional[Browser] = None
-        self._context: Optional[BrowserContext] = None
+        self._browser: Optional["Browser"] = None
+        self._context: Optional["BrowserContext"] = None
         if self.use_browser:
             if not PLAYWRIGHT_AVAILABLE:
                 raise ImportError(
                     "Playwright is required for browser automation. "
                     "Install it with: pip install playwright && playwright install"
                 )
+            from playwright.sync_api import sync_playwright
+
             self._playwright = sync_playwright().start()
             self._browser = self._playwright.chromium.launch(headless=True)
             self._context = self._browser.new_context()
@@ -154,6 +157,34 @@ class WebsiteCaller:
         response.raise_for_status()
         return response.text
 
+    def get_stream(self, url: str, params: Optional[Dict[str, Any]] = None,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Make a streaming GET request; the body is read incrementally from response.raw.
+
+        Args:
+            url: The URL to call
+            params: Optional query parameters
+            headers: Optional headers to include
+
+        Returns:
+            requests.Response object with transparent content decoding enabled on .raw.
+            Close it (e.g. with contextlib.closing) when done.
+        """
+        kwargs: Dict[str, Any] = {"stream": True}
+        if params:
+            kwargs["params"] = params
+        if headers:
+            kwargs["headers"] = headers
+        response = self.call(url, method="GET", **kwargs)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        response.raw.decode_content = True
+        return response
+
     def get_html_with_browser(self, url: str, wait_for_selector: Optional[str] = None,
                              wait_timeout: Optional[int] = None,
                              wait_until: str = "networkidle") -> str: